@@ -0,0 +1,68 @@
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from achievements.models import Colors
+
+# Colors only change through the admin, this just bounds how long another
+# worker can serve a stale table after one does
+COLOR_TABLE_TTL = 60 * 60
+
+
+@dataclass(frozen=True)
+class ColorEntry:
+    id: int
+    symbol: str
+    slug: str
+    name: str
+    mask: int
+
+    @property
+    def symbol_length(self) -> int:
+        if self.symbol == "c":
+            return 0
+        return len(self.symbol)
+
+
+@dataclass(frozen=True)
+class ColorTable:
+    by_mask: Mapping[int, ColorEntry]
+    by_id: Mapping[int, ColorEntry]
+    loaded_at: float
+
+
+_table: Optional[ColorTable] = None
+_lock = threading.Lock()
+
+
+def _load() -> ColorTable:
+    entries = [
+        ColorEntry(**row)
+        for row in Colors.objects.values("id", "symbol", "slug", "name", "mask")
+    ]
+    return ColorTable(
+        by_mask=MappingProxyType({e.mask: e for e in entries}),
+        by_id=MappingProxyType({e.id: e for e in entries}),
+        loaded_at=time.monotonic(),
+    )
+
+
+def get_color_table() -> ColorTable:
+    """Every color keyed by mask and by id, loaded once per process and
+    reloaded after a Colors change or COLOR_TABLE_TTL."""
+    global _table
+    table = _table
+    if table is not None and time.monotonic() - table.loaded_at < COLOR_TABLE_TTL:
+        return table
+    with _lock:
+        if _table is table:
+            _table = _load()
+        return _table
+
+
+def clear_color_table() -> None:
+    global _table
+    with _lock:
+        _table = None
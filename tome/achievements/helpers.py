@@ -1,24 +1,25 @@
-import requests
-import json
-import time
-from typing import Optional, TypedDict
+from typing import Optional
 
 
 from collections import defaultdict
-from django.db.models import Q, F, Sum, Max, Window, IntegerField, Value
-from django.db.models.functions import Coalesce, Substr, Cast
+from django.db import transaction
+from django.db.models import Q, F, Sum, Max, Window
+from django.db.models.functions import Coalesce
 from django.db.models.expressions import OrderBy
 from django.db.models.functions import Rank
 
 from achievements.models import (
     Achievements,
     Commanders,
+    MonthlyWinner,
     Restrictions,
     AchievementsRestrictions,
-    Colors,
 )
 from users.models import ParticipantAchievements
+from sessions_rounds.models import Rounds, Sessions
+from achievements.color_helpers import ColorEntry, get_color_table
 from achievements.earned_count_helpers import ensure_earned_count_rows_for_achievement
+from services.scryfall_client import iter_search_pages
 
 
 def group_parents_by_point_value(parent_dict):
@@ -31,42 +32,19 @@ def group_parents_by_point_value(parent_dict):
     return dict(grouped_by_points)
 
 
-def calculate_total_points_for_month(sessions, store_id):
-    earned_achievements = (
-        ParticipantAchievements.objects.filter(
-            session_id__in=sessions,
-            participant__deleted=False,
-            session__deleted=False,
-            deleted=False,
-            store_id=store_id,
-        )
-        .select_related("participant")
-        .values("id", "earned_points", "participant_id", "participant__name")
-    )
-
-    by_participant = defaultdict(int)
-    participant_info = set()
-
-    for achievement in earned_achievements:
-        participant_info.add(
-            (achievement["participant_id"], achievement["participant__name"])
-        )
-        by_participant[achievement["participant_id"]] += achievement["earned_points"]
-    return [
-        {"id": p[0], "name": p[1], "total_points": by_participant[p[0]]}
-        for p in participant_info
-    ]
-
-
-def calculate_monthly_winners(cutoff, store_id):
+def _rank_monthly_winners(store_id, **session_filters):
+    """Top point earners per month for the sessions matching `session_filters`,
+    as (month, month_year, participant_id, participant_name, total_points)."""
     pa_qs = ParticipantAchievements.objects.filter(
         participant__deleted=False,
         session__deleted=False,
         deleted=False,
-        session__session_date__lt=cutoff,
         store_id=store_id,
-    ).select_related("session")
-    base = pa_qs.values("session__month_year", "participant_id").annotate(
+        **{f"session__{key}": value for key, value in session_filters.items()},
+    )
+    base = pa_qs.values(
+        "session__month", "session__month_year", "participant_id"
+    ).annotate(
         participant_name=Max("participant__name"),
         total_points=Coalesce(Sum("earned_points"), 0),
     )
@@ -75,86 +53,273 @@ def calculate_monthly_winners(cutoff, store_id):
         base.annotate(
             rnk=Window(
                 expression=Rank(),
-                partition_by=[F("session__month_year")],
+                partition_by=[F("session__month")],
                 order_by=[
                     OrderBy(F("total_points"), descending=True),
                 ],
             ),
         )
         .filter(rnk=1)
-        .values(
+        .values_list(
+            "session__month",
             "session__month_year",
             "participant_id",
             "participant_name",
             "total_points",
         )
-        .order_by("session__month_year")
     )
+    return list(ranked)
 
-    sorted = ranked.annotate(
-        month_i=Cast(Substr("session__month_year", 1, 2), IntegerField()),
-        year_i=Cast(Substr("session__month_year", 4, 2), IntegerField()),
-        year_full=Value(2000) + F("year_i"),
-    ).order_by("-year_full", "-month_i")
 
-    return list(sorted)
+def finalize_monthly_winners(store_id, month) -> int:
+    """Rank `month` (a first-of-month date) for the store and replace its
+    stored winners. Returns how many winners were written."""
+    winners = [
+        MonthlyWinner(
+            store_id=store_id,
+            month=row_month,
+            month_year=month_year,
+            participant_id=participant_id,
+            total_points=total_points,
+        )
+        for row_month, month_year, participant_id, _, total_points in (
+            _rank_monthly_winners(store_id, month=month)
+        )
+    ]
+    with transaction.atomic():
+        MonthlyWinner.objects.filter(store_id=store_id, month=month).delete()
+        MonthlyWinner.objects.bulk_create(winners)
+    return len(winners)
+
+
+def refresh_monthly_winners(store_id, round_ids) -> None:
+    """Re-rank the already finalized months of `round_ids` once the current
+    transaction commits. Call after any write that changes those rounds'
+    points. Months without stored winners are still ranked live on read."""
+    months = set(
+        MonthlyWinner.objects.filter(
+            store_id=store_id,
+            month__in=Rounds.objects.filter(id__in=round_ids).values("month"),
+        ).values_list("month", flat=True)
+    )
+    for month in months:
+        transaction.on_commit(
+            lambda month=month: finalize_monthly_winners(store_id, month)
+        )
 
 
-class ScryfallCommanderData:
-    def __init__(self, name, colors):
-        self.name = name
-        self.colors = colors
+def refresh_participant_monthly_winners(participant_id) -> None:
+    """Re-rank every finalized month `participant_id` won once the current
+    transaction commits. Call after deleting the participant, since deleted
+    participants are left out of the ranking."""
+    months = set(
+        MonthlyWinner.objects.filter(participant_id=participant_id).values_list(
+            "store_id", "month"
+        )
+    )
+    for store_id, month in months:
+        transaction.on_commit(
+            lambda store_id=store_id, month=month: finalize_monthly_winners(
+                store_id, month
+            )
+        )
 
 
-def fetch_scryfall_data():
-    """Hit our special scryfall endpoint to fetch all existing commanders."""
+def rebuild_monthly_winners(store_id) -> int:
+    """Finalize every month the store has sessions for."""
+    months = (
+        Sessions.objects.filter(store_id=store_id, deleted=False)
+        .values_list("month", flat=True)
+        .distinct()
+    )
+    with transaction.atomic():
+        MonthlyWinner.objects.filter(store_id=store_id).delete()
+        return sum(finalize_monthly_winners(store_id, month) for month in months)
 
-    SCRYFALL_COMMANDER_URL = "https://api.scryfall.com/cards/search?q=is%3Acommander+legal%3Acommander&order=name&as=checklist&unique=cards"
-    keep_going = True
-    out = []
 
-    print("Beginning fetch")
-    while keep_going:
-        try:
-            data = requests.get(
-                SCRYFALL_COMMANDER_URL,
-                headers={"User-Agent": "MTGCommanderLeague/1.0", "Accept": "*/*"},
-            )
-            parsed = json.loads(data.content)
+def calculate_monthly_winners(cutoff, store_id):
+    """Winners for every month before `cutoff`. Finalized months come from
+    MonthlyWinner, only months that haven't been finalized yet are ranked live."""
+    stored = list(
+        MonthlyWinner.objects.filter(
+            store_id=store_id, month__lt=cutoff
+        ).select_related("participant")
+    )
+    # A winner deleted after their month was finalized sends the month back
+    # to being ranked live rather than leaving it without a winner
+    rerank = {w.month for w in stored if w.participant.deleted}
+    stored = [w for w in stored if w.month not in rerank]
+    pending = set(
+        Sessions.objects.filter(
+            store_id=store_id, deleted=False, session_date__lt=cutoff
+        ).values_list("month", flat=True)
+    ).difference(w.month for w in stored)
+
+    rows = [
+        (w.month, w.month_year, w.participant_id, w.participant.name, w.total_points)
+        for w in stored
+    ]
+    if pending:
+        rows += _rank_monthly_winners(
+            store_id, session_date__lt=cutoff, month__in=pending
+        )
+
+    return [
+        {
+            "session__month_year": month_year,
+            "participant_id": participant_id,
+            "participant_name": participant_name,
+            "total_points": total_points,
+            "month_i": month.month,
+            "year_i": month.year % 100,
+            "year_full": month.year,
+        }
+        for month, month_year, participant_id, participant_name, total_points in sorted(
+            rows, key=lambda row: (row[0], -row[2]), reverse=True
+        )
+    ]
 
-            out.extend(parsed["data"])
 
-            SCRYFALL_COMMANDER_URL = parsed.get("next_page")
-            keep_going = parsed["has_more"]
-            # To be extra careful about overloading Scryfall's API we sleep for 200ms between requests
-            time.sleep(0.200)
+class ScryfallCommanderData:
+    def __init__(self, name, colors):
+        self.name = name
+        self.colors = colors
 
-        except BaseException as e:
-            print(e)
-            break
 
-    # These are special Commanders that depend on a player choosing a color identity,
-    # they already exist with individual colors so we don't need to re-add the non-color ones
-    to_remove = set(["The Prismatic Piper", "Faceless One", "Clara Oswald"])
-    name_set = {card["name"] for card in out} - to_remove
-    color_dict = {c["name"]: c.get("color_identity", []) for c in out}
+SCRYFALL_COMMANDER_URL = "https://api.scryfall.com/cards/search?q=is%3Acommander+legal%3Acommander&order=name&as=checklist&unique=cards"
+# These are special Commanders that depend on a player choosing a color identity,
+# they already exist with individual colors so we don't need to re-add the non-color ones
+EXCLUDED_COMMANDERS = ["The Prismatic Piper", "Faceless One", "Clara Oswald"]
 
-    return name_set, color_dict
 
+SYNC_BATCH_SIZE = 500
+SYNC_FIELDS = ["name", "oracle_id", "color_id", "deleted"]
 
-def fetch_current_commanders():
-    """Fetch all the commanders currently in their DB and return them as a set."""
-    excluded = ["The Prismatic Piper", "Faceless One", "Clara Oswald"]
 
+def _excluded_commanders_q() -> Q:
     query = Q()
-    for keyword in excluded:
+    for keyword in EXCLUDED_COMMANDERS:
         query |= Q(name__icontains=keyword)
-
-    return set(
-        Commanders.objects.filter(deleted=False)
-        .exclude(query)
-        .values_list("name", flat=True)
-    )
+    return query
+
+
+def iter_scryfall_commander_pages(url: str = SCRYFALL_COMMANDER_URL):
+    """Page through our special scryfall search, yielding (oracle_id, name,
+    color_identity) for each page as it arrives instead of collecting the
+    whole catalog."""
+    for cards in iter_search_pages(url):
+        page = []
+        for card in cards:
+            oracle_id = card.get("oracle_id") or (card.get("card_faces") or [{}])[
+                0
+            ].get("oracle_id")
+            if card["name"] in EXCLUDED_COMMANDERS or not oracle_id:
+                continue
+            page.append((oracle_id, card["name"], card.get("color_identity", [])))
+        yield page
+
+
+class CommanderCatalogDiff:
+    """Diffs scryfall pages against our commanders, keyed by oracle id so renames
+    and color identity changes update the existing row. Rows from before we
+    stored oracle ids are matched once by name and get theirs filled in."""
+
+    def __init__(self):
+        self.by_oracle = {}
+        self.by_name = {}
+        for row in (
+            Commanders.objects.exclude(_excluded_commanders_q())
+            .only(*SYNC_FIELDS)
+            .order_by("deleted", "id")
+        ):
+            if row.oracle_id:
+                self.by_oracle[str(row.oracle_id)] = row
+            else:
+                self.by_name.setdefault(row.name, row)
+
+        self.color_map = {
+            tuple(sorted(color.symbol.lower())): color.id
+            for color in get_color_table().by_id.values()
+        }
+        self.seen = set()
+
+    def diff_page(self, page) -> tuple[list[Commanders], list[Commanders]]:
+        """New and changed commanders for one page, as (inserts, updates)."""
+        inserts, updates = [], []
+        for oracle_id, name, color_identity in page:
+            if oracle_id in self.seen:
+                continue
+            self.seen.add(oracle_id)
+
+            color_id = self.color_map.get(
+                tuple(normalize_color_identity(color_identity))
+            )
+            if color_id is None:
+                print(
+                    f"Warning: No matching color_id for {name} with colors {color_identity}"
+                )
+                continue
+
+            row = self.by_oracle.get(oracle_id) or self.by_name.pop(name, None)
+            if row is None:
+                inserts.append(
+                    Commanders(name=name, oracle_id=oracle_id, color_id=color_id)
+                )
+                continue
+
+            current = (row.name, str(row.oracle_id), row.color_id, row.deleted)
+            if current != (name, oracle_id, color_id, False):
+                row.name, row.oracle_id = name, oracle_id
+                row.color_id, row.deleted = color_id, False
+                updates.append(row)
+        return inserts, updates
+
+    def stale_ids(self) -> list[int]:
+        """Commanders scryfall no longer returns, once every page has been seen."""
+        return [
+            row.id
+            for oracle_id, row in self.by_oracle.items()
+            if oracle_id not in self.seen and not row.deleted
+        ]
+
+
+def sync_commanders(
+    url: str = SCRYFALL_COMMANDER_URL, batch_size: int = SYNC_BATCH_SIZE
+) -> dict:
+    """Apply the scryfall commander catalog to our table page by page: insert
+    new cards, update renamed or recolored ones, then soft delete the ones
+    that are gone. Returns the counts of each."""
+    diff = CommanderCatalogDiff()
+    counts = {"inserted": 0, "updated": 0, "deleted": 0}
+
+    for page in iter_scryfall_commander_pages(url):
+        inserts, updates = diff.diff_page(page)
+        with transaction.atomic():
+            if inserts:
+                Commanders.objects.bulk_create(
+                    inserts,
+                    batch_size=batch_size,
+                    update_conflicts=True,
+                    unique_fields=["oracle_id"],
+                    update_fields=["name", "color_id", "deleted"],
+                )
+            if updates:
+                Commanders.objects.bulk_update(
+                    updates, SYNC_FIELDS, batch_size=batch_size
+                )
+        counts["inserted"] += len(inserts)
+        counts["updated"] += len(updates)
+
+    # An empty search means something went wrong upstream, not that every
+    # commander was removed
+    if diff.seen:
+        stale = diff.stale_ids()
+        for i in range(0, len(stale), batch_size):
+            counts["deleted"] += Commanders.objects.filter(
+                id__in=stale[i : i + batch_size]
+            ).update(deleted=True)
+
+    return counts
 
 
 def normalize_color_identity(color_identity):
@@ -245,28 +410,21 @@ def calculate_color_mask(colors: list[int]) -> tuple[int, int]:
     I.e. red = 8, green = 16. Therefore redgreen = 24
     """
 
-    mask_list = Colors.objects.filter(id__in=colors).values_list("mask", flat=True)
+    table = get_color_table()
     combined_mask = 0
-    for mask in mask_list:
-        combined_mask |= mask
-    calculated = (
-        Colors.objects.filter(mask=combined_mask).values("id", "symbol").first()
-    )
+    for color_id in colors:
+        color = table.by_id.get(color_id)
+        if color is not None:
+            combined_mask |= color.mask
+    calculated = table.by_mask.get(combined_mask)
 
     if calculated is None:
         raise ValueError(f"No color found for mask: {combined_mask}")
 
-    win_colors = len(calculated["symbol"]) if calculated["symbol"] != "c" else 0
-
-    return win_colors, calculated["id"]
-
-
-class ColorInfo(TypedDict):
-    symbol: str
-    name: str
+    return calculated.symbol_length, calculated.id
 
 
-def calculate_color(masks: list[Optional[int]]) -> Optional[ColorInfo]:
+def calculate_color(masks: list[Optional[int]]) -> Optional[ColorEntry]:
     """
     Take in a list of color masks, combine them and return the associated color info
     """
@@ -276,7 +434,4 @@ def calculate_color(masks: list[Optional[int]]) -> Optional[ColorInfo]:
         if m is not None and m >= 0:
             combined |= m
 
-    color = Colors.objects.filter(mask=combined).first()
-    if color is None:
-        return None
-    return color
+    return get_color_table().by_mask.get(combined)
@@ -0,0 +1,51 @@
+"""
+Management command to load commander art from a Scryfall bulk-data file.
+Usage: python manage.py load_commander_images --file path/to/oracle-cards.json
+
+Download "Oracle Cards" (or "Default Cards") from https://scryfall.com/docs/api/bulk-data.
+The file is streamed, so it doesn't need to fit in memory, and may be gzipped.
+"""
+
+import gzip
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.scryfall_bulk import BATCH_SIZE, ingest_commander_images
+
+
+class Command(BaseCommand):
+    help = "Load commander art crops and artists from a Scryfall bulk-data JSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            type=str,
+            required=True,
+            help="Path to a Scryfall bulk-data JSON file (.json or .json.gz)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Rows per upsert",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["file"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        opener = gzip.open if path.suffix == ".gz" else open
+        try:
+            with opener(path, "rt", encoding="utf-8") as f:
+                counts = ingest_commander_images(f, options["batch_size"])
+        except ValueError as e:
+            raise CommandError(f"Could not parse {path}: {e}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\nRead {counts['cards']} card(s), stored images for "
+                f"{counts['matched']} commander(s), {counts['unmatched']} without a match\n"
+            )
+        )
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from achievements.helpers import rebuild_monthly_winners
+from stores.models import Store
+
+
+class Command(BaseCommand):
+    help = "Re-rank every month and rewrite the stored monthly winners for one or all stores"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--store-slug",
+            required=False,
+            help="Rebuild winners for a single store",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild winners for all stores",
+        )
+
+    def handle(self, *args, **opts):
+        store_slug = opts.get("store_slug")
+        rebuild_all = opts.get("all", False)
+
+        if not store_slug and not rebuild_all:
+            raise CommandError("Specify --store-slug or --all")
+
+        if store_slug:
+            try:
+                stores = [Store.objects.get(slug=store_slug, deleted=False)]
+            except Store.DoesNotExist:
+                raise CommandError(f"Store not found: {store_slug}")
+        else:
+            stores = list(Store.objects.filter(deleted=False))
+
+        built_count = 0
+        for store in stores:
+            built_count += rebuild_monthly_winners(store.id)
+            self.stdout.write(f"  Rebuilt monthly winners for {store.slug}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\nRebuilt {built_count} winner row(s) across {len(stores)} store(s)\n"
+            )
+        )
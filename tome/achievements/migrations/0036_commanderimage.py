@@ -0,0 +1,34 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("achievements", "0035_achievement_rarity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CommanderImage",
+            fields=[
+                (
+                    "commander",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="image",
+                        serialize=False,
+                        to="achievements.commanders",
+                    ),
+                ),
+                ("images", models.JSONField(default=list)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "commander_images",
+            },
+        ),
+    ]
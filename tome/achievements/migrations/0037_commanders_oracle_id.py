@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("achievements", "0036_commanderimage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="commanders",
+            name="oracle_id",
+            field=models.UUIDField(blank=True, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0021_participant_achievements_live_indexes"),
+        ("stores", "0004_seed_discord_channel_ids"),
+        ("achievements", "0037_commanders_oracle_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyWinner",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("month_year", models.CharField(max_length=5)),
+                ("total_points", models.IntegerField(default=0)),
+                ("finalized_at", models.DateTimeField(auto_now=True)),
+                (
+                    "participant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="users.participants",
+                    ),
+                ),
+                (
+                    "store",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="stores.store"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "monthly_winners",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="monthlywinner",
+            constraint=models.UniqueConstraint(
+                fields=("store", "month", "participant"),
+                name="uniq_monthly_winner_store_month_participant",
+            ),
+        ),
+    ]
@@ -189,6 +189,8 @@ class ColorFactions(models.Model):
 
 class Commanders(models.Model):
     name = models.CharField(max_length=255)
+    # Scryfall's id for the card across printings and renames
+    oracle_id = models.UUIDField(null=True, blank=True, unique=True)
     deleted = models.BooleanField(default=False)
     has_partner = models.BooleanField(default=False)
     is_background = models.BooleanField(default=False)
@@ -200,6 +202,23 @@ class Commanders(models.Model):
         db_table = "commanders"
 
 
+class CommanderImage(models.Model):
+    """Art crops and artists for a commander, loaded from Scryfall bulk data.
+    `images` matches ScryfallClientRequest.primary_image_url, one entry per face."""
+
+    commander = models.OneToOneField(
+        Commanders,
+        primary_key=True,
+        related_name="image",
+        on_delete=models.CASCADE,
+    )
+    images = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "commander_images"
+
+
 class WinningCommanders(models.Model):
     name = models.CharField(max_length=255)
     deleted = models.BooleanField(default=False)
@@ -236,3 +255,25 @@ class WinningCommanders(models.Model):
 
     class Meta:
         db_table = "winning_commanders"
+
+
+class MonthlyWinner(models.Model):
+    """A participant who finished a store's month with the most points (ties
+    all get a row). Written by `finalize_monthly_winners` when a session closes
+    so past months aren't re-ranked on every read."""
+
+    store = models.ForeignKey("stores.Store", on_delete=models.CASCADE)
+    month = models.DateField()
+    month_year = models.CharField(max_length=5)
+    participant = models.ForeignKey("users.Participants", on_delete=models.CASCADE)
+    total_points = models.IntegerField(default=0)
+    finalized_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "monthly_winners"
+        constraints = [
+            UniqueConstraint(
+                fields=["store", "month", "participant"],
+                name="uniq_monthly_winner_store_month_participant",
+            )
+        ]
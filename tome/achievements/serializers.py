@@ -168,7 +168,7 @@ class WinningCommandersSerializer(serializers.ModelSerializer):
     def by_pods(pods, store_id):
         winning_commanders = WinningCommanders.objects.filter(
             pods_id__in=pods, store_id=store_id, deleted=False
-        )
+        ).select_related("color", "pods", "participants")
 
         winners_by_pod = {
             winner.pods_id: WinningCommandersSerializer(winner).data
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from metrics.cache_helpers import bump_badge_catalog_version
+from .color_helpers import clear_color_table
+from .models import Achievements, AchievementType, Colors
+
+
+@receiver(post_save, sender=Colors)
+@receiver(post_delete, sender=Colors)
+def colors_changed(sender, **kwargs):
+    clear_color_table()
+
+
+@receiver(post_save, sender=Achievements)
+@receiver(post_delete, sender=Achievements)
+@receiver(post_save, sender=AchievementType)
+@receiver(post_delete, sender=AchievementType)
+def achievement_catalog_changed(sender, **kwargs):
+    # After commit, so a read mid-transaction can't cache the old catalog
+    # under the new version
+    transaction.on_commit(bump_badge_catalog_version)
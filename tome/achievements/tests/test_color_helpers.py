@@ -0,0 +1,29 @@
+from achievements.helpers import calculate_color, calculate_color_mask
+from achievements.models import Colors
+from utils.test_helpers import get_ids
+
+ids = get_ids()
+
+
+def test_color_lookups_use_table(django_assert_num_queries) -> None:
+    """should: combine masks and color ids from the table, one query to load it"""
+
+    with django_assert_num_queries(1):
+        assert calculate_color([16, None, -1]).id == ids.GREEN
+        assert calculate_color([16, 24]).symbol == "rg"
+        assert calculate_color([0]).symbol_length == 0
+        assert calculate_color([8]) is None
+        assert calculate_color_mask([ids.GREEN]) == (1, ids.GREEN)
+        assert calculate_color_mask([ids.GREEN, ids.GRUUL]) == (2, ids.GRUUL)
+        assert calculate_color_mask([ids.COLORLESS]) == (0, ids.COLORLESS)
+
+
+def test_color_table_refreshes_on_change() -> None:
+    """should: pick up a new color once it is saved"""
+
+    assert calculate_color([8]) is None
+
+    red = Colors.objects.create(symbol="r", slug="red", name="red", mask=8)
+
+    assert calculate_color([8]).id == red.id
+    assert calculate_color_mask([red.id]) == (1, red.id)
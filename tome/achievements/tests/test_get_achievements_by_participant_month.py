@@ -4,6 +4,7 @@ from django.urls import reverse
 from rest_framework import status
 
 from users.models import ParticipantAchievements
+from metrics.counter_helpers import rebuild_metrics_counters
 
 from utils.test_helpers import get_ids
 
@@ -75,6 +76,8 @@ def populate_achievements_for_participants() -> None:
             for achievement in [(ids.NO_LANDS, 6)]
         ]
     )
+    # Inserted directly, so refresh the leaderboard read model
+    rebuild_metrics_counters(ids.MIMICS_ID)
 
 
 def test_get_achievements_by_participant_no_month(
@@ -176,6 +179,8 @@ def populate_achievements_for_participants_last_month() -> None:
             for achievement in [(ids.NO_LANDS, 6)]
         ]
     )
+    # Inserted directly, so refresh the leaderboard read model
+    rebuild_metrics_counters(ids.MIMICS_ID)
 
 
 def test_get_achievements_by_participant_last_month(
@@ -1,9 +1,13 @@
 import pytest
 
+from datetime import date
+
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
 
-from users.models import ParticipantAchievements
+from achievements.models import MonthlyWinner
+from users.models import ParticipantAchievements, Participants
 
 from utils.test_helpers import get_ids
 
@@ -77,3 +81,161 @@ def test_get_league_winners(client, populate_achievements_for_participants) -> N
 
     assert res.status_code == status.HTTP_200_OK
     assert parsed_res == expected
+
+
+def test_get_league_winners_reads_finalized_months(
+    client, populate_achievements_for_participants
+) -> None:
+    """
+    should: serve a finalized month from the stored winners without re-ranking it
+    """
+
+    MonthlyWinner.objects.create(
+        store_id=ids.MIMICS_ID,
+        month=date(2024, 10, 1),
+        month_year="10-24",
+        participant_id=ids.P1,
+        total_points=42,
+    )
+
+    res = client.get(reverse("get_league_winners"))
+
+    assert res.status_code == status.HTTP_200_OK
+    assert [(w["participant_id"], w["total_points"]) for w in res.json()] == [
+        (ids.P1, 42)
+    ]
+
+
+def test_rebuild_monthly_winners(populate_achievements_for_participants) -> None:
+    """
+    should: rank every month of the store's history into the stored winners
+    """
+
+    call_command("rebuild_monthly_winners", store_slug=ids.MIMICS)
+
+    assert list(
+        MonthlyWinner.objects.values_list(
+            "month_year", "participant_id", "total_points"
+        )
+    ) == [("10-24", ids.P2, 18)]
+
+
+def test_edit_to_finalized_month_refreshes_winners(
+    client, populate_achievements_for_participants
+) -> None:
+    """
+    should: re-rank a finalized month when one of its achievements is removed
+    """
+
+    call_command("rebuild_monthly_winners", store_slug=ids.MIMICS)
+    removed = ParticipantAchievements.objects.filter(
+        participant_id=ids.P2, achievement_id=ids.NO_LANDS
+    ).first()
+
+    res = client.post(
+        reverse("upsert_earned_achievements"),
+        {"id": removed.id, "deleted": True},
+        format="json",
+    )
+    assert res.status_code == status.HTTP_201_CREATED
+
+    assert list(
+        MonthlyWinner.objects.values_list(
+            "month_year", "participant_id", "total_points"
+        )
+    ) == [("10-24", ids.P2, 12)]
+    winners = client.get(reverse("get_league_winners")).json()
+    assert [(w["participant_id"], w["total_points"]) for w in winners] == [(ids.P2, 12)]
+
+
+def test_deleted_session_drops_finalized_winners(
+    client, populate_achievements_for_participants
+) -> None:
+    """
+    should: clear a finalized month's winners once its only session is deleted
+    """
+
+    call_command("rebuild_monthly_winners", store_slug=ids.MIMICS)
+
+    res = client.delete(
+        reverse("delete_session", kwargs={"session_id": ids.SESSION_LAST_MONTH})
+    )
+    assert res.status_code == status.HTTP_204_NO_CONTENT
+
+    assert not MonthlyWinner.objects.exists()
+    assert client.get(reverse("get_league_winners")).json() == []
+
+
+def test_begin_round_in_finalized_month_refreshes_winners(
+    client, populate_achievements_for_participants
+) -> None:
+    """
+    should: re-rank a finalized month when one of its rounds begins
+    """
+
+    ParticipantAchievements.objects.create(
+        participant_id=ids.P1,
+        achievement_id=ids.NO_LANDS,
+        round_id=ids.R1_SESSION_LAST_MONTH,
+        session_id=ids.SESSION_LAST_MONTH,
+        earned_points=13,
+        store_id=ids.MIMICS_ID,
+    )
+    call_command("rebuild_monthly_winners", store_slug=ids.MIMICS)
+
+    res = client.post(
+        reverse("begin_round"),
+        {
+            "participants": [{"id": p} for p in (ids.P1, ids.P3, ids.P4)],
+            "round": ids.R2_SESSION_LAST_MONTH,
+            "session": ids.SESSION_LAST_MONTH,
+        },
+        format="json",
+    )
+    assert res.status_code == status.HTTP_201_CREATED
+
+    assert list(
+        MonthlyWinner.objects.values_list(
+            "month_year", "participant_id", "total_points"
+        )
+    ) == [("10-24", ids.P1, 19)]
+
+
+def test_deleted_participant_refreshes_winners(
+    client, populate_achievements_for_participants
+) -> None:
+    """
+    should: re-rank a finalized month when its winner is deleted
+    """
+
+    call_command("rebuild_monthly_winners", store_slug=ids.MIMICS)
+
+    res = client.post(
+        reverse("upsert_participant"), {"id": ids.P2, "deleted": True}, format="json"
+    )
+    assert res.status_code == status.HTTP_201_CREATED
+
+    assert sorted(
+        MonthlyWinner.objects.values_list(
+            "month_year", "participant_id", "total_points"
+        )
+    ) == [("10-24", ids.P1, 3), ("10-24", ids.P3, 3)]
+
+
+def test_deleted_finalized_winner_is_ranked_live(
+    client, populate_achievements_for_participants
+) -> None:
+    """
+    should: rank a finalized month live when its stored winner has since been deleted
+    """
+
+    call_command("rebuild_monthly_winners", store_slug=ids.MIMICS)
+    Participants.objects.filter(id=ids.P2).update(deleted=True)
+
+    res = client.get(reverse("get_league_winners"))
+
+    assert res.status_code == status.HTTP_200_OK
+    assert [(w["participant_id"], w["total_points"]) for w in res.json()] == [
+        (ids.P1, 3),
+        (ids.P3, 3),
+    ]
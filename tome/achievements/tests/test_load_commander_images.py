@@ -0,0 +1,109 @@
+import gzip
+import json
+
+from django.core.management import call_command
+
+from achievements.models import CommanderImage
+from services.scryfall_client import ScryfallClientRequest
+
+FYNN = "Fynn, the Fangbearer"
+YARUS = "Yarus, Roar of the Old Gods"
+
+BULK_CARDS = [
+    {"object": "card", "name": "Sol Ring", "image_uris": {"art_crop": "sol.jpg"}},
+    {
+        "object": "card",
+        "name": FYNN,
+        "artist": "Fynn Artist",
+        "image_uris": {"art_crop": "fynn.jpg"},
+    },
+    {
+        "object": "card",
+        "name": FYNN,
+        "artist": "Reprint Artist",
+        "image_uris": {"art_crop": "fynn-reprint.jpg"},
+    },
+    {
+        "object": "card",
+        "name": f"{YARUS} // Back Face",
+        "card_faces": [
+            {
+                "name": YARUS,
+                "artist": "Front Artist",
+                "image_uris": {"art_crop": "yarus-front.jpg"},
+            },
+            {
+                "name": "Back Face",
+                "artist": "Back Artist",
+                "image_uris": {"art_crop": "yarus-back.jpg"},
+            },
+        ],
+    },
+]
+
+
+def _write_bulk(path, cards=BULK_CARDS):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(cards, f, indent=2)
+    return path
+
+
+def test_load_commander_images(tmp_path) -> None:
+    """should: store the first printing's art for each known commander, per face"""
+
+    call_command("load_commander_images", file=_write_bulk(tmp_path / "cards.json.gz"))
+
+    images = dict(
+        CommanderImage.objects.values_list("commander__name", "images").order_by(
+            "commander__name"
+        )
+    )
+    assert images == {
+        FYNN: [{"url": "fynn.jpg", "artist": "Fynn Artist"}],
+        YARUS: [
+            {"url": "yarus-front.jpg", "artist": "Front Artist"},
+            {"url": "yarus-back.jpg", "artist": "Back Artist"},
+        ],
+    }
+
+
+def test_load_commander_images_updates(tmp_path) -> None:
+    """should: replace stored images when the file is ingested again"""
+
+    call_command("load_commander_images", file=_write_bulk(tmp_path / "cards.json.gz"))
+    updated = [{**BULK_CARDS[1], "image_uris": {"art_crop": "fynn-new.jpg"}}]
+    call_command(
+        "load_commander_images", file=_write_bulk(tmp_path / "new.json.gz", updated)
+    )
+
+    assert CommanderImage.objects.get(commander__name=FYNN).images == [
+        {"url": "fynn-new.jpg", "artist": "Fynn Artist"}
+    ]
+    assert CommanderImage.objects.count() == 2
+
+
+def test_image_urls_answered_from_table(tmp_path, monkeypatch) -> None:
+    """should: resolve known commanders without Scryfall, fetch only unknown ones"""
+
+    call_command("load_commander_images", file=_write_bulk(tmp_path / "cards.json.gz"))
+    requested = []
+
+    def _fetch(self, names):
+        requested.extend(names)
+        return {name: [] for name in names}
+
+    monkeypatch.setattr(
+        ScryfallClientRequest, "get_commander_card_payloads_by_raw", _fetch
+    )
+
+    out = ScryfallClientRequest().get_commander_image_urls(
+        [f"{FYNN}+{YARUS}", "Someone Else"]
+    )
+
+    assert out[f"{FYNN}+{YARUS}"] == [
+        {"url": "fynn.jpg", "artist": "Fynn Artist"},
+        {"url": "yarus-front.jpg", "artist": "Front Artist"},
+        {"url": "yarus-back.jpg", "artist": "Back Artist"},
+    ]
+    assert out["Someone Else"] == []
+    assert requested == ["Someone Else"]
@@ -0,0 +1,158 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.db.models import Q
+
+from achievements.helpers import sync_commanders
+from achievements.models import Commanders
+
+
+class StubScryfall(BaseHTTPRequestHandler):
+    """Serves `pages` in order, failing the first `failures[path]` requests for
+    a path with a 429 before answering it."""
+
+    protocol_version = "HTTP/1.1"
+    pages = {}
+    failures = {}
+    clients = []
+
+    def do_GET(self):
+        self.clients.append(self.client_address)
+        if self.failures.get(self.path, 0) > 0:
+            self.failures[self.path] -= 1
+            return self._send(429, {"object": "error"}, {"Retry-After": "0"})
+        self._send(200, self.pages[self.path])
+
+    def _send(self, code, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        for key, value in {"Content-Length": str(len(body)), **(headers or {})}.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def scryfall_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubScryfall)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StubScryfall.clients = []
+    yield base
+    server.shutdown()
+    server.server_close()
+
+
+FYNN_ID = "00000000-0000-0000-0000-000000000051"
+YARUS_ID = "00000000-0000-0000-0000-000000000052"
+ELF_ID = "00000000-0000-0000-0000-0000000000e1"
+
+
+def _card(oracle_id, name, colors):
+    return {
+        "object": "card",
+        "oracle_id": oracle_id,
+        "name": name,
+        "color_identity": colors,
+    }
+
+
+def _commanders():
+    return {
+        name: (str(oracle_id), color_id, deleted)
+        for name, oracle_id, color_id, deleted in Commanders.objects.filter(
+            Q(id__in=[51, 52]) | Q(name__startswith="Brand New")
+        ).values_list("name", "oracle_id", "color_id", "deleted")
+    }
+
+
+def test_sync_commanders(scryfall_server) -> None:
+    """should: page through the search over one connection, retry a 429, insert
+    new commanders and fill in oracle ids for the ones we have"""
+
+    StubScryfall.pages = {
+        "/search": {
+            "has_more": True,
+            "next_page": f"{scryfall_server}/page2",
+            "data": [
+                _card(FYNN_ID, "Fynn, the Fangbearer", ["G"]),
+                _card("00000000-0000-0000-0000-0000000000f1", "Faceless One", []),
+                _card(ELF_ID, "Brand New Elf", ["G"]),
+            ],
+        },
+        "/page2": {
+            "has_more": False,
+            "data": [
+                _card(YARUS_ID, "Yarus, Roar of the Old Gods", ["R", "G"]),
+                _card("00000000-0000-0000-0000-0000000000f2", "No Such Colors", ["W"]),
+            ],
+        },
+    }
+    StubScryfall.failures = {"/page2": 1}
+
+    counts = sync_commanders(f"{scryfall_server}/search")
+
+    assert counts == {"inserted": 1, "updated": 2, "deleted": 0}
+    assert _commanders() == {
+        "Fynn, the Fangbearer": (FYNN_ID, 11, False),
+        "Yarus, Roar of the Old Gods": (YARUS_ID, 12, False),
+        "Brand New Elf": (ELF_ID, 11, False),
+    }
+    assert not Commanders.objects.filter(name="Faceless One").exists()
+    assert len(StubScryfall.clients) == 3
+    assert len(set(StubScryfall.clients)) == 1
+
+
+def test_sync_commanders_renames_recolors_and_removes(scryfall_server) -> None:
+    """should: update renamed and recolored commanders in place, soft delete the
+    ones scryfall no longer returns and leave unchanged rows alone"""
+
+    Commanders.objects.filter(id=51).update(oracle_id=FYNN_ID)
+    Commanders.objects.filter(id=52).update(oracle_id=YARUS_ID)
+    Commanders.objects.create(name="Brand New Elf", oracle_id=ELF_ID, color_id=11)
+    StubScryfall.pages = {
+        "/search": {
+            "has_more": False,
+            "data": [
+                _card(FYNN_ID, "Fynn, the Fangbearer", ["G"]),
+                _card(YARUS_ID, "Yarus, Roar of the New Gods", ["G"]),
+            ],
+        },
+    }
+    StubScryfall.failures = {}
+
+    counts = sync_commanders(f"{scryfall_server}/search")
+
+    assert counts == {"inserted": 0, "updated": 1, "deleted": 1}
+    assert _commanders() == {
+        "Fynn, the Fangbearer": (FYNN_ID, 11, False),
+        "Yarus, Roar of the New Gods": (YARUS_ID, 11, False),
+        "Brand New Elf": (ELF_ID, 11, True),
+    }
+
+
+def test_sync_commanders_keeps_earlier_pages(scryfall_server) -> None:
+    """should: keep the pages already applied, and delete nothing, when a later
+    page fails"""
+
+    Commanders.objects.filter(id=52).update(oracle_id=YARUS_ID)
+    StubScryfall.pages = {
+        "/search": {
+            "has_more": True,
+            "next_page": f"{scryfall_server}/page2",
+            "data": [_card(ELF_ID, "Brand New Elf", ["G"])],
+        },
+    }
+    StubScryfall.failures = {"/page2": 10}
+
+    with pytest.raises(RuntimeError):
+        sync_commanders(f"{scryfall_server}/search")
+
+    assert Commanders.objects.filter(name="Brand New Elf").exists()
+    assert not Commanders.objects.get(id=52).deleted
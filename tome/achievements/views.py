@@ -1,4 +1,5 @@
 import json
+import requests
 from typing import List, Dict
 
 from datetime import datetime
@@ -38,8 +39,8 @@ from .models import Achievements, Colors, Restrictions, AchievementType
 
 from users.models import ParticipantAchievements
 
-from sessions_rounds.models import Pods, Sessions, PodsParticipants, Rounds
-from configs.models import Config
+from sessions_rounds.models import Pods, PodsParticipants, Rounds
+from configs.configs import get_store_config
 from .serializers import (
     AchievementsSerializer,
     AchievementSerializerV2,
@@ -63,15 +64,13 @@ from achievements.participant_achievement_helpers import (
 )
 
 from achievements.helpers import (
-    calculate_total_points_for_month,
     group_parents_by_point_value,
-    fetch_scryfall_data,
-    fetch_current_commanders,
-    normalize_color_identity,
+    sync_commanders,
     handle_upsert_child_achievements,
     handle_upsert_restrictions,
     cascade_soft_delete,
     calculate_monthly_winners,
+    refresh_monthly_winners,
 )
 from achievements.scoresheet_helpers import POSTScoresheetHelper, GETScoresheetHelper
 from achievements.earned_count_helpers import (
@@ -83,6 +82,14 @@ from achievements.earned_count_helpers import (
     pairs_from_queryset_values,
 )
 from sessions_rounds.helpers import handle_close_round
+from metrics.snapshot_helpers import mark_metrics_snapshots_stale
+from metrics.counter_helpers import (
+    get_month_leaderboard,
+    achievement_counter_rows,
+    winner_counter_rows,
+    increment_metrics_counters,
+    decrement_metrics_counters,
+)
 from services.scryfall_client import ScryfallClientRequest
 from services.redis_keepalive import redis_keepalive
 from utils.decorators import require_store
@@ -446,17 +453,12 @@ def get_achievements_with_restrictions_v2(request, **kwargs):
     # Optional store-scoped filtering via configs.
     store_id = getattr(request, "store_id", None)
     if store_id:
-        cfg = dict(
-            Config.objects.filter(
-                store_id=store_id,
-                key__in=["enable_snack_sharing", "enable_money_pack"],
-            ).values_list("key", "value")
-        )
+        cfg = get_store_config(store_id)
 
         exclude_slugs = []
-        if (cfg.get("enable_snack_sharing") or "").lower() == "false":
+        if not cfg.enable_snack_sharing:
             exclude_slugs.extend(["bring-snack", "best-snack"])
-        if (cfg.get("enable_money_pack") or "").lower() == "false":
+        if not cfg.enable_money_pack:
             exclude_slugs.append("money-pack")
 
         if exclude_slugs:
@@ -596,16 +598,7 @@ def get_achievements_by_participant_month(request, **kwargs):
     if mm_yy == "new" or mm_yy == None:
         mm_yy = today.strftime("%m-%y")
 
-    store_id = request.store_id
-    session_ids = Sessions.objects.filter(
-        month_year=mm_yy, deleted=False, store_id=store_id
-    ).values_list("id", flat=True)
-
-    res = calculate_total_points_for_month(session_ids, store_id)
-
-    res.sort(key=lambda x: x["total_points"], reverse=True)
-
-    return Response(res)
+    return Response(get_month_leaderboard(request.store_id, mm_yy))
 
 
 @api_view([GET])
@@ -849,46 +842,34 @@ def get_all_commanders(_, **kwargs):
 @permission_classes([IsSuperUser])
 def fetch_and_insert_commanders(_, **kwargs):
     """
-    Query scryfall and see if any new commanders have been added.
+    Sync our commanders with scryfall's catalog.
 
-    Update the db with the new commanders if yes, else do nothing.
+    New commanders are inserted, renamed or recolored ones updated and removed
+    ones soft deleted, page by page as the search is paged through.
     """
 
-    name_set, color_dict = fetch_scryfall_data()
-    existing_commanders = fetch_current_commanders()
-
-    if len(name_set) <= len(existing_commanders):
+    try:
+        counts = sync_commanders()
+    except (RuntimeError, requests.RequestException) as e:
         return Response(
-            {"message": "No new Commanders found."}, status=status.HTTP_200_OK
+            {"message": f"Scryfall fetch failed: {e}"},
+            status=status.HTTP_502_BAD_GATEWAY,
         )
 
-    to_update = list(name_set - existing_commanders)
-
-    color_map = {
-        tuple(sorted(color["symbol"].lower())): color["id"]
-        for color in Colors.objects.values("id", "symbol")
-    }
-
-    records = []
-    try:
-        for commander in to_update:
-            color_key = tuple(normalize_color_identity(color_dict[commander]))
-            color_id = color_map.get(color_key)
-
-            if color_id is not None:
-                records.append(Commanders(name=commander, color_id=color_id))
-            else:
-                print(
-                    f"Warning: No matching color_id for {commander.name} with colors {commander.colors}"
-                )
-    except Exception as e:
-        print(f"Error found in commander mapping: {e}")
+    if not any(counts.values()):
+        return Response(
+            {"message": "No Commander changes found.", **counts},
+            status=status.HTTP_200_OK,
+        )
 
-    out = Commanders.objects.bulk_create(records)
     redis_keepalive()
 
     return Response(
-        {"message": f"Added {len(out)} new commanders to the database."},
+        {
+            "message": f"Added {counts['inserted']}, updated {counts['updated']} "
+            f"and removed {counts['deleted']} commanders.",
+            **counts,
+        },
         status=status.HTTP_201_CREATED,
     )
 
@@ -921,8 +902,15 @@ def upsert_earned_achievements(request, **kwargs):
                 decrement_earned_counts(
                     [(achievement.achievement_id, achievement.scalable_term_id)]
                 )
+                decrement_metrics_counters(
+                    achievement_counter_rows(
+                        ParticipantAchievements.objects.filter(id=achievement.id)
+                    )
+                )
             achievement.deleted = body["deleted"]
             achievement.save()
+            mark_metrics_snapshots_stale(request.store_id)
+            refresh_monthly_winners(request.store_id, [achievement.round_id])
 
         return Response(status=status.HTTP_201_CREATED)
 
@@ -967,7 +955,7 @@ def upsert_earned_achievements(request, **kwargs):
         .first()
     )
 
-    ParticipantAchievements.objects.create(
+    earned = ParticipantAchievements.objects.create(
         participant_id=participant_id,
         achievement_id=achievement_id,
         scalable_term_id=scalable_term_id,
@@ -977,6 +965,11 @@ def upsert_earned_achievements(request, **kwargs):
         store_id=request.store_id,
     )
     increment_earned_counts([(achievement_id, scalable_term_id)])
+    increment_metrics_counters(
+        achievement_counter_rows(ParticipantAchievements.objects.filter(id=earned.id))
+    )
+    mark_metrics_snapshots_stale(request.store_id)
+    refresh_monthly_winners(request.store_id, [round_id])
     return Response(status=status.HTTP_201_CREATED)
 
 
@@ -1022,17 +1015,28 @@ def scoresheet(request, round_id: int, pod_id: int, **kwargs):
             deleted_pairs = list(
                 soft_delete_qs.values("achievement_id", "scalable_term_id")
             )
+            deleted_rows = achievement_counter_rows(soft_delete_qs)
             soft_delete_qs.update(deleted=True)
             decrement_earned_counts(pairs_from_queryset_values(deleted_pairs))
-            WinningCommanders.objects.filter(
+            winners_qs = WinningCommanders.objects.filter(
                 pods_id=pod_id, store_id=store_id, deleted=False
-            ).update(deleted=True)
+            )
+            deleted_winners = winner_counter_rows(winners_qs)
+            winners_qs.update(deleted=True)
+            decrement_metrics_counters(deleted_rows, deleted_winners)
 
-        ParticipantAchievements.objects.bulk_create(result.records)
+        created = ParticipantAchievements.objects.bulk_create(result.records)
         increment_earned_counts(pairs_from_participant_achievements(result.records))
+        increment_metrics_counters(
+            achievement_counter_rows(
+                ParticipantAchievements.objects.filter(
+                    id__in=[record.id for record in created]
+                )
+            )
+        )
 
         if result.commander_name is not None:
-            WinningCommanders.objects.create(
+            winner = WinningCommanders.objects.create(
                 name=result.commander_name,
                 color_id=result.color_id,
                 participants_id=result.winner_id,
@@ -1043,9 +1047,16 @@ def scoresheet(request, round_id: int, pod_id: int, **kwargs):
                 decklist_id=result.decklist_id,
                 store_id=store_id,
             )
+            increment_metrics_counters(
+                winner_rows=winner_counter_rows(
+                    WinningCommanders.objects.filter(id=winner.id)
+                )
+            )
         if not pod.submitted:
             pod.submitted = True
             pod.save()
+        mark_metrics_snapshots_stale(store_id)
+        refresh_monthly_winners(store_id, [round_id])
 
     handle_close_round(round_id)
     return Response(status=status.HTTP_201_CREATED)
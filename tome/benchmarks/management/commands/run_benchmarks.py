@@ -0,0 +1,125 @@
+import json
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from benchmarks.runner import compare_results, run_benchmarks
+from benchmarks.seeding import BenchmarkScale, seed_benchmark_store
+from stores.cache import invalidate_store_cache
+from stores.models import Store
+from utils.test_helpers import SEED_DIRECTORY, load_seed_csvs
+
+DEFAULT_STORE_SLUG = "mimics-market"
+
+
+class Command(BaseCommand):
+    help = "Seed a throwaway database at scale and record query counts, latency and memory for every GET endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--participants", type=int, default=500)
+        parser.add_argument("--years", type=int, default=5)
+        parser.add_argument(
+            "--achievements",
+            type=int,
+            default=200_000,
+            help="Total ParticipantAchievements rows to seed",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Timed requests per endpoint, after one cold request",
+        )
+        parser.add_argument(
+            "--only",
+            nargs="*",
+            help="Only benchmark these url names",
+        )
+        parser.add_argument(
+            "--output",
+            required=False,
+            help="Write the results as JSON to this path",
+        )
+        parser.add_argument(
+            "--compare",
+            required=False,
+            help="Baseline JSON from an earlier run, fails on any regression",
+        )
+        parser.add_argument(
+            "--latency-threshold",
+            type=float,
+            default=0.25,
+            help="Allowed p95 slowdown against the baseline, as a fraction",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the benchmark database between runs",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1")
+
+        baseline = None
+        if opts.get("compare"):
+            try:
+                baseline = json.loads(Path(opts["compare"]).read_text())["results"]
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Could not read baseline {opts['compare']}: {e}")
+
+        scale = BenchmarkScale(
+            participants=opts["participants"],
+            years=opts["years"],
+            achievements=opts["achievements"],
+        )
+
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=opts["keepdb"]
+        )
+        try:
+            call_command("flush", interactive=False, verbosity=0)
+            with connection.cursor() as cursor:
+                load_seed_csvs(cursor, SEED_DIRECTORY)
+            written = seed_benchmark_store(DEFAULT_STORE_SLUG, scale)
+            # COPY skips the Store signals
+            invalidate_store_cache()
+            self.stdout.write(
+                "Seeded "
+                + ", ".join(f"{count} {table}" for table, count in written.items())
+            )
+
+            store = Store.objects.get(slug=DEFAULT_STORE_SLUG)
+            results = run_benchmarks(store, opts["iterations"], opts.get("only"))
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=opts["keepdb"]
+            )
+
+        for key, result in results.items():
+            self.stdout.write(
+                f"  {key}: {result['status']} "
+                f"queries={result['queries_cold']}/{result['queries']} "
+                f"p50={result['p50_ms']}ms p95={result['p95_ms']}ms "
+                f"peak={result['peak_kb']}KB"
+            )
+
+        if opts.get("output"):
+            Path(opts["output"]).write_text(
+                json.dumps({"scale": vars(scale), "results": results}, indent=2)
+            )
+            self.stdout.write(f"Wrote results to {opts['output']}")
+
+        if baseline is not None:
+            regressions = compare_results(results, baseline, opts["latency_threshold"])
+            if regressions:
+                raise CommandError(
+                    "Benchmark regressions:\n  " + "\n  ".join(regressions)
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"\nBenchmarked {len(results)} endpoint(s)\n")
+        )
@@ -0,0 +1,240 @@
+import math
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.test import APIClient
+
+from sessions_rounds.models import Pods, PodsParticipants, Rounds
+from stores.models import Store
+from users.models import Decklists, Participants, Users
+
+# Everything under /s/<store_slug>/ is the same view as its host-routed twin
+STORE_PATH_PREFIX = "s/<slug:store_slug>/"
+DISCORD_PREFIX = "api/discord/"
+BENCHMARK_DOMAIN = "benchmark.test"
+# Routes are benchmarked against a private in-process cache, so clearing it
+# before each cold request never touches a shared (Redis) cache
+BENCHMARK_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "benchmarks",
+    }
+}
+
+# url name -> {query param: sample key} for GET views that need a query string
+QUERY_PARAMS = {
+    "badges": {"participant_id": "participant_id"},
+    "badges_bulk": {"participant_ids": "participant_ids"},
+    "signin_counts": {"round_one": "round_one", "round_two": "round_two"},
+    "decklist": {"participant_id": "participant_id", "round_id": "round_id"},
+    "decklist_by_id": {"decklist_id": "decklist_id"},
+    "admin_decklist_by_id": {"decklist_id": "decklist_id"},
+    "next_session": {"discord_user_id": "discord_user_id"},
+}
+
+
+@dataclass
+class Route:
+    name: str
+    route: str
+    params: tuple
+
+
+def _allows_get(callback) -> bool:
+    view_class = getattr(callback, "cls", None) or getattr(callback, "view_class", None)
+    return view_class is not None and hasattr(view_class, "get")
+
+
+def _params(pattern: URLPattern) -> tuple:
+    # path() converters compile to named groups too
+    return tuple(pattern.pattern.regex.groupindex)
+
+
+def collect_get_routes(patterns=None, prefix: str = "") -> list[Route]:
+    """Every named GET route in the URL conf, skipping the /s/<store_slug>/ copies."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    routes = []
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if route.startswith(STORE_PATH_PREFIX):
+            continue
+        if isinstance(pattern, URLResolver):
+            routes.extend(collect_get_routes(pattern.url_patterns, route))
+        elif pattern.name and _allows_get(pattern.callback):
+            routes.append(Route(pattern.name, route, _params(pattern)))
+    return routes
+
+
+def collect_samples(store: Store) -> dict:
+    """Real ids from the seeded store to fill in URL and query params."""
+    round_obj = (
+        Rounds.objects.filter(session__store_id=store.id, session__deleted=False)
+        .select_related("session")
+        .order_by("-id")
+        .first()
+    )
+    rounds = list(
+        Rounds.objects.filter(session_id=round_obj.session_id)
+        .order_by("round_number")
+        .values_list("id", flat=True)
+    )
+    pod = Pods.objects.filter(rounds_id=round_obj.id).order_by("id").first()
+    participant_ids = list(
+        PodsParticipants.objects.filter(pods_id=pod.id).values_list(
+            "participants_id", flat=True
+        )
+    )
+    decklist = Decklists.objects.filter(store_id=store.id).order_by("id").first()
+    discord_user_id = (
+        Participants.objects.filter(discord_user_id__isnull=False)
+        .order_by("id")
+        .values_list("discord_user_id", flat=True)
+        .first()
+    )
+
+    return {
+        "round": round_obj.id,
+        "round_id": round_obj.id,
+        "round_one": rounds[0],
+        "round_two": rounds[-1],
+        "session_id": round_obj.session_id,
+        "mm_yy": round_obj.session.month_year,
+        "pod_id": pod.id,
+        "participant_id": participant_ids[0],
+        "participant_ids": ",".join(str(pid) for pid in participant_ids),
+        "discord_user_id": discord_user_id,
+        "decklist_id": decklist.id if decklist else None,
+        # A specific name, as the Discord autocomplete sends, not one that
+        # matches every seeded participant
+        "query": f"Player {participant_ids[0]}",
+    }
+
+
+def _percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def route_request(route: Route, samples: dict) -> tuple[str, dict]:
+    """URL and query params for a GET of `route`, filled in from `samples`."""
+    url = reverse(route.name, kwargs={p: samples[p] for p in route.params})
+    data = {
+        param: samples[key]
+        for param, key in QUERY_PARAMS.get(route.name, {}).items()
+        if samples[key] is not None
+    }
+    return url, data
+
+
+def benchmark_route(
+    client: APIClient, route: Route, samples: dict, headers: dict, iterations: int
+) -> dict:
+    """Hit one route `iterations` times (after a cold request with an empty cache)
+    and return its query counts, latency percentiles and peak traced memory.
+
+    Only call this under BENCHMARK_CACHES, as run_benchmarks does."""
+    url, data = route_request(route, samples)
+    if route.route.startswith(DISCORD_PREFIX):
+        headers = {
+            **headers,
+            "HTTP_AUTHORIZATION": f"X-SERVICE-TOKEN {settings.SERVICE_TOKEN}",
+        }
+
+    cache.clear()
+    with CaptureQueriesContext(connection) as cold:
+        response = client.get(url, data, **headers)
+
+    latencies = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as warm:
+            start = time.perf_counter()
+            client.get(url, data, **headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    # Traced separately, tracemalloc slows every allocation down
+    tracemalloc.start()
+    try:
+        client.get(url, data, **headers)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "name": route.name,
+        "url": url,
+        "status": response.status_code,
+        "queries_cold": len(cold.captured_queries),
+        "queries": len(warm.captured_queries),
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(
+    store: Store, iterations: int = 20, only: Optional[list] = None
+) -> dict:
+    """Benchmark every GET route against `store`, keyed by url name + route so
+    runs with different sample ids still line up."""
+    user, _ = Users.objects.get_or_create(
+        email="benchmarks@example.test",
+        defaults={"name": "Benchmarks", "password": "benchmarks", "admin": True},
+    )
+    user.is_authenticated = True
+    user.is_superuser = True
+    user.is_staff = True
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    headers = {
+        "HTTP_HOST": f"{store.slug}.{BENCHMARK_DOMAIN}",
+        "HTTP_X_DISCORD_GUILD_ID": str(store.discord_guild_id),
+    }
+    samples = collect_samples(store)
+
+    results = {}
+    with override_settings(BASE_DOMAINS={BENCHMARK_DOMAIN}, CACHES=BENCHMARK_CACHES):
+        for route in collect_get_routes():
+            if only and route.name not in only:
+                continue
+            result = benchmark_route(client, route, samples, headers, iterations)
+            results[f"{route.name} {route.route}"] = result
+    return results
+
+
+def compare_results(
+    results: dict, baseline: dict, latency_threshold: float = 0.25
+) -> list[str]:
+    """Regressions against a baseline run: any extra query, a changed status code,
+    or a p95 more than `latency_threshold` (as a fraction) slower."""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if current["status"] != previous["status"]:
+            regressions.append(
+                f"{key}: status {previous['status']} -> {current['status']}"
+            )
+        for field in ("queries_cold", "queries"):
+            if current[field] > previous[field]:
+                regressions.append(
+                    f"{key}: {field} {previous[field]} -> {current[field]}"
+                )
+        if current["p95_ms"] > previous["p95_ms"] * (1 + latency_threshold):
+            regressions.append(
+                f"{key}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms"
+            )
+    return regressions
@@ -0,0 +1,316 @@
+import csv
+import io
+import random
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from achievements.models import Achievements, Commanders
+from metrics.counter_helpers import rebuild_metrics_counters
+from stores.models import Store
+from utils.test_helpers import copy_csv
+
+# Synthetic ids start well above anything in test_db_seeds
+ID_OFFSET = 100_000
+POD_SIZE = 4
+ROUND_STARTS = (time(13, 30), time(15, 30))
+SEQUENCE_TABLES = (
+    "participants",
+    "store_participants",
+    "sessions",
+    "rounds",
+    "pods",
+    "pods_participants",
+    "participant_achievements",
+    "winning_commanders",
+    "decklists",
+)
+
+
+@dataclass
+class BenchmarkScale:
+    participants: int = 500
+    years: int = 5
+    achievements: int = 200_000
+    players_per_round: int = 40
+    seed: int = 1
+
+
+def _copy_rows(cursor, table_name: str, columns: list, rows) -> int:
+    """Write rows to an in-memory CSV and COPY them in the same way the
+    test_db_seeds files are loaded."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    buffer.seek(0)
+    copy_csv(cursor, table_name, buffer)
+    return count
+
+
+def _session_dates(years: int) -> list:
+    """One session every Sunday for `years` years, ending with the most recent one."""
+    today = timezone.localdate()
+    last = today - timedelta(days=(today.weekday() + 1) % 7)
+    first = last - timedelta(weeks=52 * years - 1)
+    return [first + timedelta(weeks=i) for i in range(52 * years)]
+
+
+def _reset_sequences(cursor) -> None:
+    for table in SEQUENCE_TABLES:
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false);"
+        )
+
+
+def seed_benchmark_store(store_slug: str, scale: BenchmarkScale) -> dict:
+    """Fill a store (already loaded from test_db_seeds) with a few years of
+    synthetic league history. Returns how many rows were written per table."""
+    rng = random.Random(scale.seed)
+    store = Store.objects.get(slug=store_slug)
+    tz = timezone.get_current_timezone()
+
+    achievements = list(
+        Achievements.objects.filter(deleted=False, parent__isnull=True).values(
+            "id", "slug", "point_value"
+        )
+    )
+    participation = next(a for a in achievements if a["slug"] == "participation")
+    win = next(a for a in achievements if a["slug"] and "-colors" in a["slug"])
+    extras = [
+        a for a in achievements if a["id"] not in (participation["id"], win["id"])
+    ]
+    commanders = list(
+        Commanders.objects.filter(deleted=False).values("id", "name", "color_id")
+    )
+
+    participant_ids = [ID_OFFSET + i for i in range(scale.participants)]
+    dates = _session_dates(scale.years)
+    rounds = []
+    for i, session_date in enumerate(dates):
+        for number, starts in enumerate(ROUND_STARTS, start=1):
+            rounds.append(
+                (
+                    ID_OFFSET + len(rounds),
+                    ID_OFFSET + i,
+                    number,
+                    datetime.combine(session_date, starts, tzinfo=tz),
+                )
+            )
+    last_session = ID_OFFSET + len(dates) - 1
+
+    pods, pods_participants, winners, earned = [], [], [], []
+    for round_id, session_id, _, _ in rounds:
+        players = rng.sample(
+            participant_ids, min(scale.players_per_round, len(participant_ids))
+        )
+        for start in range(0, len(players) - POD_SIZE + 1, POD_SIZE):
+            pod_id = ID_OFFSET + len(pods)
+            pod_players = players[start : start + POD_SIZE]
+            pods.append((pod_id, round_id, session_id != last_session))
+            for pid in pod_players:
+                pods_participants.append(
+                    (ID_OFFSET + len(pods_participants), pod_id, pid)
+                )
+                earned.append((pid, participation, round_id, session_id))
+            if session_id == last_session:
+                continue
+            winner = rng.choice(pod_players)
+            commander = rng.choice(commanders)
+            winners.append((ID_OFFSET + len(winners), commander, pod_id, winner))
+            earned.append((winner, win, round_id, session_id))
+
+    # Spread whatever is left of the achievement budget over the pods played
+    remaining = max(scale.achievements - len(earned), 0)
+    for _ in range(remaining if extras else 0):
+        _, pod_id, pid = rng.choice(pods_participants)
+        _, round_id, _ = pods[pod_id - ID_OFFSET]
+        session_id = rounds[round_id - ID_OFFSET][1]
+        earned.append((pid, rng.choice(extras), round_id, session_id))
+
+    session_rows = (
+        (
+            ID_OFFSET + i,
+            session_date.strftime("%m-%y"),
+            datetime.combine(session_date, time(), tzinfo=tz).isoformat(),
+            ID_OFFSET + i != last_session,
+            False,
+            session_date.isoformat(),
+            store.id,
+        )
+        for i, session_date in enumerate(dates)
+    )
+
+    written = {}
+    with connection.cursor() as cursor:
+        written["participants"] = _copy_rows(
+            cursor,
+            "participants",
+            ["id", "name", "deleted", "created_at", "code", "is_patreon"],
+            (
+                (
+                    pid,
+                    f"Benchmark Player {pid}",
+                    False,
+                    timezone.now().isoformat(),
+                    f"{pid:06d}",
+                    False,
+                )
+                for pid in participant_ids
+            ),
+        )
+        written["store_participants"] = _copy_rows(
+            cursor,
+            "store_participants",
+            ["id", "participant_id", "store_id"],
+            ((pid, pid, store.id) for pid in participant_ids),
+        )
+        written["sessions"] = _copy_rows(
+            cursor,
+            "sessions",
+            [
+                "id",
+                "month_year",
+                "created_at",
+                "closed",
+                "deleted",
+                "session_date",
+                "store_id",
+            ],
+            session_rows,
+        )
+        written["rounds"] = _copy_rows(
+            cursor,
+            "rounds",
+            [
+                "id",
+                "session_id",
+                "round_number",
+                "created_at",
+                "completed",
+                "deleted",
+                "starts_at",
+            ],
+            (
+                (
+                    rid,
+                    sid,
+                    number,
+                    starts.isoformat(),
+                    sid != last_session,
+                    False,
+                    starts.isoformat(),
+                )
+                for rid, sid, number, starts in rounds
+            ),
+        )
+        written["pods"] = _copy_rows(
+            cursor,
+            "pods",
+            ["id", "rounds_id", "deleted", "submitted", "store_id"],
+            (
+                (pod_id, rid, False, submitted, store.id)
+                for pod_id, rid, submitted in pods
+            ),
+        )
+        written["pods_participants"] = _copy_rows(
+            cursor,
+            "pods_participants",
+            ["id", "pods_id", "participants_id"],
+            pods_participants,
+        )
+        written["decklists"] = _copy_rows(
+            cursor,
+            "decklists",
+            [
+                "id",
+                "name",
+                "url",
+                "participant_id",
+                "code",
+                "deleted",
+                "created_at",
+                "give_credit",
+                "store_id",
+                "commander_id",
+            ],
+            (
+                (
+                    pid,
+                    f"Benchmark Deck {pid}",
+                    f"https://example.test/decks/{pid}",
+                    pid,
+                    f"DL-{pid:06d}",
+                    False,
+                    timezone.now().isoformat(),
+                    False,
+                    store.id,
+                    rng.choice(commanders)["id"],
+                )
+                for pid in participant_ids
+            ),
+        )
+        written["winning_commanders"] = _copy_rows(
+            cursor,
+            "winning_commanders",
+            [
+                "id",
+                "name",
+                "deleted",
+                "color_id",
+                "pods_id",
+                "participants_id",
+                "store_id",
+                "commander_id",
+            ],
+            (
+                (
+                    wid,
+                    cmdr["name"],
+                    False,
+                    cmdr["color_id"],
+                    pod_id,
+                    pid,
+                    store.id,
+                    cmdr["id"],
+                )
+                for wid, cmdr, pod_id, pid in winners
+            ),
+        )
+        written["participant_achievements"] = _copy_rows(
+            cursor,
+            "participant_achievements",
+            [
+                "id",
+                "participant_id",
+                "achievement_id",
+                "store_id",
+                "round_id",
+                "session_id",
+                "deleted",
+                "earned_points",
+            ],
+            (
+                (
+                    ID_OFFSET + i,
+                    pid,
+                    achievement["id"],
+                    store.id,
+                    rid,
+                    sid,
+                    False,
+                    achievement["point_value"] or 0,
+                )
+                for i, (pid, achievement, rid, sid) in enumerate(earned)
+            ),
+        )
+        _reset_sequences(cursor)
+
+    rebuild_metrics_counters(store.id)
+    return written
@@ -0,0 +1,90 @@
+from django.core.cache import cache
+
+from benchmarks.runner import collect_get_routes, compare_results, run_benchmarks
+from benchmarks.seeding import ID_OFFSET, BenchmarkScale, seed_benchmark_store
+from stores.models import Store
+from users.models import ParticipantAchievements
+
+SMALL_SCALE = BenchmarkScale(
+    participants=12, years=1, achievements=2000, players_per_round=12
+)
+
+
+def test_collect_get_routes() -> None:
+    """Should: list GET routes once each, without the /s/<store_slug>/ copies
+    or POST-only views."""
+
+    routes = {route.name: route for route in collect_get_routes()}
+
+    assert routes["pods"].params == ("round",)
+    assert "metrics" in routes
+    assert "begin_round" not in routes
+    assert "upsert_achievements" not in routes
+    assert not any(route.route.startswith("s/") for route in routes.values())
+
+
+def test_seed_benchmark_store() -> None:
+    """Should: fill the store with synthetic history up to the achievement budget."""
+
+    written = seed_benchmark_store("mimics-market", SMALL_SCALE)
+
+    assert written["participants"] == 12
+    assert written["sessions"] == 52
+    assert written["rounds"] == 104
+    assert written["pods"] == 104 * 3
+    assert written["participant_achievements"] == 2000
+    assert (
+        ParticipantAchievements.objects.filter(id__gte=ID_OFFSET).count()
+        == written["participant_achievements"]
+    )
+
+
+def test_run_benchmarks() -> None:
+    """Should: record status, query counts, latency and memory per route."""
+
+    seed_benchmark_store("mimics-market", SMALL_SCALE)
+    store = Store.objects.get(slug="mimics-market")
+
+    results = run_benchmarks(store, iterations=2, only=["pods", "metrics"])
+
+    assert set(results) == {"pods pods/<int:round>/", "metrics metrics/"}
+    for result in results.values():
+        assert result["status"] == 200
+        assert result["queries_cold"] > 0
+        assert result["p50_ms"] <= result["p95_ms"]
+        assert result["peak_kb"] > 0
+
+
+def test_run_benchmarks_keeps_shared_cache() -> None:
+    """Should: clear only the benchmark's own cache between cold requests."""
+
+    seed_benchmark_store("mimics-market", SMALL_SCALE)
+    store = Store.objects.get(slug="mimics-market")
+    cache.set("benchmarks:keep-me", 1)
+
+    run_benchmarks(store, iterations=1, only=["pods"])
+
+    assert cache.get("benchmarks:keep-me") == 1
+
+
+def test_compare_results() -> None:
+    """Should: flag extra queries, status changes and p95s past the threshold."""
+
+    baseline = {
+        "pods": {"status": 200, "queries_cold": 8, "queries": 8, "p95_ms": 10.0},
+        "metrics": {"status": 200, "queries_cold": 20, "queries": 3, "p95_ms": 10.0},
+        "colors": {"status": 200, "queries_cold": 1, "queries": 1, "p95_ms": 2.0},
+    }
+    results = {
+        "pods": {"status": 200, "queries_cold": 9, "queries": 9, "p95_ms": 11.0},
+        "metrics": {"status": 500, "queries_cold": 20, "queries": 3, "p95_ms": 13.0},
+        "colors": {"status": 200, "queries_cold": 1, "queries": 1, "p95_ms": 2.4},
+        "new": {"status": 200, "queries_cold": 50, "queries": 50, "p95_ms": 99.0},
+    }
+
+    assert compare_results(results, baseline, latency_threshold=0.25) == [
+        "pods: queries_cold 8 -> 9",
+        "pods: queries 8 -> 9",
+        "metrics: status 200 -> 500",
+        "metrics: p95 10.0ms -> 13.0ms",
+    ]
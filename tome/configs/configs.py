@@ -1,7 +1,15 @@
+import logging
+from dataclasses import dataclass
 from typing import Any, Callable, Optional
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
 from .models import Config
 
+logger = logging.getLogger(__name__)
+
 # Config type constants
 CONFIG_TYPE_TEXT = "text"
 CONFIG_TYPE_NUMBER = "number"
@@ -129,15 +137,69 @@ def get_config_schema(key: str) -> dict[str, Any]:
     return schema
 
 
+@dataclass(frozen=True)
+class StoreConfig:
+    """Every CONFIG_REGISTRY value for a store, cast to its Python type. Keep the
+    fields in registry order, configs/tests.py checks the two match."""
+
+    round_one_cap: int
+    round_two_cap: int
+    round_day: str
+    round_one_start: str
+    round_two_start: str
+    enable_snack_sharing: bool
+    enable_money_pack: bool
+
+
+def _cast_config(key: str, raw: Any) -> Any:
+    entry = CONFIG_REGISTRY[key]
+    if "cast" in entry:
+        return entry["cast"](raw)
+    if entry["type"] == CONFIG_TYPE_CHECKBOX:
+        # Anything but an explicit "false" leaves the feature on
+        return str(raw).strip().lower() != "false"
+    return str(raw)
+
+
+def _config_cache_key(store_id: int) -> str:
+    return f"configs:store:{store_id}"
+
+
+def get_store_config(store_id: int) -> StoreConfig:
+    """The store's typed config from one cache hit, loaded from Config (falling
+    back to DEFAULT_VALUES) on a miss."""
+    key = _config_cache_key(store_id)
+    values = cache.get(key)
+    if values is None:
+        stored = dict(
+            Config.objects.filter(
+                store_id=store_id, key__in=CONFIG_REGISTRY
+            ).values_list("key", "value")
+        )
+        values = {}
+        for config_key in CONFIG_REGISTRY:
+            try:
+                values[config_key] = _cast_config(
+                    config_key, stored.get(config_key, DEFAULT_VALUES[config_key])
+                )
+            except (TypeError, ValueError):
+                logger.warning(
+                    "Invalid %s config for store %s, using the default",
+                    config_key,
+                    store_id,
+                )
+                values[config_key] = _cast_config(
+                    config_key, DEFAULT_VALUES[config_key]
+                )
+        cache.set(key, values, timeout=settings.CONFIG_CACHE_TTL)
+    return StoreConfig(**values)
+
+
+def invalidate_store_config(store_id: int) -> None:
+    """Drop a store's cached config once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(_config_cache_key(store_id)))
+
+
 def get_round_caps(store_id: int) -> tuple[int, int]:
-    caps = dict(
-        Config.objects.filter(
-            key__in=["round_one_cap", "round_two_cap"], store_id=store_id
-        ).values_list("key", "value")
-    )
-    r1_cast = CONFIG_SPEC["round_one_cap"]["cast"]
-    r2_cast = CONFIG_SPEC["round_two_cap"]["cast"]
-    return (
-        r1_cast(caps.get("round_one_cap", 24)),
-        r2_cast(caps.get("round_two_cap", 24)),
-    )
+    config = get_store_config(store_id)
+    return config.round_one_cap, config.round_two_cap
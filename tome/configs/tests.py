@@ -1,3 +1,77 @@
-from django.test import TestCase
+from dataclasses import fields
 
-# Create your tests here.
+from django.urls import reverse
+from rest_framework import status
+
+from configs.configs import (
+    CONFIG_REGISTRY,
+    DEFAULT_VALUES,
+    StoreConfig,
+    get_round_caps,
+    get_store_config,
+)
+from configs.models import Config
+from utils.test_helpers import get_ids
+
+ids = get_ids()
+
+
+def _shop_config(key: str, value: str) -> Config:
+    return Config.objects.create(
+        scope_kind=Config.Scope.SHOP,
+        store_id=ids.MIMICS_ID,
+        key=key,
+        value=value,
+        name=key,
+    )
+
+
+def test_store_config_matches_registry() -> None:
+    """should: have a StoreConfig field and a default for every registry key"""
+
+    assert [f.name for f in fields(StoreConfig)] == list(CONFIG_REGISTRY)
+    assert set(DEFAULT_VALUES) == set(CONFIG_REGISTRY)
+
+
+def test_store_config_defaults() -> None:
+    """should: fall back to DEFAULT_VALUES, cast to each config's type"""
+
+    assert get_store_config(ids.MIMICS_ID) == StoreConfig(
+        round_one_cap=24,
+        round_two_cap=24,
+        round_day="Wednesday",
+        round_one_start="1:30PM",
+        round_two_start="3:30PM",
+        enable_snack_sharing=True,
+        enable_money_pack=True,
+    )
+
+
+def test_store_config_is_typed_and_cached(django_assert_num_queries) -> None:
+    """should: cast stored values and serve repeat lookups without a query"""
+
+    _shop_config("round_one_cap", "12")
+    _shop_config("enable_money_pack", "false")
+
+    config = get_store_config(ids.MIMICS_ID)
+    assert config.round_one_cap == 12
+    assert config.enable_money_pack is False
+
+    with django_assert_num_queries(0):
+        assert get_round_caps(ids.MIMICS_ID) == (12, 24)
+
+
+def test_update_config_invalidates(client) -> None:
+    """should: serve the new value after it is updated through the API"""
+
+    _shop_config("round_two_cap", "20")
+    assert get_round_caps(ids.MIMICS_ID) == (24, 20)
+
+    res = client.post(
+        reverse("update", kwargs={"key": "round_two_cap"}),
+        {"value": 16},
+        format="json",
+    )
+
+    assert res.status_code == status.HTTP_201_CREATED
+    assert get_round_caps(ids.MIMICS_ID) == (24, 16)
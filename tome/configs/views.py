@@ -11,7 +11,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.response import Response
 from .models import Config
-from .configs import CONFIG_REGISTRY, get_config_schema
+from .configs import CONFIG_REGISTRY, get_config_schema, invalidate_store_config
 
 GET = "GET"
 POST = "POST"
@@ -87,5 +87,6 @@ def update_config(request, key, **kwargs):
 
     target.value = str(value)
     target.save(update_fields=["value", "updated_at"])
+    invalidate_store_config(request.store_id)
 
     return Response(status=status.HTTP_201_CREATED)
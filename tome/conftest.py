@@ -3,10 +3,13 @@ from unittest import mock
 from datetime import datetime
 
 from rest_framework.test import APIClient
+from django.core.cache import cache
 from django.db import connection
-from pathlib import Path
-from utils.test_helpers import get_ids
+from utils.test_helpers import get_ids, load_seed_csvs
 
+from achievements.color_helpers import clear_color_table
+from services.scryfall_client import clear_card_lru
+from stores.cache import clear_local_store_cache
 from users.models import Users
 
 ids = get_ids()
@@ -71,7 +74,12 @@ def mock_today():
 def seed_db(transactional_db):
     """Seed our test_db based on the contents of our csv files.
 
-    Additionally, reset id sequences for various tables."""
+    Additionally, reset id sequences for various tables and drop anything
+    cached against the previous test's data."""
+    cache.clear()
+    clear_local_store_cache()
+    clear_card_lru()
+    clear_color_table()
     with connection.cursor() as cursor:
         cursor.execute("SELECT setval('participants_id_seq', 1, false);")
         cursor.execute("SELECT setval('achievements_id_seq', 1, false);")
@@ -90,13 +98,4 @@ def seed_db(transactional_db):
             """
         )
 
-        for file in sorted(Path(SEED_DIRECTORY).iterdir()):
-            with file.open() as f:
-                colnames, *_ = f.readlines()
-                colnames = colnames.strip()
-                _, table_name = file.stem.split("_", maxsplit=1)
-
-                f.seek(0)
-                cursor.copy_expert(
-                    f"COPY {table_name} ({colnames}) FROM STDIN CSV HEADER", f
-                )
+        load_seed_csvs(cursor, SEED_DIRECTORY)
@@ -0,0 +1,67 @@
+import pytest
+
+from rest_framework.test import APIClient
+from django.urls import reverse
+from rest_framework import status
+
+from users.models import Participants
+from users.queries import SEARCH_LIMIT
+
+
+@pytest.fixture(scope="function")
+def client(settings):
+    settings.SERVICE_TOKEN = "test-token"
+    api = APIClient()
+    api.credentials(
+        HTTP_AUTHORIZATION="X-SERVICE-TOKEN test-token",
+        HTTP_X_DISCORD_GUILD_ID="1123750208937938964",
+    )
+    return api
+
+
+@pytest.fixture(scope="function")
+def unlinked_participants() -> None:
+    for name in ["Gwendolyn Harrow", "Gwen Stacy", "Thomas Gwenn"]:
+        Participants.objects.create(name=name, discord_user_id=None)
+    Participants.objects.create(name="Gwen Linked", discord_user_id=424242)
+
+
+def test_search_ranks_matches(client, unlinked_participants) -> None:
+    """
+    should: return unlinked participants, closest name match first
+    """
+
+    res = client.get(reverse("search", kwargs={"query": "gwen"}))
+
+    assert res.status_code == status.HTTP_200_OK
+    names = [p["name"] for p in res.json()]
+    assert names[0] == "Gwen Stacy"
+    assert set(names) == {"Gwen Stacy", "Gwendolyn Harrow", "Thomas Gwenn"}
+
+
+def test_find_participants_tolerates_typos(client, unlinked_participants) -> None:
+    """
+    should: still find a participant when the name is slightly misspelled
+    """
+
+    res = client.post(reverse("find_join"), {"query": "harow"}, format="json")
+
+    assert res.status_code == status.HTTP_200_OK
+    assert [p["name"] for p in res.json()["matches"]] == ["Gwendolyn Harrow"]
+
+
+def test_search_is_limited(client) -> None:
+    """
+    should: cap the number of results for the autocomplete
+    """
+
+    Participants.objects.bulk_create(
+        [
+            Participants(name=f"Filler Player {i}", code=f"F{i:05d}")
+            for i in range(SEARCH_LIMIT + 5)
+        ]
+    )
+
+    res = client.get(reverse("search", kwargs={"query": "filler"}))
+
+    assert len(res.json()) == SEARCH_LIMIT
@@ -0,0 +1,66 @@
+import pytest
+
+from rest_framework.test import APIClient
+from django.urls import reverse
+from rest_framework import status
+
+from stores.cache import get_store_for_guild
+from stores.models import Store
+from utils.test_helpers import get_ids
+
+ids = get_ids()
+
+GUILD_ID = "1123750208937938964"
+CHANNEL_ID = 5550001
+
+
+@pytest.fixture(scope="function")
+def client(settings):
+    settings.SERVICE_TOKEN = "test-token"
+    api = APIClient()
+    api.credentials(HTTP_AUTHORIZATION="X-SERVICE-TOKEN test-token")
+    return api
+
+
+@pytest.fixture(scope="function")
+def store_channel():
+    store = Store.objects.get(id=ids.MIMICS_ID)
+    store.discord_channel_id = CHANNEL_ID
+    store.save()
+    return store
+
+
+def test_validate_channel(client, store_channel) -> None:
+    """should: accept the store's channel and reject any other channel or guild"""
+    url = reverse("validate_channel")
+
+    ok = client.post(url, {"guild_id": GUILD_ID, "channel_id": CHANNEL_ID})
+    wrong_channel = client.post(url, {"guild_id": GUILD_ID, "channel_id": 1})
+    wrong_guild = client.post(url, {"guild_id": "42", "channel_id": CHANNEL_ID})
+
+    assert ok.status_code == status.HTTP_204_NO_CONTENT
+    assert wrong_channel.status_code == status.HTTP_404_NOT_FOUND
+    assert wrong_guild.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_validate_channel_after_store_change(client, store_channel) -> None:
+    """should: pick up a new channel id once the store is saved"""
+    url = reverse("validate_channel")
+    client.post(url, {"guild_id": GUILD_ID, "channel_id": CHANNEL_ID})
+
+    store_channel.discord_channel_id = CHANNEL_ID + 1
+    store_channel.save()
+    res = client.post(url, {"guild_id": GUILD_ID, "channel_id": CHANNEL_ID + 1})
+
+    assert res.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_guild_lookup_is_cached(django_assert_num_queries) -> None:
+    """should: resolve a guild from the cache once warm, including unknown ones"""
+    assert get_store_for_guild(GUILD_ID)["id"] == ids.MIMICS_ID
+    assert get_store_for_guild("42") is None
+
+    with django_assert_num_queries(0):
+        assert get_store_for_guild(GUILD_ID)["id"] == ids.MIMICS_ID
+        assert get_store_for_guild("42") is None
+        assert get_store_for_guild("not-a-guild") is None
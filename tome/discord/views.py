@@ -6,17 +6,19 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Count, Q
+from django.db.models import Count
 from utils.decorators import require_service_token, require_discord_store
 
 from users.models import Participants, EditToken, Decklists
 from users.helpers import check_for_bad_words
+from users.queries import search_participants
 from sessions_rounds.models import Sessions, RoundSignups, Rounds, Pods
 from sessions_rounds.helpers import (
     is_patreon_only_window,
     get_session_for_rounds,
     patreon_signin_rejection_message,
 )
+from stores.cache import get_store_for_guild
 from stores.models import Store, StoreParticipant
 
 from configs.configs import get_round_caps
@@ -56,14 +58,7 @@ def mycode(request, discord_user_id):
 def search(request, query):
     """Take in the string we're looking for and search against users who
     are currently unlinked."""
-    q = (query or "").strip()
-    matched_participants = Participants.objects.filter(
-        Q(name__icontains=q),
-        discord_user_id=None,
-        deleted=False,
-    ).values("id", "name")
-
-    return Response(list(matched_participants))
+    return Response(search_participants(query or "", discord_user_id=None))
 
 
 @csrf_exempt
@@ -407,14 +402,9 @@ def validate_channel(request):
             status=status.HTTP_404_NOT_FOUND,
         )
 
-    exists = Store.objects.filter(
-        discord_guild_id=guild,
-        discord_channel_id=channel,
-        deleted=False,
-        is_active=True,
-    ).exists()
+    store = get_store_for_guild(guild)
 
-    if not exists:
+    if not store or str(store["discord_channel_id"]) != str(channel):
         return Response(
             {"message": "Store not found"}, status=status.HTTP_404_NOT_FOUND
         )
@@ -512,16 +502,8 @@ def find_participants(request):
             {"matches": []},
             status=status.HTTP_200_OK,
         )
-    participants = (
-        Participants.objects.filter(
-            discord_user_id__isnull=True, name__icontains=raw_query, deleted=False
-        )
-        .distinct()
-        .order_by("name")[:25]
-        .values("id", "name")
-    )
     return Response(
-        {"matches": list(participants)},
+        {"matches": search_participants(raw_query, discord_user_id__isnull=True)},
         status=status.HTTP_200_OK,
     )
 
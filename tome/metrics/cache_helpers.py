@@ -0,0 +1,102 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import localdate
+
+METRICS_CACHE_TTL = 60 * 60 * 24
+HITS_KEY = "metrics:response:hits"
+MISSES_KEY = "metrics:response:misses"
+BADGE_CATALOG_VERSION_KEY = "metrics:badges:catalog_version"
+
+
+def _version_key(store_id: int) -> str:
+    return f"metrics:version:{store_id}"
+
+
+def _incr(key: str, delta: int = 1) -> int:
+    # Seed missing keys so incr doesn't raise; add is a no-op when the key exists
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Evicted between add and incr
+        cache.set(key, delta, timeout=None)
+        return delta
+
+
+def _get_version(key: str) -> int:
+    # Versions start from the clock rather than 1 so a version evicted from the
+    # cache can never come back as a number that was already used for entries
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(key: str) -> int:
+    _get_version(key)
+    return _incr(key)
+
+
+def get_metrics_data_version(store_id: int) -> int:
+    """Current data version for a store's metrics."""
+    return _get_version(_version_key(store_id))
+
+
+def bump_metrics_data_version(store_id: int) -> int:
+    """Invalidate every cached metrics response for a store."""
+    return _bump_version(_version_key(store_id))
+
+
+def get_badge_catalog_version() -> int:
+    """Current version of the achievement catalog that badges are built from."""
+    return _get_version(BADGE_CATALOG_VERSION_KEY)
+
+
+def bump_badge_catalog_version() -> int:
+    """Invalidate the cached badge catalog after achievements change."""
+    return _bump_version(BADGE_CATALOG_VERSION_KEY)
+
+
+def badge_catalog_key(version: int) -> str:
+    return f"metrics:badges:catalog:{version}"
+
+
+def metrics_response_key(store_id: int, period: str, version: int) -> str:
+    # The payload is relative to today (period bounds, days since last draw)
+    return f"metrics:response:{store_id}:{period}:{version}:{localdate().isoformat()}"
+
+
+def _record_metrics_read(hit: bool) -> None:
+    # Off unless METRICS_CACHE_STATS is set, it costs an extra cache round trip
+    if settings.METRICS_CACHE_STATS:
+        _incr(HITS_KEY if hit else MISSES_KEY)
+
+
+def get_cached_metrics(store_id: int, period: str, build):
+    """Return the metrics for a store + period from the response cache, calling
+    `build()` and caching its result on a miss."""
+    key = metrics_response_key(store_id, period, get_metrics_data_version(store_id))
+    cached = cache.get(key)
+    if cached is not None:
+        _record_metrics_read(hit=True)
+        return cached["metrics"]
+
+    _record_metrics_read(hit=False)
+    metrics = build()
+    # Wrapped so a store with no metrics (None) is still a cache hit
+    cache.set(key, {"metrics": metrics}, timeout=METRICS_CACHE_TTL)
+    return metrics
+
+
+def collect_metrics_cache_stats() -> dict:
+    hits = cache.get(HITS_KEY) or 0
+    misses = cache.get(MISSES_KEY) or 0
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else None,
+    }
@@ -0,0 +1,279 @@
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Iterable, Optional
+
+from django.db import connection, transaction
+from django.db.models import Count, DateField, F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from achievements.models import WinningCommanders
+from users.models import ParticipantAchievements
+
+from .models import MetricsMonthlyCounter, ParticipantMonthlyPoints
+
+PARTICIPANT_WINS = "participant_wins"
+COMMANDER_WINS = "commander_wins"
+COLOR_PIE = "color_pie"
+DRAWS = "draws"
+KNOCKOUTS = "knockouts"
+LAST_WINS = "last_wins"
+SNACK_POINTS = "snack_points"
+
+# Achievement slug -> metric it is counted toward (one per earned row)
+COUNTED_SLUGS = {
+    "end-draw": DRAWS,
+    "knock-out": KNOCKOUTS,
+    "last-in-order": LAST_WINS,
+}
+# Achievement slugs whose earned points are summed into SNACK_POINTS
+SNACK_SLUGS = ("best-snack", "bring-snack")
+
+DRAW_WINNER_NAME = "END IN DRAW"
+
+ACHIEVEMENT_COUNTER_VALUES = (
+    "store_id",
+    "participant_id",
+    "earned_points",
+    "achievement__slug",
+    "round__created_at",
+    "session__month_year",
+)
+WINNER_COUNTER_VALUES = (
+    "store_id",
+    "participants_id",
+    "name",
+    "color_id",
+    "pods__rounds__created_at",
+)
+
+
+def _month(dt) -> date:
+    return dt.date().replace(day=1)
+
+
+def _key(value) -> str:
+    return "" if value is None else str(value)
+
+
+def achievement_counter_rows(queryset) -> list[dict]:
+    """Snapshot the fields the counters need from a ParticipantAchievements queryset.
+
+    Call this before soft deleting, since the rows drop out of most filters after."""
+    return list(queryset.values(*ACHIEVEMENT_COUNTER_VALUES))
+
+
+def winner_counter_rows(queryset) -> list[dict]:
+    """Snapshot the fields the counters need from a WinningCommanders queryset."""
+    return list(queryset.values(*WINNER_COUNTER_VALUES))
+
+
+def _deltas(achievement_rows: Iterable[dict], winner_rows: Iterable[dict]) -> Counter:
+    """Fold raw rows into {(store_id, month, metric, key): delta}."""
+    deltas = Counter()
+
+    for row in achievement_rows:
+        slug = row["achievement__slug"]
+        month = _month(row["round__created_at"])
+        bucket = (row["store_id"], month)
+        if slug in COUNTED_SLUGS:
+            deltas[(*bucket, COUNTED_SLUGS[slug], _key(row["participant_id"]))] += 1
+        elif slug in SNACK_SLUGS:
+            deltas[(*bucket, SNACK_POINTS, _key(row["participant_id"]))] += row[
+                "earned_points"
+            ]
+
+    for row in winner_rows:
+        if row["name"] == DRAW_WINNER_NAME:
+            continue
+        bucket = (row["store_id"], _month(row["pods__rounds__created_at"]))
+        deltas[(*bucket, PARTICIPANT_WINS, _key(row["participants_id"]))] += 1
+        deltas[(*bucket, COMMANDER_WINS, _key(row["name"]))] += 1
+        deltas[(*bucket, COLOR_PIE, _key(row["color_id"]))] += 1
+
+    return deltas
+
+
+def _points_deltas(achievement_rows: Iterable[dict]) -> dict:
+    """Fold raw rows into {(store_id, month_year, participant_id): [points, count]}."""
+    deltas = defaultdict(lambda: [0, 0])
+    for row in achievement_rows:
+        if row["store_id"] is None:
+            continue
+        key = (row["store_id"], row["session__month_year"], row["participant_id"])
+        deltas[key][0] += row["earned_points"]
+        deltas[key][1] += 1
+    return deltas
+
+
+def _add_to_rows(model, key_fields: tuple, value_fields: tuple, rows: list) -> None:
+    """Add each row's values onto the matching `model` row in one statement,
+    inserting the rows that don't exist yet. Rows are (*keys, *values) tuples."""
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    keys = [quote(model._meta.get_field(f).column) for f in key_fields]
+    values = [quote(model._meta.get_field(f).column) for f in value_fields]
+    row_sql = "(" + ", ".join(["%s"] * (len(keys) + len(values))) + ")"
+    sql = (
+        f"INSERT INTO {table} ({', '.join(keys + values)}) "
+        f"VALUES {', '.join([row_sql] * len(rows))} "
+        f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET "
+        + ", ".join(f"{c} = {table}.{c} + EXCLUDED.{c}" for c in values)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [param for row in rows for param in row])
+
+
+def _apply_points_deltas(deltas: dict, sign: int) -> None:
+    rows = [
+        (store_id, month_year, participant_id, sign * points, sign * count)
+        for (store_id, month_year, participant_id), (points, count) in deltas.items()
+    ]
+    if not rows:
+        return
+
+    _add_to_rows(
+        ParticipantMonthlyPoints,
+        ("store", "month_year", "participant"),
+        ("total_points", "earned_count"),
+        rows,
+    )
+
+
+def _apply_deltas(deltas: Counter, sign: int) -> None:
+    rows = [
+        (store_id, month, metric, key, sign * delta)
+        for (store_id, month, metric, key), delta in deltas.items()
+        if delta and store_id is not None
+    ]
+    if not rows:
+        return
+
+    _add_to_rows(
+        MetricsMonthlyCounter, ("store", "month", "metric", "key"), ("value",), rows
+    )
+
+
+def increment_metrics_counters(
+    achievement_rows: Iterable[dict] = (), winner_rows: Iterable[dict] = ()
+) -> None:
+    """Add newly written achievements/winners to the monthly counters and the
+    leaderboard points."""
+    _apply_deltas(_deltas(achievement_rows, winner_rows), 1)
+    _apply_points_deltas(_points_deltas(achievement_rows), 1)
+
+
+def decrement_metrics_counters(
+    achievement_rows: Iterable[dict] = (), winner_rows: Iterable[dict] = ()
+) -> None:
+    """Remove soft deleted achievements/winners from the monthly counters and the
+    leaderboard points."""
+    _apply_deltas(_deltas(achievement_rows, winner_rows), -1)
+    _apply_points_deltas(_points_deltas(achievement_rows), -1)
+
+
+def rebuild_metrics_counters(store_id: int) -> int:
+    """Recompute every monthly counter and the leaderboard points for a store from
+    scratch, returns the monthly counter row count."""
+    month = TruncMonth("round__created_at", output_field=DateField())
+    achievement_totals = (
+        ParticipantAchievements.objects.filter(
+            store_id=store_id,
+            deleted=False,
+            achievement__slug__in=[*COUNTED_SLUGS, *SNACK_SLUGS],
+        )
+        .annotate(month=month)
+        .values("month", "participant_id", "achievement__slug")
+        .annotate(earned=Count("id"), points=Sum("earned_points"))
+    )
+
+    month = TruncMonth("pods__rounds__created_at", output_field=DateField())
+    winner_totals = (
+        WinningCommanders.objects.filter(store_id=store_id, deleted=False)
+        .exclude(name=DRAW_WINNER_NAME)
+        .annotate(month=month)
+        .values("month", "participants_id", "name", "color_id")
+        .annotate(wins=Count("id"))
+    )
+
+    totals = Counter()
+    for row in achievement_totals:
+        slug = row["achievement__slug"]
+        metric = COUNTED_SLUGS.get(slug, SNACK_POINTS)
+        value = row["points"] if metric == SNACK_POINTS else row["earned"]
+        totals[(row["month"], metric, _key(row["participant_id"]))] += value
+
+    for row in winner_totals:
+        totals[(row["month"], PARTICIPANT_WINS, _key(row["participants_id"]))] += row[
+            "wins"
+        ]
+        totals[(row["month"], COMMANDER_WINS, _key(row["name"]))] += row["wins"]
+        totals[(row["month"], COLOR_PIE, _key(row["color_id"]))] += row["wins"]
+
+    points_totals = (
+        ParticipantAchievements.objects.filter(
+            store_id=store_id, deleted=False, session__deleted=False
+        )
+        .values("session__month_year", "participant_id")
+        .annotate(total_points=Sum("earned_points"), earned_count=Count("id"))
+    )
+
+    with transaction.atomic():
+        ParticipantMonthlyPoints.objects.filter(store_id=store_id).delete()
+        ParticipantMonthlyPoints.objects.bulk_create(
+            [
+                ParticipantMonthlyPoints(
+                    store_id=store_id,
+                    month_year=row["session__month_year"],
+                    participant_id=row["participant_id"],
+                    total_points=row["total_points"],
+                    earned_count=row["earned_count"],
+                )
+                for row in points_totals
+            ]
+        )
+        MetricsMonthlyCounter.objects.filter(store_id=store_id).delete()
+        MetricsMonthlyCounter.objects.bulk_create(
+            [
+                MetricsMonthlyCounter(
+                    store_id=store_id, month=month, metric=metric, key=key, value=value
+                )
+                for (month, metric, key), value in totals.items()
+            ]
+        )
+    return len(totals)
+
+
+def get_metrics_counters(store_id: int, start: Optional[date] = None) -> dict:
+    """Sum the monthly counters for a store from `start` (inclusive) onward.
+
+    Returns {metric: Counter(key -> total)}, each ordered by total descending."""
+    filters = Q(store_id=store_id)
+    if start is not None:
+        filters &= Q(month__gte=start)
+
+    rows = (
+        MetricsMonthlyCounter.objects.filter(filters)
+        .values("metric", "key")
+        .annotate(total=Sum("value"))
+        .filter(total__gt=0)
+        .order_by("metric", "-total", "key")
+    )
+
+    counters = defaultdict(Counter)
+    for row in rows:
+        counters[row["metric"]][row["key"]] = row["total"]
+    return counters
+
+
+def get_month_leaderboard(store_id: int, mm_yy: str) -> list[dict]:
+    """Point totals for every participant with achievements in the month, highest first."""
+    return list(
+        ParticipantMonthlyPoints.objects.filter(
+            store_id=store_id,
+            month_year=mm_yy,
+            earned_count__gt=0,
+            participant__deleted=False,
+        )
+        .order_by("-total_points", "participant_id")
+        .values("total_points", id=F("participant_id"), name=F("participant__name"))
+    )
@@ -2,12 +2,37 @@ from collections import defaultdict, Counter, OrderedDict
 from django.db.models import Sum, Q, Exists, OuterRef, Value, Case, When, F
 from django.db.models.functions import Concat, Coalesce
 
+from django.core.cache import cache
 from django.utils.timezone import now, make_aware
 
-from achievements.models import WinningCommanders, Achievements
-from sessions_rounds.models import PodsParticipants, Sessions
+from achievements.color_helpers import get_color_table
+from achievements.models import Achievements
 from users.models import ParticipantAchievements, Participants
 
+from .cache_helpers import (
+    badge_catalog_key,
+    get_badge_catalog_version,
+    METRICS_CACHE_TTL,
+)
+from .queries import (
+    achievement_earned_totals,
+    biggest_burger_rounds,
+    individual_metrics_row,
+    individual_session_points,
+    top_point_earners,
+    top_unique_earners,
+)
+from .counter_helpers import (
+    get_metrics_counters,
+    PARTICIPANT_WINS,
+    COMMANDER_WINS,
+    COLOR_PIE,
+    DRAWS,
+    KNOCKOUTS,
+    LAST_WINS,
+    SNACK_POINTS,
+)
+
 
 def first_of_month(dt):
     return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -68,17 +93,33 @@ def resolve_achievement_display_name(achievement_data: dict) -> str:
     )
 
 
+def participant_names(*counters) -> dict:
+    """Look up names for the participant id keys across the given counters."""
+    ids = {int(k) for counter in counters for k in counter if k}
+    return dict(Participants.objects.filter(id__in=ids).values_list("id", "name"))
+
+
+def by_participant_name(counter, names) -> Counter:
+    """Re-key a participant id counter by participant name."""
+    out = Counter()
+    for pid, value in counter.items():
+        out[names.get(int(pid)) if pid else None] += value
+    return out
+
+
 class MetricsCalculator:
     def __init__(self, store_id: int):
         self.metrics = {}
         self.store_id = store_id
 
-    def build_color_pie(self, winners) -> None:
+    def build_color_pie(self, color_counts) -> None:
         try:
+            colors = get_color_table().by_id
             color_pie = {}
-            for winner in winners:
-                symbol = winner["color__symbol"]
-                color_pie[symbol] = color_pie.get(symbol, 0) + 1
+            for color_id, wins in color_counts.items():
+                color = colors.get(int(color_id)) if color_id else None
+                symbol = color.symbol if color else None
+                color_pie[symbol] = color_pie.get(symbol, 0) + wins
             self.metrics["color_pie"] = color_pie if color_pie else None
         except (KeyError, TypeError) as e:
             print(f"Error building color pie: {e}")
@@ -87,22 +128,20 @@ class MetricsCalculator:
         """Unique key for achievement chart: (achievement_id, scalable_term_id or 0)."""
         return (earned["achievement__id"], earned.get("scalable_term_id") or 0)
 
-    def build_achievement_chart(self, achievements):
+    def build_achievement_chart(self, earned_totals):
         try:
             achievement_chart = defaultdict(
                 lambda: {"name": "", "point_value": "", "count": 0}
             )
 
-            for earned in achievements:
-                if earned["achievement__slug"] is not None:
-                    continue
+            for earned in earned_totals:
                 name = resolve_achievement_display_name(earned)
                 key = self._achievement_chart_key(earned)
                 point_value = earned["achievement__point_value"]
 
                 achievement_chart[key]["name"] = name
                 achievement_chart[key]["point_value"] = point_value
-                achievement_chart[key]["count"] += 1
+                achievement_chart[key]["count"] += earned["count"]
             self.metrics["achievement_chart"] = {
                 f"{k[0]}-{k[1]}": v
                 for k, v in achievement_chart.items()
@@ -112,11 +151,9 @@ class MetricsCalculator:
         except (KeyError, TypeError) as e:
             print(f"Error building achievement chart: {e}")
 
-    def build_big_winner(self, winners):
+    def build_big_winner(self, participant_wins):
         try:
-            winner_map = defaultdict(int)
-            for winner in winners:
-                winner_map[winner["participants__name"]] += 1
+            winner_map = participant_wins
             max_wins = max(winner_map.values(), default=0)
             self.metrics["big_winners"] = [
                 {"name": participant, "wins": wins}
@@ -126,16 +163,12 @@ class MetricsCalculator:
         except Exception as e:
             print(f"Error building big winner: {e}")
 
-    def build_most_earned(self, achievements):
+    def build_most_earned(self, earned_totals):
         try:
             most_earned = Counter()
-            for achievement in achievements:
-                slug = achievement.get("achievement__slug")
-                if slug is not None:
-                    continue
-
-                name = resolve_achievement_display_name(achievement)
-                most_earned[name] += 1
+            for earned in earned_totals:
+                name = resolve_achievement_display_name(earned)
+                most_earned[name] += earned["count"]
 
             self.metrics["most_earned"] = dict(Counter(most_earned).most_common(5))
 
@@ -176,14 +209,15 @@ class MetricsCalculator:
         except Exception as e:
             print(f"Error building since last draw: {e}")
 
-    def top_five_commanders(self, winners):
+    def top_five_commanders(self, commander_counts, participant_wins):
         try:
-            commander_wins = Counter()
-            participant_wins = Counter()
-            for winner in winners:
-                if winner["name"] and winner["name"] != "UNKNOWN":
-                    commander_wins[winner["name"]] += 1
-                participant_wins[winner["participants__name"]] += 1
+            commander_wins = Counter(
+                {
+                    name: wins
+                    for name, wins in commander_counts.items()
+                    if name and name != "UNKNOWN"
+                }
+            )
             self.metrics["common_commanders"] = dict(
                 Counter(commander_wins).most_common(5)
             )
@@ -193,149 +227,89 @@ class MetricsCalculator:
         except Exception as e:
             print(f"Error building top 5: {e}")
 
-    def build_top_fives(self, achievements):
-        snack_leaders = Counter()
-        points_by_participant = Counter()
-        most_draws = Counter()
-        most_knockouts = Counter()
-        most_last_wins = Counter()
-        biggest_burger = defaultdict(Counter)
-        round_meta = {}
-        unique = defaultdict(set)
-
-        for achievement in achievements:
-            player_name = achievement["participant__name"]
-            points = achievement["earned_points"]
-            slug = achievement.get("achievement__slug")
-            rnd = str(achievement["round_id"])
-
-            round_meta[rnd] = (
-                achievement["round__round_number"],
-                achievement["round__starts_at"],
-            )
-
-            points_by_participant[player_name] += points
-
-            if slug is None or slug != "best-snack":
-                biggest_burger[rnd][player_name] += points
-
-            unique_key = (
-                achievement["achievement__id"],
-                achievement.get("scalable_term_id") or 0,
-            )
-            unique[player_name].add(unique_key)
-
-            if slug == "best-snack" or slug == "bring-snack":
-                snack_leaders[player_name] += points
-
-            if slug == "end-draw":
-                most_draws[player_name] += 1
-
-            if slug == "knock-out":
-                most_knockouts[player_name] += 1
-
-            if slug == "last-in-order":
-                most_last_wins[player_name] += 1
-
-        winners_by_round = []
-        for rid, counter in biggest_burger.items():
-            if not counter:
-                continue
-            player, pts = counter.most_common(1)[0]
-            rnum, rdate = round_meta[rid]
-            winners_by_round.append(
-                {
-                    "round_id": rid,
-                    "player": player,
-                    "points": pts,
-                    "round_number": rnum,
-                    "round_date": rdate,
-                }
-            )
-        top5 = sorted(winners_by_round, key=lambda x: x["points"], reverse=True)[:5]
+    def build_counter_top_fives(self, counters, names):
+        """Top fives that come straight off the monthly counters."""
+        self.metrics["snack_leaders"] = dict(
+            by_participant_name(counters[SNACK_POINTS], names).most_common(5)
+        )
+        self.metrics["most_draws"] = dict(
+            by_participant_name(counters[DRAWS], names).most_common(5)
+        )
+        self.metrics["most_knockouts"] = dict(
+            by_participant_name(counters[KNOCKOUTS], names).most_common(5)
+        )
+        self.metrics["most_last_wins"] = dict(
+            by_participant_name(counters[LAST_WINS], names).most_common(5)
+        )
 
+    def build_top_fives(self, filters):
+        """Points, unique achievements and biggest burger, each ranked and
+        limited to the top five in the database."""
         burger_display = OrderedDict()
-        for w in top5:
-            dt = w["round_date"]
+        for w in biggest_burger_rounds(filters):
+            dt = w["round__starts_at"]
             when = dt.strftime("%b %d, %Y") if hasattr(dt, "strftime") else str(dt)
-            key = f'{w["player"]}, Round {w["round_number"]} on {when}'
+            key = (
+                f'{w["participant__name"]}, Round {w["round__round_number"]} on {when}'
+            )
             burger_display[key] = w["points"]
 
-        self.metrics["snack_leaders"] = dict(Counter(snack_leaders).most_common(5))
-        self.metrics["overall_points"] = dict(
-            Counter(points_by_participant).most_common(5)[1:]
-        )
-        self.metrics["most_draws"] = dict(Counter(most_draws).most_common(5))
-        self.metrics["most_knockouts"] = dict(Counter(most_knockouts).most_common(5))
-        self.metrics["most_last_wins"] = dict(Counter(most_last_wins).most_common(5))
+        self.metrics["overall_points"] = {
+            row["participant__name"]: row["points"]
+            for row in top_point_earners(filters)[1:]
+        }
         self.metrics["biggest_burger"] = burger_display
-
-        unique_counts = Counter(
-            {p: len(achievements) for p, achievements in unique.items()}
-        )
-        self.metrics["unique"] = dict(unique_counts.most_common(5))
+        self.metrics["unique"] = {
+            row["participant__name"]: row["unique"]
+            for row in top_unique_earners(filters)
+        }
 
     def build_metrics(self, period):
         try:
             start, end = get_bounds(period)
 
-            winners_filters = (
-                Q(deleted=False) & ~Q(name="END IN DRAW") & Q(store_id=self.store_id)
-            )
             achievement_filters = Q(deleted=False) & Q(store_id=self.store_id)
             if start is not None:
-                winners_filters &= Q(pods__rounds__created_at__gte=start) & Q(
-                    pods__rounds__created_at__lt=end
-                )
                 achievement_filters &= Q(round__created_at__gte=start) & Q(
                     round__created_at__lt=end
                 )
 
-            winners = list(
-                WinningCommanders.objects.filter(winners_filters)
-                .select_related("color", "participants", "pods")
-                .values("name", "color__symbol", "participants__name")
+            # Every period starts on the first of a month, so whole monthly
+            # buckets cover it exactly
+            counters = get_metrics_counters(
+                self.store_id, start.date() if start is not None else None
             )
-
-            achievements = list(
-                ParticipantAchievements.objects.filter(achievement_filters)
-                .select_related(
-                    "achievement",
-                    "achievement__parent",
-                    "scalable_term",
-                    "participant",
-                    "round",
-                )
-                .values(
-                    "earned_points",
-                    "round_id",
-                    "scalable_term_id",
-                    "achievement__id",
-                    "achievement__name",
-                    "achievement__slug",
-                    "achievement__point_value",
-                    "achievement__parent__name",
-                    "scalable_term__term_display",
-                    "participant__name",
-                    "round__round_number",
-                    "round__starts_at",
-                )
+            names = participant_names(
+                counters[PARTICIPANT_WINS],
+                counters[SNACK_POINTS],
+                counters[DRAWS],
+                counters[KNOCKOUTS],
+                counters[LAST_WINS],
             )
-
-            if not winners and not achievements:
+            participant_wins = by_participant_name(counters[PARTICIPANT_WINS], names)
+
+            if (
+                not participant_wins
+                and not ParticipantAchievements.objects.filter(
+                    achievement_filters
+                ).exists()
+            ):
                 return None
 
+            earned_totals = achievement_earned_totals(achievement_filters)
+
         except Exception as e:
             print(f"Error fetching data to build metrics: {e}")
 
-        self.build_color_pie(winners)
-        self.build_big_winner(winners)
-        self.build_most_earned(achievements)
-        self.top_five_commanders(winners)
+        self.build_color_pie(counters[COLOR_PIE])
+        self.build_big_winner(participant_wins)
+        self.build_most_earned(earned_totals)
+        self.top_five_commanders(counters[COMMANDER_WINS], participant_wins)
         self.build_big_earner(filters=achievement_filters)
         self.days_since_last_draw()
-        self.build_achievement_chart(achievements)
-        self.build_top_fives(achievements)
+        self.build_achievement_chart(earned_totals)
+        self.build_top_fives(achievement_filters)
+        self.build_counter_top_fives(counters, names)
 
         return self.metrics
 
@@ -344,174 +318,66 @@ class IndividualMetricsCalculator:
     def __init__(self, participant_id, store_id):
         self.participant_id = participant_id
         self.store_id = store_id
-        self.participant_achievements = []
-        self.participant_pods = []
-        self.participant_obj = None
+        self.participant_row = None
         self.sessions = []
 
-    def fetch_participant_achievements(self):
-        """Get all of the participant achievements for a given participant."""
-        try:
-            self.participant_achievements = list(
-                ParticipantAchievements.objects.filter(
-                    participant_id=self.participant_id,
-                    store_id=self.store_id,
-                    deleted=False,
-                )
-                .select_related("achievement", "scalable_term")
-                .select_related("round")
-                .select_related("session")
-                .values(
-                    "achievement_id",
-                    "scalable_term_id",
-                    "session_id",
-                    "round_id",
-                    "session__month_year",
-                    "earned_points",
-                    "achievement__slug",
-                )
-            )
-        except BaseException as e:
-            print(
-                f"Exception raised in individual metrics calculator fetch achievements: {e}"
-            )
-
-    def fetch_participant_attendance(self):
-        """Get all of the records from pods that a participant has appeared in.
-
-        This will act as our 'attendance' record."""
-        try:
-            self.participant_pods = PodsParticipants.objects.filter(
-                participants_id=self.participant_id,
-                pods__store_id=self.store_id,
-                pods__deleted=False,
-            ).select_related("pods")
-        except BaseException as e:
-            print(f"Exception raised in individual metrics calculator attendance: {e}")
+    def fetch_participant_row(self):
+        """Get the participant with their lifetime aggregates in a single query."""
+        self.participant_row = individual_metrics_row(
+            self.participant_id, self.store_id
+        )
 
-    def fetch_participant_obj(self):
-        """Get the participant object."""
+    def fetch_sessions(self):
+        """Get the store's sessions, numbered within their month, with the
+        participant's points for each."""
         try:
-            self.participant_obj = Participants.objects.get(id=self.participant_id)
-        except BaseException as e:
-            print(
-                f"Exception raised in individual metrics calculator fetch participant: {e}"
+            self.sessions = individual_session_points(
+                self.participant_id, self.store_id
             )
-
-    def fetch_sessions(self):
-        """Fetch all existing sessions."""
-        self.sessions = Sessions.objects.filter(
-            deleted=False, store_id=self.store_id
-        ).values("id", "month_year")
-
-    def make_sessions_dict_by_month_year(self):
-        """Make a dict of sessions by month_year."""
-        out = defaultdict(list)
-        for s in self.sessions:
-            out[s["month_year"]].append(s)
-        return out
-
-    def calculate_win_number(self):
-        """Calculate the number of wins a participant has."""
-        wins = [
-            a
-            for a in self.participant_achievements
-            if a.get("achievement__slug") is not None
-            and "-colors" in a.get("achievement__slug")
-        ]
-        return len(wins)
+        except BaseException as e:
+            print(f"Exception raised in individual metrics calculator sessions: {e}")
 
     def calculate_average_win_points(self, win_count):
-        """Calculate players win %. Achievements with a 'win' slug / participant_pods."""
+        """Average points earned across the rounds a participant won."""
         if win_count == 0:
             return 0
-        round_list = [
-            w["round_id"]
-            for w in self.participant_achievements
-            if w["achievement__slug"]
-            and (
-                "-colors" in w.get("achievement__slug")
-                or "precon" in w.get("achievement__slug")
-            )
-        ]
-        total = sum(
-            pa["earned_points"]
-            for pa in self.participant_achievements
-            if pa["round_id"] in round_list
-        )
-
+        total = self.participant_row["win_round_points"] or 0
         return round((total / win_count), 2)
 
-    def calculate_lifetime_points(self):
-        """Sum the number of points player has earned."""
-        return sum([a["earned_points"] for a in self.participant_achievements])
-
-    def calculate_unique_achievements(self):
-        """Calculate number of unique achievements earned."""
-        unique_keys = {
-            (v["achievement_id"], v.get("scalable_term_id") or 0)
-            for v in self.participant_achievements
-        }
-        return len(unique_keys)
-
     def calculate_session_points(self):
-        """Sum all of the points for each session, then format them in a way the
-        line chart would expect."""
+        """Format each session's points the way the line chart expects."""
         out = defaultdict(list)
-        tmp = defaultdict(int)
-        session_dicts = self.make_sessions_dict_by_month_year()
-        for pa in self.participant_achievements:
-            tmp[pa["session_id"], pa["session__month_year"]] += pa["earned_points"]
-        sorted_list = sorted(
-            [
-                {"session_id": id1, "month_year": id2, "points": v}
-                for (id1, id2), v in tmp.items()
-            ],
-            key=lambda d: d["session_id"],
-        )
-
-        session_index_map = {
-            mm_yy: {s["id"]: idx + 1 for idx, s in enumerate(session_dicts[mm_yy])}
-            for mm_yy in session_dicts
-        }
-
-        for so in sorted_list:
-            mm_yy = so["month_year"]
-            session_num = session_index_map[mm_yy].get(so["session_id"], None)
-            if session_num is not None:
-                out[mm_yy].append({"session": session_num, "points": so["points"]})
+        for session in self.sessions:
+            if session["points"] is None:
+                continue
+            out[session["month_year"]].append(
+                {"session": session["session_number"], "points": session["points"]}
+            )
         return out
 
     def build(self):
-        self.fetch_participant_achievements()
-        self.fetch_participant_attendance()
-        self.fetch_participant_obj()
+        self.fetch_participant_row()
         self.fetch_sessions()
 
-        win_count = WinningCommanders.objects.filter(
-            participants_id=self.participant_id, store_id=self.store_id, deleted=False
-        ).count()
+        row = self.participant_row
+        win_count = row["win_number"] or 0
 
         return {
-            "participant_name": self.participant_obj.name,
+            "participant_name": row["name"],
             "avg_win_points": self.calculate_average_win_points(win_count),
             "win_number": win_count,
-            "attendance": len(self.participant_pods),
-            "lifetime_points": self.calculate_lifetime_points(),
-            "participant_since": self.participant_obj.created_at.strftime("%m/%d/%Y"),
-            "unique_achievements": self.calculate_unique_achievements(),
+            "attendance": row["attendance"] or 0,
+            "lifetime_points": row["lifetime_points"] or 0,
+            "participant_since": row["created_at"].strftime("%m/%d/%Y"),
+            "unique_achievements": row["unique_achievements"] or 0,
             "session_points": self.calculate_session_points(),
         }
 
 
-def calculate_badges(pid, store_id):
-    earned_exists = ParticipantAchievements.objects.filter(
-        deleted=False,
-        participant_id=pid,
-        store_id=store_id,
-        achievement_id=OuterRef("pk"),
-    )
-
+def build_badge_catalog():
+    """Every badge-eligible achievement grouped by its (parent's) type. The catalog
+    is the same for every participant and store, so it is built without the
+    earned flag."""
     has_children = Achievements.objects.filter(
         deleted=False,
         parent_id=OuterRef("pk"),
@@ -543,14 +409,12 @@ def calculate_badges(pid, store_id):
                     "name"
                 ).__class__(),  # CharField
             ),
-            earned=Exists(earned_exists),
         )
         .values(
             "id",
             "display_name",
             "group_type_id",
             "group_type_name",
-            "earned",
         )
         .order_by("display_name")
     )
@@ -563,12 +427,57 @@ def calculate_badges(pid, store_id):
         out = grouped[tkey]
         out["type_id"] = tkey
         out["type_name"] = row["group_type_name"]
-        out["achievements"].append(
-            {
-                "id": row["id"],
-                "name": row["display_name"],
-                "earned": bool(row["earned"]),
-            }
-        )
+        out["achievements"].append({"id": row["id"], "name": row["display_name"]})
 
     return list(grouped.values())
+
+
+def get_badge_catalog():
+    """The badge catalog, cached until the achievement catalog version changes."""
+    key = badge_catalog_key(get_badge_catalog_version())
+    catalog = cache.get(key)
+    if catalog is None:
+        catalog = build_badge_catalog()
+        cache.set(key, catalog, timeout=METRICS_CACHE_TTL)
+    return catalog
+
+
+def merge_badges(catalog, earned_ids):
+    """Mark each catalog achievement as earned or not for one participant."""
+    return [
+        {
+            "type_id": group["type_id"],
+            "type_name": group["type_name"],
+            "achievements": [
+                {**achievement, "earned": achievement["id"] in earned_ids}
+                for achievement in group["achievements"]
+            ],
+        }
+        for group in catalog
+    ]
+
+
+def calculate_badges(pid, store_id):
+    earned_ids = set(
+        ParticipantAchievements.objects.filter(
+            deleted=False, participant_id=pid, store_id=store_id
+        ).values_list("achievement_id", flat=True)
+    )
+    return merge_badges(get_badge_catalog(), earned_ids)
+
+
+def calculate_badges_bulk(pids, store_id):
+    """Badges for many participants at once: {participant_id: badges}."""
+    earned = defaultdict(set)
+    rows = (
+        ParticipantAchievements.objects.filter(
+            deleted=False, participant_id__in=pids, store_id=store_id
+        )
+        .values_list("participant_id", "achievement_id")
+        .distinct()
+    )
+    for participant_id, achievement_id in rows:
+        earned[participant_id].add(achievement_id)
+
+    catalog = get_badge_catalog()
+    return {pid: merge_badges(catalog, earned[pid]) for pid in pids}
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from metrics.snapshot_helpers import rebuild_metrics_snapshots
+from stores.models import Store
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized metrics snapshots for one or all stores"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--store-slug",
+            required=False,
+            help="Rebuild snapshots for a single store",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild snapshots for all stores",
+        )
+
+    def handle(self, *args, **opts):
+        store_slug = opts.get("store_slug")
+        rebuild_all = opts.get("all", False)
+
+        if not store_slug and not rebuild_all:
+            raise CommandError("Specify --store-slug or --all")
+
+        if store_slug:
+            try:
+                stores = [Store.objects.get(slug=store_slug, deleted=False)]
+            except Store.DoesNotExist:
+                raise CommandError(f"Store not found: {store_slug}")
+        else:
+            stores = list(Store.objects.filter(deleted=False))
+
+        built_count = 0
+        for store in stores:
+            built_count += rebuild_metrics_snapshots(store.id)
+            self.stdout.write(f"  Rebuilt metrics snapshots for {store.slug}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\nRebuilt {built_count} snapshot(s) across {len(stores)} store(s)\n"
+            )
+        )
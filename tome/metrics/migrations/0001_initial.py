@@ -0,0 +1,48 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("stores", "0004_seed_discord_channel_ids"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricsSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("period", models.CharField(max_length=8)),
+                ("payload", models.TextField()),
+                ("built_at", models.DateTimeField()),
+                (
+                    "store",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="stores.store"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "metrics_snapshots",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="metricssnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("store", "period"), name="uniq_metrics_snapshot_store_period"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stores", "0004_seed_discord_channel_ids"),
+        ("metrics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricsMonthlyCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("metric", models.CharField(max_length=32)),
+                ("key", models.CharField(max_length=255)),
+                ("value", models.IntegerField(default=0)),
+                (
+                    "store",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="stores.store"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "metrics_monthly_counters",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="metricsmonthlycounter",
+            constraint=models.UniqueConstraint(
+                fields=("store", "month", "metric", "key"),
+                name="uniq_metrics_monthly_counter",
+            ),
+        ),
+    ]
@@ -0,0 +1,86 @@
+from collections import Counter
+
+from django.db import migrations
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncMonth
+
+COUNTED_SLUGS = {
+    "end-draw": "draws",
+    "knock-out": "knockouts",
+    "last-in-order": "last_wins",
+}
+SNACK_SLUGS = ("best-snack", "bring-snack")
+
+
+def _key(value):
+    return "" if value is None else str(value)
+
+
+def backfill_monthly_counters(apps, schema_editor):
+    MetricsMonthlyCounter = apps.get_model("metrics", "MetricsMonthlyCounter")
+    ParticipantAchievements = apps.get_model("users", "ParticipantAchievements")
+    WinningCommanders = apps.get_model("achievements", "WinningCommanders")
+
+    totals = Counter()
+
+    achievement_totals = (
+        ParticipantAchievements.objects.filter(
+            deleted=False,
+            store_id__isnull=False,
+            achievement__slug__in=[*COUNTED_SLUGS, *SNACK_SLUGS],
+        )
+        .annotate(month=TruncMonth("round__created_at", output_field=DateField()))
+        .values("store_id", "month", "participant_id", "achievement__slug")
+        .annotate(earned=Count("id"), points=Sum("earned_points"))
+    )
+    for row in achievement_totals:
+        metric = COUNTED_SLUGS.get(row["achievement__slug"], "snack_points")
+        value = row["points"] if metric == "snack_points" else row["earned"]
+        bucket = (row["store_id"], row["month"])
+        totals[(*bucket, metric, _key(row["participant_id"]))] += value
+
+    winner_totals = (
+        WinningCommanders.objects.filter(deleted=False, store_id__isnull=False)
+        .exclude(name="END IN DRAW")
+        .annotate(
+            month=TruncMonth("pods__rounds__created_at", output_field=DateField())
+        )
+        .values("store_id", "month", "participants_id", "name", "color_id")
+        .annotate(wins=Count("id"))
+    )
+    for row in winner_totals:
+        bucket = (row["store_id"], row["month"])
+        totals[(*bucket, "participant_wins", _key(row["participants_id"]))] += row[
+            "wins"
+        ]
+        totals[(*bucket, "commander_wins", _key(row["name"]))] += row["wins"]
+        totals[(*bucket, "color_pie", _key(row["color_id"]))] += row["wins"]
+
+    MetricsMonthlyCounter.objects.bulk_create(
+        [
+            MetricsMonthlyCounter(
+                store_id=store_id, month=month, metric=metric, key=key, value=value
+            )
+            for (store_id, month, metric, key), value in totals.items()
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def reverse_backfill(apps, schema_editor):
+    MetricsMonthlyCounter = apps.get_model("metrics", "MetricsMonthlyCounter")
+    MetricsMonthlyCounter.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("metrics", "0002_metricsmonthlycounter"),
+        ("achievements", "0035_achievement_rarity"),
+        ("users", "0019_participants_is_patreon"),
+        ("sessions_rounds", "0008_pods_store_roundsignups_store_sessions_store"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_monthly_counters, reverse_backfill),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stores", "0004_seed_discord_channel_ids"),
+        ("users", "0019_participants_is_patreon"),
+        ("metrics", "0003_backfill_metrics_monthly_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ParticipantMonthlyPoints",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month_year", models.CharField(max_length=5)),
+                ("total_points", models.IntegerField(default=0)),
+                ("earned_count", models.IntegerField(default=0)),
+                (
+                    "participant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="users.participants",
+                    ),
+                ),
+                (
+                    "store",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="stores.store"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "participant_monthly_points",
+                "indexes": [
+                    models.Index(
+                        fields=["store", "month_year", "-total_points"],
+                        name="pmp_store_month_points_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="participantmonthlypoints",
+            constraint=models.UniqueConstraint(
+                fields=("store", "month_year", "participant"),
+                name="uniq_participant_monthly_points",
+            ),
+        ),
+    ]
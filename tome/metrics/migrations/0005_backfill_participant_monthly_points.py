@@ -0,0 +1,45 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill_monthly_points(apps, schema_editor):
+    ParticipantMonthlyPoints = apps.get_model("metrics", "ParticipantMonthlyPoints")
+    ParticipantAchievements = apps.get_model("users", "ParticipantAchievements")
+
+    totals = (
+        ParticipantAchievements.objects.filter(
+            deleted=False, session__deleted=False, store_id__isnull=False
+        )
+        .values("store_id", "session__month_year", "participant_id")
+        .annotate(total_points=Sum("earned_points"), earned_count=Count("id"))
+    )
+
+    ParticipantMonthlyPoints.objects.bulk_create(
+        [
+            ParticipantMonthlyPoints(
+                store_id=row["store_id"],
+                month_year=row["session__month_year"],
+                participant_id=row["participant_id"],
+                total_points=row["total_points"],
+                earned_count=row["earned_count"],
+            )
+            for row in totals
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def reverse_backfill(apps, schema_editor):
+    ParticipantMonthlyPoints = apps.get_model("metrics", "ParticipantMonthlyPoints")
+    ParticipantMonthlyPoints.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("metrics", "0004_participantmonthlypoints"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_monthly_points, reverse_backfill),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("metrics", "0005_backfill_participant_monthly_points"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="metricssnapshot",
+            name="stale",
+            field=models.BooleanField(default=False),
+        ),
+    ]
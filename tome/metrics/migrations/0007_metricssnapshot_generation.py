@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("metrics", "0006_metricssnapshot_stale"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="metricssnapshot",
+            name="generation",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
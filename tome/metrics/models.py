@@ -1,3 +1,74 @@
 from django.db import models
 
-# Create your models here.
+
+class MetricsSnapshot(models.Model):
+    """The finished `MetricsCalculator.build_metrics` payload for a store + period.
+
+    The payload is kept as serialized text rather than jsonb so the ordering of
+    the top five dicts survives the round trip."""
+
+    store = models.ForeignKey("stores.Store", on_delete=models.CASCADE)
+    period = models.CharField(max_length=8)
+    payload = models.TextField()
+    built_at = models.DateTimeField()
+    # Set by writes to the store's data, the next read of the period rebuilds it
+    stale = models.BooleanField(default=False)
+    # Bumped with every stale flag; a rebuild only clears `stale` if nothing
+    # bumped it while the rebuild was running
+    generation = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "metrics_snapshots"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["store", "period"], name="uniq_metrics_snapshot_store_period"
+            )
+        ]
+
+
+class MetricsMonthlyCounter(models.Model):
+    """A single running total behind the league metrics, bucketed by store and
+    the month of the round it came from. `key` is whatever the metric is counted
+    by (participant id, commander name, color id)."""
+
+    store = models.ForeignKey("stores.Store", on_delete=models.CASCADE)
+    month = models.DateField()
+    metric = models.CharField(max_length=32)
+    key = models.CharField(max_length=255)
+    value = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "metrics_monthly_counters"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["store", "month", "metric", "key"],
+                name="uniq_metrics_monthly_counter",
+            )
+        ]
+
+
+class ParticipantMonthlyPoints(models.Model):
+    """Leaderboard read model: a participant's point total for one store's
+    "MM-YY" month. `earned_count` tracks how many live achievements make up the
+    total so participants whose achievements were all removed drop off."""
+
+    store = models.ForeignKey("stores.Store", on_delete=models.CASCADE)
+    month_year = models.CharField(max_length=5)
+    participant = models.ForeignKey("users.Participants", on_delete=models.CASCADE)
+    total_points = models.IntegerField(default=0)
+    earned_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "participant_monthly_points"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["store", "month_year", "participant"],
+                name="uniq_participant_monthly_points",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["store", "month_year", "-total_points"],
+                name="pmp_store_month_points_idx",
+            )
+        ]
@@ -0,0 +1,197 @@
+from django.db.models import (
+    CharField,
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    Window,
+)
+from django.db.models.functions import Coalesce, Concat, RowNumber
+
+from achievements.models import WinningCommanders
+from sessions_rounds.models import PodsParticipants, Sessions
+from users.models import ParticipantAchievements, Participants
+
+TOP_N = 5
+
+# Best snack is a side prize and doesn't count toward a round's biggest burger
+BURGER_FILTER = Q(achievement__slug__isnull=True) | ~Q(achievement__slug="best-snack")
+
+
+def achievement_earned_totals(filters: Q) -> list[dict]:
+    """How many times each (achievement, scalable term) was earned, for
+    achievements without a slug. One row per earned pair, most earned first."""
+    return list(
+        ParticipantAchievements.objects.filter(filters, achievement__slug__isnull=True)
+        .values(
+            "achievement__id",
+            "scalable_term_id",
+            "achievement__name",
+            "achievement__point_value",
+            "achievement__parent__name",
+            "scalable_term__term_display",
+        )
+        .annotate(count=Count("id"))
+        .order_by("-count", "achievement__id", "scalable_term_id")
+    )
+
+
+def top_point_earners(filters: Q, limit: int = TOP_N) -> list[dict]:
+    """Participant names with the most earned points."""
+    return list(
+        ParticipantAchievements.objects.filter(filters)
+        .values("participant__name")
+        .annotate(points=Sum("earned_points"))
+        .order_by("-points", "participant__name")[:limit]
+    )
+
+
+# Achievements that mark the round as one the participant won
+WIN_SLUG_FILTER = Q(achievement__slug__contains="-colors") | Q(
+    achievement__slug__contains="precon"
+)
+
+
+def _achievement_pair():
+    """(achievement, scalable term or 0) as one value, for counting distinct pairs."""
+    return Concat(
+        "achievement_id",
+        Value("-"),
+        Coalesce("scalable_term_id", Value(0)),
+        output_field=CharField(),
+    )
+
+
+def _aggregate_subquery(queryset, group_field: str, aggregate):
+    """Scalar subquery of a single aggregate over `queryset`, NULL when it is empty."""
+    return Subquery(
+        queryset.order_by()
+        .values(group_field)
+        .annotate(total=aggregate)
+        .values("total")[:1],
+        output_field=IntegerField(),
+    )
+
+
+def individual_metrics_row(participant_id: int, store_id: int):
+    """Participant name/created_at with every lifetime aggregate the individual
+    metrics page needs, as subqueries of one SELECT."""
+    earned = ParticipantAchievements.objects.filter(
+        participant_id=OuterRef("id"), store_id=store_id, deleted=False
+    )
+    win_rounds = ParticipantAchievements.objects.filter(
+        WIN_SLUG_FILTER,
+        participant_id=OuterRef(OuterRef("id")),
+        store_id=store_id,
+        deleted=False,
+    ).values("round_id")
+
+    return (
+        Participants.objects.filter(id=participant_id)
+        .annotate(
+            lifetime_points=_aggregate_subquery(
+                earned, "participant_id", Sum("earned_points")
+            ),
+            unique_achievements=_aggregate_subquery(
+                earned, "participant_id", Count(_achievement_pair(), distinct=True)
+            ),
+            win_round_points=_aggregate_subquery(
+                earned.filter(round_id__in=win_rounds),
+                "participant_id",
+                Sum("earned_points"),
+            ),
+            win_number=_aggregate_subquery(
+                WinningCommanders.objects.filter(
+                    participants_id=OuterRef("id"), store_id=store_id, deleted=False
+                ),
+                "participants_id",
+                Count("id"),
+            ),
+            attendance=_aggregate_subquery(
+                PodsParticipants.objects.filter(
+                    participants_id=OuterRef("id"),
+                    pods__store_id=store_id,
+                    pods__deleted=False,
+                ),
+                "participants_id",
+                Count("id"),
+            ),
+        )
+        .values(
+            "name",
+            "created_at",
+            "lifetime_points",
+            "unique_achievements",
+            "win_round_points",
+            "win_number",
+            "attendance",
+        )
+        .first()
+    )
+
+
+def individual_session_points(participant_id: int, store_id: int) -> list[dict]:
+    """Every live session for the store with its 1-based position inside its month
+    and the participant's points in it (None if they earned nothing there)."""
+    points = _aggregate_subquery(
+        ParticipantAchievements.objects.filter(
+            session_id=OuterRef("id"),
+            participant_id=participant_id,
+            store_id=store_id,
+            deleted=False,
+        ),
+        "session_id",
+        Sum("earned_points"),
+    )
+    return list(
+        Sessions.objects.filter(deleted=False, store_id=store_id)
+        .annotate(
+            session_number=Window(
+                expression=RowNumber(),
+                partition_by=[F("month_year")],
+                order_by=[F("id").asc()],
+            ),
+            points=points,
+        )
+        .values("id", "month_year", "session_number", "points")
+        .order_by("id")
+    )
+
+
+def top_unique_earners(filters: Q, limit: int = TOP_N) -> list[dict]:
+    """Participant names with the most distinct (achievement, scalable term) pairs."""
+    pair = _achievement_pair()
+    return list(
+        ParticipantAchievements.objects.filter(filters)
+        .values("participant__name")
+        .annotate(unique=Count(pair, distinct=True))
+        .order_by("-unique", "participant__name")[:limit]
+    )
+
+
+def biggest_burger_rounds(filters: Q, limit: int = TOP_N) -> list[dict]:
+    """The single highest scoring participant of each round, top `limit` rounds."""
+    return list(
+        ParticipantAchievements.objects.filter(filters)
+        .filter(BURGER_FILTER)
+        .values(
+            "round_id",
+            "participant__name",
+            "round__round_number",
+            "round__starts_at",
+        )
+        .annotate(points=Sum("earned_points"))
+        .annotate(
+            rank=Window(
+                expression=RowNumber(),
+                partition_by=[F("round_id")],
+                order_by=[F("points").desc(), F("participant__name").asc()],
+            )
+        )
+        .filter(rank=1)
+        .order_by("-points", "round_id")[:limit]
+    )
@@ -0,0 +1,87 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils.timezone import now, localdate
+
+from .cache_helpers import bump_metrics_data_version
+from .helpers import MetricsCalculator
+from .models import MetricsSnapshot
+
+ALL_TIME = "all"
+SNAPSHOT_PERIODS = (ALL_TIME, "mtd", "3m", "6m", "ytd")
+
+
+def normalize_period(period):
+    """Map a `period` query param onto a snapshot period. Anything
+    `get_bounds` doesn't recognize is treated as all time, same as the calculator."""
+    return period if period in SNAPSHOT_PERIODS else ALL_TIME
+
+
+def build_metrics_snapshot(store_id: int, period: str) -> MetricsSnapshot:
+    """Run the full calculator for a store + period and persist the result.
+
+    The snapshot's generation is read before the calculator runs and the new
+    payload only clears `stale` if it is unchanged, so a write that commits
+    mid-rebuild leaves the snapshot flagged instead of being overwritten."""
+    period = normalize_period(period)
+    snapshot, _ = MetricsSnapshot.objects.get_or_create(
+        store_id=store_id,
+        period=period,
+        defaults={"payload": "null", "built_at": now(), "stale": True},
+    )
+    generation = snapshot.generation
+
+    calculator = MetricsCalculator(store_id=store_id)
+    metrics = calculator.build_metrics(None if period == ALL_TIME else period)
+
+    snapshot.payload = json.dumps(metrics, cls=DjangoJSONEncoder)
+    snapshot.built_at = now()
+    updated = MetricsSnapshot.objects.filter(
+        pk=snapshot.pk, generation=generation
+    ).update(payload=snapshot.payload, built_at=snapshot.built_at, stale=False)
+    snapshot.stale = not updated
+    return snapshot
+
+
+def rebuild_metrics_snapshots(store_id: int) -> int:
+    """Rebuild every period for a store, returns how many were written."""
+    for period in SNAPSHOT_PERIODS:
+        build_metrics_snapshot(store_id, period)
+    bump_metrics_data_version(store_id)
+    return len(SNAPSHOT_PERIODS)
+
+
+def get_metrics_snapshot(store_id: int, period: str = None):
+    """Return the metrics payload for a store + period from its snapshot.
+
+    Snapshots flagged by a write are rebuilt here, on the next read. Period
+    bounds and `last_draw` are relative to today, so a snapshot built on an
+    earlier day is rebuilt before it is served too."""
+    period = normalize_period(period)
+    snapshot = MetricsSnapshot.objects.filter(store_id=store_id, period=period).first()
+
+    if (
+        snapshot is None
+        or snapshot.stale
+        or localdate(snapshot.built_at) != localdate()
+    ):
+        snapshot = build_metrics_snapshot(store_id, period)
+
+    return json.loads(snapshot.payload)
+
+
+def mark_metrics_snapshots_stale(store_id: int) -> None:
+    """Flag a store's snapshots so the next read of each period rebuilds it,
+    and drop the store's cached metrics responses.
+
+    Runs inside the write's transaction, so the flag rolls back with it, and
+    bumps each snapshot's generation so a rebuild already in flight can't
+    clear it. The data version is only bumped once the write commits, so a
+    read in between can't cache a response built from the old rows under the
+    new version."""
+    MetricsSnapshot.objects.filter(store_id=store_id).update(
+        stale=True, generation=F("generation") + 1
+    )
+    transaction.on_commit(lambda: bump_metrics_data_version(store_id))
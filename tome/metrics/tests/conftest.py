@@ -3,6 +3,7 @@ import pytest
 from achievements.models import WinningCommanders, Achievements
 from users.models import ParticipantAchievements
 from sessions_rounds.models import Pods
+from metrics.counter_helpers import rebuild_metrics_counters
 from utils.test_helpers import get_ids
 
 ids = get_ids()
@@ -103,3 +104,5 @@ def build_state() -> None:
             ),
         ]
     )
+    # Rows above skip the write paths that keep the monthly counters current
+    rebuild_metrics_counters(ids.MIMICS_ID)
@@ -0,0 +1,101 @@
+from django.urls import reverse
+from rest_framework import status
+
+from achievements.models import Achievements
+from metrics.helpers import calculate_badges
+from utils.test_helpers import get_ids
+
+ids = get_ids()
+
+
+def _earned_ids(badges):
+    return {a["id"] for group in badges for a in group["achievements"] if a["earned"]}
+
+
+def test_get_earned_badges(client) -> None:
+    """
+    should: flag the achievements a participant has earned.
+    """
+
+    res = client.get(reverse("badges"), {"participant_id": ids.P2})
+
+    assert res.status_code == status.HTTP_200_OK
+    assert _earned_ids(res.json()) == {ids.KNOCK_OUT}
+
+
+def test_get_earned_badges_bulk(client) -> None:
+    """
+    should: return the same badges as the single endpoint for each participant.
+    """
+
+    res = client.get(reverse("badges_bulk"), {"participant_ids": f"{ids.P1},{ids.P3}"})
+    parsed = res.json()
+
+    assert res.status_code == status.HTTP_200_OK
+    assert set(parsed) == {str(ids.P1), str(ids.P3)}
+    assert parsed[str(ids.P3)] == calculate_badges(ids.P3, ids.MIMICS_ID)
+    assert _earned_ids(parsed[str(ids.P3)]) == {ids.KILL_TABLE}
+
+
+def test_get_earned_badges_bulk_requires_ids(client) -> None:
+    """
+    should: reject a missing or malformed participant_ids list.
+    """
+
+    assert client.get(reverse("badges_bulk")).status_code == 400
+    assert (
+        client.get(reverse("badges_bulk"), {"participant_ids": "1,abc"}).status_code
+        == 400
+    )
+
+
+def test_badge_catalog_is_cached(django_assert_num_queries) -> None:
+    """
+    should: only query the earned ids once the catalog is cached.
+    """
+
+    calculate_badges(ids.P1, ids.MIMICS_ID)
+
+    with django_assert_num_queries(1):
+        calculate_badges(ids.P1, ids.MIMICS_ID)
+
+
+def test_achievement_upsert_refreshes_catalog(client) -> None:
+    """
+    should: include a newly created achievement after the catalog version bumps.
+    """
+
+    calculate_badges(ids.P1, ids.MIMICS_ID)
+    client.post(
+        reverse("upsert_achievements"),
+        {
+            "name": "Fresh badge",
+            "point_value": 1,
+            "restrictions": [],
+            "achievements": [],
+        },
+        format="json",
+    )
+
+    names = {
+        a["name"]
+        for group in calculate_badges(ids.P1, ids.MIMICS_ID)
+        for a in group["achievements"]
+    }
+    assert "Fresh badge" in names
+
+
+def test_achievement_change_refreshes_catalog() -> None:
+    """
+    should: drop the cached catalog when an achievement is saved outside the upsert view.
+    """
+
+    calculate_badges(ids.P1, ids.MIMICS_ID)
+    Achievements.objects.create(name="Admin badge", point_value=1)
+
+    names = {
+        a["name"]
+        for group in calculate_badges(ids.P1, ids.MIMICS_ID)
+        for a in group["achievements"]
+    }
+    assert "Admin badge" in names
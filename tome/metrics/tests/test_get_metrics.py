@@ -22,6 +22,27 @@ def test_get_metrics_league_wide() -> None:
     assert metrics["top_winners"] == {"Trenna Thain": 1}
 
 
+def test_get_metrics_top_fives() -> None:
+    """
+    should: rank points, unique achievements and the biggest burger rounds
+    """
+    calc = MetricsCalculator(store_id=ids.MIMICS_ID)
+    metrics = calc.build_metrics(period=None)
+
+    assert metrics["overall_points"] == {"Fern Penvarden": 5, "Trenna Thain": 5}
+    assert metrics["unique"] == {
+        "Charlie Smith": 3,
+        "Fern Penvarden": 1,
+        "Trenna Thain": 1,
+    }
+    assert list(metrics["biggest_burger"].items()) == [
+        ("Charlie Smith, Round 1 on Nov 03, 2024", 6),
+        ("Charlie Smith, Round 1 on Nov 10, 2024", 5),
+        ("Fern Penvarden, Round 2 on Nov 10, 2024", 5),
+    ]
+    assert metrics["most_knockouts"] == {"Trenna Thain": 1}
+
+
 def test_get_metrics_individual() -> None:
     """
     should: get data formatted for the frontends pie chart
@@ -0,0 +1,50 @@
+import time
+
+from metrics.helpers import IndividualMetricsCalculator
+from users.models import ParticipantAchievements
+from utils.test_helpers import get_ids
+
+ids = get_ids()
+
+EARNED_ROWS = 3000
+ROUNDS = [
+    (ids.R1_SESSION_LAST_MONTH, ids.SESSION_LAST_MONTH),
+    (ids.R2_SESSION_LAST_MONTH, ids.SESSION_LAST_MONTH),
+    (ids.R1_SESSION_THIS_MONTH_CLOSED, ids.SESSION_THIS_MONTH_CLOSED),
+    (ids.R2_SESSION_THIS_MONTH_CLOSED, ids.SESSION_THIS_MONTH_CLOSED),
+]
+
+
+def test_individual_metrics_scale(django_assert_num_queries) -> None:
+    """
+    should: build a participant with thousands of achievements in two queries.
+    """
+
+    ParticipantAchievements.objects.bulk_create(
+        [
+            ParticipantAchievements(
+                participant_id=ids.P4,
+                achievement_id=ids.KILL_TABLE,
+                round_id=ROUNDS[i % len(ROUNDS)][0],
+                session_id=ROUNDS[i % len(ROUNDS)][1],
+                earned_points=1,
+                store_id=ids.MIMICS_ID,
+            )
+            for i in range(EARNED_ROWS)
+        ]
+    )
+
+    calc = IndividualMetricsCalculator(ids.P4, store_id=ids.MIMICS_ID)
+    started = time.perf_counter()
+    with django_assert_num_queries(2):
+        metrics = calc.build()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert metrics["lifetime_points"] == EARNED_ROWS
+    assert metrics["unique_achievements"] == 1
+    assert metrics["session_points"] == {
+        "10-24": [{"session": 1, "points": EARNED_ROWS // 2}],
+        "11-24": [{"session": 1, "points": EARNED_ROWS // 2}],
+    }
+    # Generous ceiling, this is here to catch a regression back to per-row work
+    assert elapsed_ms < 1000, f"individual metrics took {elapsed_ms:.1f}ms"
@@ -0,0 +1,61 @@
+from django.urls import reverse
+from rest_framework import status
+
+from metrics.cache_helpers import (
+    collect_metrics_cache_stats,
+    get_metrics_data_version,
+)
+from metrics.models import MetricsSnapshot
+from utils.test_helpers import get_ids
+
+ids = get_ids()
+
+
+def test_metrics_cache_stats_count_response_reads(client, settings) -> None:
+    """
+    should: count the first read of a period as a miss and the next as a hit.
+    """
+
+    settings.METRICS_CACHE_STATS = True
+    url = reverse("metrics")
+    first = client.get(url, {"period": "mtd"})
+    second = client.get(url, {"period": "mtd"})
+
+    assert first.status_code == status.HTTP_200_OK
+    assert second.json() == first.json()
+    assert collect_metrics_cache_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_metrics_cache_stats_off_by_default(client) -> None:
+    """
+    should: not count anything unless METRICS_CACHE_STATS is on.
+    """
+
+    client.get(reverse("metrics"))
+    client.get(reverse("metrics"))
+
+    assert collect_metrics_cache_stats()["hits"] == 0
+
+
+def test_write_path_invalidates_cached_metrics(client) -> None:
+    """
+    should: flag the store's snapshots and bump its data version when an
+    earned achievement is written.
+    """
+
+    client.get(reverse("metrics"))
+    version = get_metrics_data_version(ids.MIMICS_ID)
+
+    res = client.post(
+        reverse("upsert_earned_achievements"),
+        {
+            "participant_id": ids.P3,
+            "achievement_id": ids.KNOCK_OUT,
+            "round_id": ids.R2_SESSION_THIS_MONTH_OPEN,
+        },
+        format="json",
+    )
+
+    assert res.status_code == status.HTTP_201_CREATED
+    assert MetricsSnapshot.objects.get(store_id=ids.MIMICS_ID, period="all").stale
+    assert get_metrics_data_version(ids.MIMICS_ID) > version
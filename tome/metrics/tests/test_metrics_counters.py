@@ -0,0 +1,120 @@
+from django.urls import reverse
+from rest_framework import status
+
+from metrics.counter_helpers import (
+    get_metrics_counters,
+    get_month_leaderboard,
+    rebuild_metrics_counters,
+    COLOR_PIE,
+    KNOCKOUTS,
+    PARTICIPANT_WINS,
+)
+from metrics.models import MetricsMonthlyCounter
+from users.models import ParticipantAchievements
+from utils.test_helpers import get_ids
+
+ids = get_ids()
+
+
+def test_rebuild_metrics_counters() -> None:
+    """
+    should: roll wins, colors and knockouts up into the store's monthly counters.
+    """
+
+    counters = get_metrics_counters(ids.MIMICS_ID)
+
+    assert counters[PARTICIPANT_WINS] == {str(ids.P1): 2, str(ids.P2): 1}
+    assert counters[COLOR_PIE] == {str(ids.GRUUL): 2, str(ids.ESPER): 1}
+    assert counters[KNOCKOUTS] == {str(ids.P2): 1}
+
+
+def test_earned_achievement_updates_counters(client) -> None:
+    """
+    should: add a new knockout to the counters and remove it again when deleted.
+    """
+
+    url = reverse("upsert_earned_achievements")
+    body = {
+        "participant_id": ids.P3,
+        "achievement_id": ids.KNOCK_OUT,
+        "round_id": ids.R2_SESSION_THIS_MONTH_OPEN,
+    }
+
+    res = client.post(url, body, format="json")
+
+    assert res.status_code == status.HTTP_201_CREATED
+    assert get_metrics_counters(ids.MIMICS_ID)[KNOCKOUTS] == {
+        str(ids.P2): 1,
+        str(ids.P3): 1,
+    }
+
+    earned = ParticipantAchievements.objects.get(
+        participant_id=ids.P3, achievement_id=ids.KNOCK_OUT, deleted=False
+    )
+    res = client.post(url, {"id": earned.id, "deleted": True}, format="json")
+
+    assert res.status_code == status.HTTP_201_CREATED
+    assert get_metrics_counters(ids.MIMICS_ID)[KNOCKOUTS] == {str(ids.P2): 1}
+
+
+def test_incremental_counters_match_rebuild(client) -> None:
+    """
+    should: leave the counters in the same state a full rebuild would.
+    """
+
+    client.post(
+        reverse("upsert_earned_achievements"),
+        {
+            "participant_id": ids.P1,
+            "achievement_id": ids.KNOCK_OUT,
+            "round_id": ids.R1_SESSION_THIS_MONTH_OPEN,
+        },
+        format="json",
+    )
+
+    def snapshot():
+        return set(
+            MetricsMonthlyCounter.objects.filter(
+                store_id=ids.MIMICS_ID, value__gt=0
+            ).values_list("month", "metric", "key", "value")
+        )
+
+    incremental = snapshot()
+    rebuild_metrics_counters(ids.MIMICS_ID)
+
+    assert snapshot() == incremental
+
+
+def test_leaderboard_follows_earned_achievements(client) -> None:
+    """
+    should: keep the month leaderboard in step with new and deleted achievements.
+    """
+
+    assert get_month_leaderboard(ids.MIMICS_ID, "11-24") == [
+        {"id": ids.P1, "name": "Charlie Smith", "total_points": 11},
+        {"id": ids.P2, "name": "Trenna Thain", "total_points": 5},
+        {"id": ids.P3, "name": "Fern Penvarden", "total_points": 5},
+    ]
+
+    url = reverse("upsert_earned_achievements")
+    client.post(
+        url,
+        {
+            "participant_id": ids.P4,
+            "achievement_id": ids.KNOCK_OUT,
+            "round_id": ids.R2_SESSION_THIS_MONTH_OPEN,
+        },
+        format="json",
+    )
+    leaderboard = get_month_leaderboard(ids.MIMICS_ID, "11-24")
+
+    assert ids.P4 in [row["id"] for row in leaderboard]
+    rebuild_metrics_counters(ids.MIMICS_ID)
+    assert get_month_leaderboard(ids.MIMICS_ID, "11-24") == leaderboard
+
+    earned = ParticipantAchievements.objects.get(participant_id=ids.P4, deleted=False)
+    client.post(url, {"id": earned.id, "deleted": True}, format="json")
+
+    assert ids.P4 not in [
+        row["id"] for row in get_month_leaderboard(ids.MIMICS_ID, "11-24")
+    ]
@@ -0,0 +1,131 @@
+import json
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework import status
+
+from metrics.helpers import MetricsCalculator
+from metrics.models import MetricsSnapshot
+from metrics.snapshot_helpers import (
+    SNAPSHOT_PERIODS,
+    get_metrics_snapshot,
+    mark_metrics_snapshots_stale,
+    rebuild_metrics_snapshots,
+)
+from utils.test_helpers import get_ids
+
+ids = get_ids()
+
+
+def test_snapshot_matches_calculator() -> None:
+    """
+    should: build a snapshot on first read that matches the live calculator output.
+    """
+
+    expected = MetricsCalculator(store_id=ids.MIMICS_ID).build_metrics(None)
+    metrics = get_metrics_snapshot(ids.MIMICS_ID, None)
+
+    assert metrics == expected
+    assert list(metrics["biggest_burger"]) == list(expected["biggest_burger"])
+    assert MetricsSnapshot.objects.filter(store_id=ids.MIMICS_ID, period="all").exists()
+
+
+def test_metrics_endpoint_reads_snapshot(client) -> None:
+    """
+    should: answer from the stored snapshot rather than recalculating.
+    """
+
+    rebuild_metrics_snapshots(ids.MIMICS_ID)
+    MetricsSnapshot.objects.filter(store_id=ids.MIMICS_ID, period="all").update(
+        payload=json.dumps({"color_pie": {"w": 1}})
+    )
+
+    res = client.get(reverse("metrics"))
+
+    assert res.status_code == status.HTTP_200_OK
+    assert res.json() == {"color_pie": {"w": 1}}
+
+
+def test_stale_snapshot_is_rebuilt(client) -> None:
+    """
+    should: rebuild a snapshot that was built on a previous day.
+    """
+
+    rebuild_metrics_snapshots(ids.MIMICS_ID)
+    MetricsSnapshot.objects.filter(store_id=ids.MIMICS_ID, period="all").update(
+        payload=json.dumps({"color_pie": {"w": 1}}),
+        built_at=now() - timedelta(days=2),
+    )
+
+    res = client.get(reverse("metrics"))
+
+    assert res.status_code == status.HTTP_200_OK
+    assert res.json()["color_pie"] == {"rg": 2, "wub": 1}
+
+
+def test_rebuild_command() -> None:
+    """
+    should: write a snapshot for every period of the requested store.
+    """
+
+    call_command("rebuild_metrics_snapshots", store_slug=ids.MIMICS)
+
+    periods = set(
+        MetricsSnapshot.objects.filter(store_id=ids.MIMICS_ID).values_list(
+            "period", flat=True
+        )
+    )
+    assert periods == set(SNAPSHOT_PERIODS)
+
+
+def test_write_marks_snapshots_stale(client) -> None:
+    """
+    should: flag the store's snapshots on a write and rebuild them on the next read.
+    """
+
+    rebuild_metrics_snapshots(ids.MIMICS_ID)
+    MetricsSnapshot.objects.filter(store_id=ids.MIMICS_ID, period="all").update(
+        payload=json.dumps({"color_pie": {"w": 1}})
+    )
+
+    with transaction.atomic():
+        mark_metrics_snapshots_stale(ids.MIMICS_ID)
+        mark_metrics_snapshots_stale(ids.MIMICS_ID)
+
+    assert set(
+        MetricsSnapshot.objects.filter(store_id=ids.MIMICS_ID).values_list(
+            "stale", flat=True
+        )
+    ) == {True}
+
+    res = client.get(reverse("metrics"))
+
+    assert res.json()["color_pie"] == {"rg": 2, "wub": 1}
+    assert not MetricsSnapshot.objects.get(store_id=ids.MIMICS_ID, period="all").stale
+    # Only the period that was read gets rebuilt
+    assert MetricsSnapshot.objects.get(store_id=ids.MIMICS_ID, period="mtd").stale
+
+
+def test_write_during_rebuild_keeps_snapshot_stale() -> None:
+    """
+    should: leave a snapshot flagged when a write lands while it is being rebuilt.
+    """
+
+    rebuild_metrics_snapshots(ids.MIMICS_ID)
+    mark_metrics_snapshots_stale(ids.MIMICS_ID)
+    build_metrics = MetricsCalculator.build_metrics
+
+    def build_with_write(calculator, period):
+        metrics = build_metrics(calculator, period)
+        mark_metrics_snapshots_stale(ids.MIMICS_ID)
+        return metrics
+
+    with patch.object(MetricsCalculator, "build_metrics", build_with_write):
+        get_metrics_snapshot(ids.MIMICS_ID, None)
+
+    assert MetricsSnapshot.objects.get(store_id=ids.MIMICS_ID, period="all").stale
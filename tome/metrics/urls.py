@@ -1,5 +1,11 @@
 from django.urls import path
-from .views import get_all_metrics, get_metrics_for_participant, get_earned_badges
+from .views import (
+    get_all_metrics,
+    get_metrics_for_participant,
+    get_earned_badges,
+    get_earned_badges_bulk,
+    get_metrics_cache_stats,
+)
 
 urlpatterns = [
     path(
@@ -8,5 +14,11 @@ urlpatterns = [
         name="participant_metrics",
     ),
     path("metrics/", get_all_metrics, name="metrics"),
+    path(
+        "metrics/cache-stats/",
+        get_metrics_cache_stats,
+        name="metrics_cache_stats",
+    ),
     path("badges/", get_earned_badges, name="badges"),
+    path("badges/bulk/", get_earned_badges_bulk, name="badges_bulk"),
 ]
@@ -1,9 +1,21 @@
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import (
+    api_view,
+    permission_classes,
+    authentication_classes,
+)
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from utils.decorators import require_store
-from .helpers import MetricsCalculator, IndividualMetricsCalculator, calculate_badges
+from utils.permissions import IsSuperUser
+from .cache_helpers import get_cached_metrics, collect_metrics_cache_stats
+from .helpers import (
+    IndividualMetricsCalculator,
+    calculate_badges,
+    calculate_badges_bulk,
+)
+from .snapshot_helpers import get_metrics_snapshot, normalize_period
 
 
 @api_view(["GET"])
@@ -11,9 +23,11 @@ from .helpers import MetricsCalculator, IndividualMetricsCalculator, calculate_b
 def get_all_metrics(request, **kwargs):
     """Get all of the metrics we want and gather them in a nice object."""
     try:
-        period = request.query_params.get("period")
-        calculator = MetricsCalculator(store_id=request.store_id)
-        metrics = calculator.build_metrics(period)
+        store_id = request.store_id
+        period = normalize_period(request.query_params.get("period"))
+        metrics = get_cached_metrics(
+            store_id, period, lambda: get_metrics_snapshot(store_id, period)
+        )
         return Response(metrics, status=status.HTTP_200_OK)
     except Exception as e:
         print(f"Error in get_all_metrics endpoint: {e}")
@@ -59,3 +73,35 @@ def get_earned_badges(request, **kwargs):
     out = calculate_badges(pid, request.store_id)
 
     return Response(out)
+
+
+@api_view(["GET"])
+@require_store
+def get_earned_badges_bulk(request, **kwargs):
+    """Badges for a comma separated list of participant_ids, keyed by participant."""
+
+    raw = request.query_params.get("participant_ids", "")
+    try:
+        pids = list(dict.fromkeys(int(p) for p in raw.split(",") if p.strip()))
+    except ValueError:
+        return Response(
+            {"detail": "participant_ids must be a comma separated list of ids"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if not pids:
+        return Response(
+            {"detail": "participant_ids is required"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    out = calculate_badges_bulk(pids, request.store_id)
+
+    return Response(out)
+
+
+@api_view(["GET"])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsSuperUser])
+def get_metrics_cache_stats(request, **kwargs):
+    """Hit/miss counts for the cached metrics responses, when METRICS_CACHE_STATS is on."""
+    return Response(collect_metrics_cache_stats(), status=status.HTTP_200_OK)
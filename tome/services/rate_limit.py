@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Token bucket in its GCRA form: the whole bucket is one "theoretical arrival
+# time" (tat). Each request reserves the next slot and sleeps until it opens,
+# so nobody holds a lock while sleeping.
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local pause = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or 0)
+if tat < now then tat = now end
+local wait = 0
+if pause > 0 then
+  local floor = now + pause + (burst - 1) * interval
+  if floor > tat then tat = floor end
+else
+  tat = tat + interval
+  wait = math.max(0, tat - burst * interval - now)
+end
+redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class WaitStats:
+    """Counts and a rolling window of the time callers spent waiting for a slot."""
+
+    def __init__(self, window: int = 500):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=window)
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self._recent.append(wait)
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = sorted(self._recent)
+            requests, throttled = self.requests, self.throttled
+            total_wait, max_wait = self.total_wait, self.max_wait
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "requests": requests,
+            "throttled": throttled,
+            "total_wait_ms": round(total_wait * 1000, 2),
+            "max_wait_ms": round(max_wait * 1000, 2),
+            "recent_p95_wait_ms": round(p95 * 1000, 2),
+        }
+
+
+class TokenBucket:
+    """In-process token bucket: `rate` requests per second with bursts of up
+    to `burst`. Only paces the threads of this process."""
+
+    def __init__(self, rate: float, burst: int, stats: WaitStats = None):
+        self.interval = 1.0 / rate
+        self.burst = burst
+        self.stats = stats or WaitStats()
+        self._tat = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, pause: float = 0.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            if pause > 0:
+                self._tat = max(tat, now + pause + (self.burst - 1) * self.interval)
+                return 0.0
+            self._tat = tat + self.interval
+            return max(0.0, self._tat - self.burst * self.interval - now)
+
+    def acquire(self) -> float:
+        """Block until a request may be sent, returns the seconds waited."""
+        wait = self._reserve()
+        self.stats.record(wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for `seconds`, e.g. from a Retry-After."""
+        self._reserve(seconds)
+
+
+class RedisTokenBucket(TokenBucket):
+    """Token bucket kept in Redis so every worker and process shares one limit.
+
+    Falls back to the in-process bucket while Redis is unreachable."""
+
+    def __init__(self, client, key: str, rate: float, burst: int, stats=None):
+        super().__init__(rate, burst, stats)
+        self.key = key
+        self._script = client.register_script(GCRA_SCRIPT)
+
+    def _reserve(self, pause: float = 0.0) -> float:
+        try:
+            return float(
+                self._script(keys=[self.key], args=[self.interval, self.burst, pause])
+            )
+        except Exception as e:
+            logger.warning("Redis rate limiter unavailable, limiting locally: %s", e)
+            return super()._reserve(pause)
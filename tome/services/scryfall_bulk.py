@@ -0,0 +1,100 @@
+import json
+from typing import IO, Any, Iterator
+
+from achievements.models import CommanderImage, Commanders
+from services.scryfall_client import ScryfallClientRequest, _normalize_for_scryfall
+
+READ_CHUNK = 1 << 16
+BATCH_SIZE = 500
+_SKIP = " \t\r\n,"
+
+
+def iter_json_array(f: IO[str], chunk_size: int = READ_CHUNK) -> Iterator[Any]:
+    """Yield the items of a top level JSON array one at a time, reading `f` in
+    chunks so a multi-hundred-MB bulk file never has to fit in memory."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof, started = "", 0, False, False
+
+    while True:
+        while pos < len(buf) and buf[pos] in _SKIP:
+            pos += 1
+        if pos == len(buf):
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            chunk = f.read(chunk_size)
+            buf, pos, eof = chunk, 0, not chunk
+            continue
+
+        if not started:
+            if buf[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+            continue
+        if buf[pos] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Item runs past the buffer, read more and try again
+            chunk = f.read(chunk_size)
+            buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+            continue
+        yield item
+        pos = end
+
+
+def card_images(card: dict) -> list[dict]:
+    images = ScryfallClientRequest.primary_image_url(card)
+    if not images:
+        return []
+    return images if isinstance(images, list) else [images]
+
+
+def _flush(batch: dict) -> None:
+    CommanderImage.objects.bulk_create(
+        [
+            CommanderImage(commander_id=commander_id, images=images)
+            for commander_id, images in batch.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["commander"],
+        update_fields=["images", "updated_at"],
+    )
+    batch.clear()
+
+
+def ingest_commander_images(f: IO[str], batch_size: int = BATCH_SIZE) -> dict:
+    """Match the cards in a Scryfall bulk-data file to Commanders by name and
+    upsert their images. The first printing with art wins for each commander."""
+    ids_by_name: dict[str, list[int]] = {}
+    for commander_id, name in Commanders.objects.values_list("id", "name"):
+        key = _normalize_for_scryfall(name).lower()
+        ids_by_name.setdefault(key, []).append(commander_id)
+
+    seen: set[int] = set()
+    batch: dict[int, list[dict]] = {}
+    cards = 0
+    for card in iter_json_array(f):
+        cards += 1
+        commander_ids = ids_by_name.get(
+            _normalize_for_scryfall(card.get("name", "")).lower()
+        )
+        if not commander_ids or commander_ids[0] in seen:
+            continue
+        images = card_images(card)
+        if not images:
+            continue
+        for commander_id in commander_ids:
+            seen.add(commander_id)
+            batch[commander_id] = images
+        if len(batch) >= batch_size:
+            _flush(batch)
+    if batch:
+        _flush(batch)
+
+    commanders = sum(len(ids) for ids in ids_by_name.values())
+    return {"cards": cards, "matched": len(seen), "unmatched": commanders - len(seen)}
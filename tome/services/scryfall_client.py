@@ -1,20 +1,28 @@
 import logging
 import requests, json, hashlib, threading, time, re
-from typing import Dict, List, Iterable, Any, Optional, Union
+from typing import Dict, List, Iterable, Iterator, Any, Optional, Union
 from collections import OrderedDict
+import redis
+from django.conf import settings
 from django.core.cache import cache
 
+from achievements.models import CommanderImage
+from services.rate_limit import RedisTokenBucket, TokenBucket, WaitStats
+
 logger = logging.getLogger(__name__)
 
 
 CACHE_TTL = 60 * 60 * 24 * 30
+CARD_LRU_SIZE = 1024
+CARD_LRU_TTL = 60 * 60
 SCRYFALL_COLLECTION_URL = "https://api.scryfall.com/cards/collection"
 SCRYFALL_HEADERS = {"User-Agent": "MTGCommanderLeague/1.0", "Accept": "*/*"}
 REQUEST_TIMEOUT = 8
-_RPS_LIMIT = 8
-_WINDOW_SEC = 1.0
-_window_ts: List[float] = []
-_lock = threading.Lock()
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RATE_LIMIT_KEY = "league:scryfall:ratelimit"
+_limiter: Optional[TokenBucket] = None
+_limiter_lock = threading.Lock()
+_throttle_stats = WaitStats()
 
 PLUS_SPLIT = re.compile(r"\s*\+\s*")
 SUFFIX_PARENS = re.compile(r"\s*\([^)]*\)$")
@@ -54,19 +62,94 @@ def _explode_raw_names(raw: Optional[str]) -> list[str]:
     return [_normalize_for_scryfall(p) for p in parts]
 
 
-def _throttle():
-    with _lock:
+def _indexed_images(names: Iterable[str]) -> dict[str, list[dict]]:
+    """lowercased normalized name -> images, from the commander_images table."""
+    names = list(OrderedDict.fromkeys(names))
+    if not names:
+        return {}
+    rows = CommanderImage.objects.filter(
+        commander__name__in=names, commander__deleted=False
+    ).values_list("commander__name", "images")
+    return {_normalize_for_scryfall(name).lower(): images for name, images in rows}
+
+
+def _card_cache_key(name: str) -> str:
+    return f"scryfall:card:name:{_norm_key(name)}"
+
+
+class _LRUCache:
+    """Bounded, thread safe in-process LRU with a TTL, for the hottest cards."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
         now = time.monotonic()
-        while _window_ts and now - _window_ts[0] > _WINDOW_SEC:
-            _window_ts.pop(0)
-        if len(_window_ts) >= _RPS_LIMIT:
-            sleep_for = _WINDOW_SEC - (now - _window_ts[0])
-        else:
-            sleep_for = 0.0
-    if sleep_for > 0:
-        time.sleep(max(0, sleep_for))
-    with _lock:
-        _window_ts.append(time.monotonic())
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at < now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = (expires_at, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_card_lru = _LRUCache(CARD_LRU_SIZE, CARD_LRU_TTL)
+
+
+def clear_card_lru() -> None:
+    _card_lru.clear()
+
+
+def _get_limiter() -> TokenBucket:
+    """Shared through Redis when we have one, so all workers stay under
+    SCRYFALL_RATE_LIMIT together, else limited per process."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            rate, burst = settings.SCRYFALL_RATE_LIMIT, settings.SCRYFALL_RATE_BURST
+            if settings.REDIS_URL:
+                _limiter = RedisTokenBucket(
+                    redis.from_url(settings.REDIS_URL),
+                    RATE_LIMIT_KEY,
+                    rate,
+                    burst,
+                    _throttle_stats,
+                )
+            else:
+                _limiter = TokenBucket(rate, burst, _throttle_stats)
+        return _limiter
+
+
+def _throttle():
+    _get_limiter().acquire()
+
+
+def throttle_stats() -> dict:
+    """How long Scryfall requests from this process waited on the rate limit."""
+    return _throttle_stats.snapshot()
 
 
 def _chunk(lst: List[Any], size: int) -> Iterable[List[Any]]:
@@ -79,6 +162,35 @@ def _chunk_cache_key(identifiers: List[Dict[str, Any]]) -> str:
     return "scryfall:collection:" + hashlib.sha1(payload.encode()).hexdigest()
 
 
+def _retry_delay(resp, retries: int) -> float:
+    """Seconds to wait before retrying `resp`, from Retry-After when Scryfall
+    sends one, else a jittered exponential backoff."""
+    ra = resp.headers.get("Retry-After")
+    if ra:
+        try:
+            return float(ra)
+        except ValueError:
+            return 0.5
+    attempt = 4 - retries
+    base = 0.25 * (2**attempt)
+    return base + (0.1 * base * (time.monotonic() % 1))
+
+
+def _backoff(resp, retries: int) -> None:
+    delay = _retry_delay(resp, retries)
+    if resp.headers.get("Retry-After"):
+        # Scryfall asked us to back off, hold every other caller back too
+        _get_limiter().pause(delay)
+    time.sleep(delay)
+
+
+def _error_detail(resp) -> Any:
+    try:
+        return resp.json()
+    except Exception:
+        return resp.text
+
+
 def _request_collection(
     identifiers: List[Dict[str, Any]], retries: int = 3
 ) -> Dict[str, Any]:
@@ -92,25 +204,49 @@ def _request_collection(
     if 200 <= resp.status_code < 300:
         return resp.json()
 
-    if resp.status_code in (429, 500, 502, 503, 504) and retries > 0:
-        ra = resp.headers.get("Retry-After")
-        if ra:
-            try:
-                delay = float(ra)
-            except ValueError:
-                delay = 0.5
-        else:
-            attempt = 4 - retries
-            base = 0.25 * (2**attempt)
-            delay = base + (0.1 * base * (time.monotonic() % 1))
-        time.sleep(delay)
+    if resp.status_code in RETRY_STATUSES and retries > 0:
+        _backoff(resp, retries)
         return _request_collection(identifiers, retries - 1)
 
+    raise RuntimeError(f"Scryfall error {resp.status_code}: {_error_detail(resp)}")
+
+
+def iter_search_pages(
+    url: str, session: Optional[requests.Session] = None, retries: int = 3
+) -> Iterator[List[Dict[str, Any]]]:
+    """Follow a paginated Scryfall list (e.g. /cards/search) from `url`, yielding
+    each page's cards as it arrives. One pooled session is reused for every page
+    and each request goes through `_throttle`, with Retry-After honored on 429/5xx."""
+    owns_session = session is None
+    if owns_session:
+        session = requests.Session()
+        session.headers.update(SCRYFALL_HEADERS)
+
     try:
-        detail = resp.json()
-    except Exception:
-        detail = resp.text
-    raise RuntimeError(f"Scryfall error {resp.status_code}: {detail}")
+        while url:
+            left = retries
+            while True:
+                _throttle()
+                resp = session.get(url, timeout=REQUEST_TIMEOUT)
+                if resp.status_code not in RETRY_STATUSES or left <= 0:
+                    break
+                _backoff(resp, left)
+                left -= 1
+
+            if resp.status_code == 404:
+                # Scryfall answers a search with no matches with a 404
+                return
+            if not 200 <= resp.status_code < 300:
+                raise RuntimeError(
+                    f"Scryfall error {resp.status_code}: {_error_detail(resp)}"
+                )
+
+            page = resp.json()
+            yield page.get("data", [])
+            url = page.get("next_page") if page.get("has_more") else None
+    finally:
+        if owns_session:
+            session.close()
 
 
 class ScryfallClientRequest:
@@ -134,18 +270,22 @@ class ScryfallClientRequest:
         all_cards: List[Dict[str, Any]] = []
         all_warnings: List[Any] = []
 
-        for chunk in _chunk(identifiers, MAX_PER):
-            ck = _chunk_cache_key(chunk)
-            cached = cache.get(ck)
-            if cached is None:
+        chunks = list(_chunk(identifiers, MAX_PER))
+        chunk_keys = [_chunk_cache_key(chunk) for chunk in chunks]
+        cached = cache.get_many(chunk_keys) if chunk_keys else {}
+        fetched: Dict[str, Any] = {}
+
+        for chunk, ck in zip(chunks, chunk_keys):
+            data = cached.get(ck)
+            if data is None:
                 data = _request_collection(chunk)
-                cache.set(ck, data, timeout=self.cache_ttl)
-            else:
-                data = cached
+                fetched[ck] = data
 
             all_cards.extend(data.get("data", []))
             if data.get("warnings"):
                 all_warnings.extend(data["warnings"])
+        if fetched:
+            cache.set_many(fetched, timeout=self.cache_ttl)
         out = {"object": "list", "data": all_cards}
         if all_warnings:
             out["warnings"] = all_warnings
@@ -183,7 +323,8 @@ class ScryfallClientRequest:
         """
         Accepts raw DB values (may contain '+' and/or trailing parenthetical variants).
         Returns: { raw_input: [card_payload, ...] }.
-        Internally caches each card by its normalized name key: scryfall:card:name:<normalized>.
+        Internally caches each card by its normalized name key: scryfall:card:name:<normalized>,
+        read with a single get_many behind a small in-process LRU.
         """
         # 1) Build: raw -> [normalized names...]
         raw_to_norms: dict[str, list[str]] = {}
@@ -197,13 +338,22 @@ class ScryfallClientRequest:
         # global de-dupe of normalized names while preserving order
         all_norms = list(OrderedDict.fromkeys(all_norms))
 
-        # 2) Per-name cache lookups; collect misses for batch request
+        # 2) In-process LRU, then one multi-key cache read for the rest;
+        # collect misses for batch request
         wants: list[dict[str, str]] = []
         norm_to_card: dict[str, dict] = {}
 
-        for n in all_norms:
-            key = f"scryfall:card:name:{_norm_key(n)}"
-            hit = cache.get(key)
+        norm_to_key = {n: _card_cache_key(n) for n in all_norms}
+        keys = list(OrderedDict.fromkeys(norm_to_key.values()))
+        hits = _card_lru.get_many(keys)
+        remaining = [key for key in keys if key not in hits]
+        if remaining:
+            from_cache = cache.get_many(remaining)
+            _card_lru.set_many(from_cache)
+            hits.update(from_cache)
+
+        for n, key in norm_to_key.items():
+            hit = hits.get(key)
             if hit:
                 norm_to_card[n] = hit
             else:
@@ -212,18 +362,21 @@ class ScryfallClientRequest:
         logger.info(f"Cards pulled from cache: {list(norm_to_card.keys())}")
         logger.info(f"Cards to be fetched: {wants}")
 
-        # 3) Batch fetch any misses, then fill cache and map
+        # 3) Batch fetch any misses, then fill cache (one pipelined write) and map
         if wants:
             bundle = self.get_cards_by_collection(wants)
+            new_cards: dict[str, dict] = {}
             for card in bundle.get("data", []):
                 # Scryfall returns canonical name in `name`
                 cn = card.get("name", "")
-                cache_key = f"scryfall:card:name:{_norm_key(cn)}"
-                cache.set(cache_key, card, timeout=self.cache_ttl)
+                new_cards[_card_cache_key(cn)] = card
                 norm_to_card[cn] = card
 
                 # also ensure lowercase access works
                 norm_to_card[_normalize_for_scryfall(cn)] = card
+            if new_cards:
+                cache.set_many(new_cards, timeout=self.cache_ttl)
+                _card_lru.set_many(new_cards)
 
         # 4) Build result per raw input (list for partners)
         out: dict[str, list[dict]] = {}
@@ -244,13 +397,33 @@ class ScryfallClientRequest:
     ) -> dict[str, list[str]]:
         """
         Convenience: raw -> [image_url, ...]
+        Answered from the local commander_images table (load_commander_images),
+        only going to Scryfall for raw values with a name the table doesn't know.
         """
-        cards_by_raw = self.get_commander_card_payloads_by_raw(commander_names)
+        raw_to_norms = {raw: _explode_raw_names(raw) for raw in commander_names}
+        # Match on the stored name too, e.g. double faced "Front // Back"
+        indexed = _indexed_images(
+            [n for norms in raw_to_norms.values() for n in norms]
+            + [p for raw in raw_to_norms for p in split_commander_field(raw)]
+        )
+
+        unknown = [
+            raw
+            for raw, norms in raw_to_norms.items()
+            if any(n.lower() not in indexed for n in norms)
+        ]
+        cards_by_raw = (
+            self.get_commander_card_payloads_by_raw(unknown) if unknown else {}
+        )
         images_by_raw: dict[str, list[str]] = {}
 
-        for raw, cards in cards_by_raw.items():
+        for raw, norms in raw_to_norms.items():
+            if raw not in cards_by_raw:
+                images_by_raw[raw] = [img for n in norms for img in indexed[n.lower()]]
+                continue
+
             imgs = []
-            for c in cards:
+            for c in cards_by_raw[raw]:
                 urls = self.primary_image_url(c)
                 if urls:
                     if isinstance(urls, list):
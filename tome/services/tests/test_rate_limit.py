@@ -0,0 +1,61 @@
+import pytest
+
+from services import rate_limit
+from services.rate_limit import RedisTokenBucket, TokenBucket
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(rate_limit.time, "sleep", calls.append)
+    return calls
+
+
+def test_burst_then_paced(sleeps):
+    """should: let a burst through immediately, then space requests by 1/rate"""
+    bucket = TokenBucket(rate=10, burst=3)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.01)
+    assert waits[4] == pytest.approx(0.2, abs=0.01)
+    assert len(sleeps) == 2
+
+
+def test_pause_holds_back_next_request(sleeps):
+    """should: make the next caller wait out a Retry-After pause"""
+    bucket = TokenBucket(rate=10, burst=3)
+
+    bucket.pause(2)
+
+    assert bucket.acquire() == pytest.approx(2, abs=0.01)
+
+
+def test_wait_stats(sleeps):
+    """should: count throttled requests and their wait time"""
+    bucket = TokenBucket(rate=10, burst=1)
+    bucket.acquire()
+    bucket.acquire()
+
+    stats = bucket.stats.snapshot()
+
+    assert stats["requests"] == 2
+    assert stats["throttled"] == 1
+    assert stats["max_wait_ms"] == pytest.approx(100, abs=10)
+
+
+def test_redis_bucket_falls_back_when_unreachable(sleeps):
+    """should: keep limiting in process when the Redis script fails"""
+
+    class DownRedis:
+        def register_script(self, _):
+            def _call(**kwargs):
+                raise ConnectionError("redis down")
+
+            return _call
+
+    bucket = RedisTokenBucket(DownRedis(), "test", rate=10, burst=1)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.1, abs=0.01)
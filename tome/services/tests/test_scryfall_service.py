@@ -3,7 +3,11 @@ import types
 import pytest
 
 from django.core.cache import cache
-from services.scryfall_client import ScryfallClientRequest, SCRYFALL_COLLECTION_URL
+from services.scryfall_client import (
+    ScryfallClientRequest,
+    SCRYFALL_COLLECTION_URL,
+    clear_card_lru,
+)
 
 pytestmark = pytest.mark.django_db
 
@@ -41,8 +45,10 @@ def fake_scryfall_response(cards):
 @pytest.fixture(autouse=True)
 def clear_cache():
     cache.clear()
+    clear_card_lru()
     yield
     cache.clear()
+    clear_card_lru()
 
 
 @pytest.fixture
@@ -158,3 +164,37 @@ def test_partner_order_preserved(svc, mock_requests_post, no_throttle):
     _ = svc.get_commander_card_payloads_by_raw(raw)
     sent_names = [i["name"] for i in mock_requests_post["payloads"][0]["identifiers"]]
     assert sent_names == ["A Partner", "Z Partner", "B Partner"]
+
+
+def test_cached_cards_use_one_cache_read(
+    svc, mock_requests_post, no_throttle, monkeypatch
+):
+    raw = ["A Partner+Z Partner", "Atraxa, Grand Unifier", "The Prismatic Piper (Blue)"]
+    _ = svc.get_commander_card_payloads_by_raw(raw)
+    clear_card_lru()
+
+    reads = {"get": 0, "get_many": 0}
+    real_get, real_get_many = cache.get, cache.get_many
+
+    def _get(*args, **kwargs):
+        reads["get"] += 1
+        return real_get(*args, **kwargs)
+
+    def _get_many(*args, **kwargs):
+        reads["get_many"] += 1
+        return real_get_many(*args, **kwargs)
+
+    monkeypatch.setattr(cache, "get", _get)
+    monkeypatch.setattr(cache, "get_many", _get_many)
+
+    result = svc.get_commander_card_payloads_by_raw(raw)
+    assert [c["name"] for c in result["A Partner+Z Partner"]] == [
+        "A Partner",
+        "Z Partner",
+    ]
+    assert reads == {"get": 0, "get_many": 1}
+    assert mock_requests_post["count"] == 1
+
+    # Now warm in the in-process LRU, no cache reads at all
+    _ = svc.get_commander_card_payloads_by_raw(raw)
+    assert reads == {"get": 0, "get_many": 1}
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional
 
 from django.db.models import Sum, Q
@@ -8,6 +8,7 @@ from django.utils import timezone
 from users.models import Participants, ParticipantAchievements
 from users.serializers import ParticipantsSerializer
 from achievements.models import Achievements
+from achievements.helpers import finalize_monthly_winners
 from achievements.earned_count_helpers import (
     decrement_earned_counts,
     increment_earned_counts,
@@ -17,6 +18,7 @@ from achievements.earned_count_helpers import (
 from sessions_rounds.models import Pods, PodsParticipants, Rounds, Sessions
 from stores.models import StoreParticipant
 from users.helpers import generate_code
+from metrics.counter_helpers import achievement_counter_rows, increment_metrics_counters
 
 
 PARTICIPATION_ACHIEVEMENT = "participation"
@@ -29,6 +31,11 @@ PATREON_REJECTION_MESSAGE = (
 )
 
 
+def month_start(mm_yy: str) -> date:
+    """The first day of an "MM-YY" month, as stored in the month columns."""
+    return datetime.strptime(mm_yy, "%m-%y").date()
+
+
 def _as_aware(dt: datetime) -> datetime:
     if timezone.is_aware(dt):
         return dt
@@ -188,7 +195,7 @@ def generate_pods(participants, round_id, store_id):
 def handle_close_round(round_id):
     """
     If all pods in the round are submitted, mark the round as completed.
-    If it's Round 2, also close the session.
+    If it's Round 2, also close the session and finalize its month's winners.
     """
     round = Rounds.objects.filter(id=round_id).first()
 
@@ -200,6 +207,7 @@ def handle_close_round(round_id):
             session = Sessions.objects.filter(id=round.session_id).first()
             session.closed = True
             session.save()
+            finalize_monthly_winners(session.store_id, session.month)
 
 
 class RoundInformationService:
@@ -280,8 +288,15 @@ class RoundInformationService:
                 )
                 for ep in self.existing_participants
             ]
-            ParticipantAchievements.objects.bulk_create(records)
+            created = ParticipantAchievements.objects.bulk_create(records)
             increment_earned_counts(pairs_from_participant_achievements(records))
+            increment_metrics_counters(
+                achievement_counter_rows(
+                    ParticipantAchievements.objects.filter(
+                        id__in=[record.id for record in created]
+                    )
+                )
+            )
         except Exception as e:
             print(f"Error found while creating participant achievements: {e}")
 
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sessions_rounds", "0008_pods_store_roundsignups_store_sessions_store"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pods",
+            name="month",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="pods",
+            name="session_date",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="rounds",
+            name="month",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="rounds",
+            name="session_date",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="sessions",
+            name="month",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="pods",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["store", "month"],
+                name="pods_store_month_live_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rounds",
+            index=models.Index(fields=["month"], name="rounds_month_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="sessions",
+            index=models.Index(
+                fields=["store", "month"], name="sessions_store_month_idx"
+            ),
+        ),
+    ]
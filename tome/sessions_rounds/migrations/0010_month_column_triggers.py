@@ -0,0 +1,89 @@
+# 0010_month_column_triggers.py
+from django.db import migrations
+
+# Sessions derive month from month_year, rounds copy it (and session_date) from
+# their session and pods from their round. BEFORE triggers fill the columns on
+# every insert/update, whatever the ORM sent; AFTER triggers push a changed
+# session or round down to its children.
+TRIGGERS = """
+CREATE FUNCTION sessions_set_month() RETURNS trigger AS $$
+BEGIN
+    NEW.month := to_date(NEW.month_year, 'MM-YY');
+    RETURN NEW;
+END $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER sessions_set_month BEFORE INSERT OR UPDATE ON sessions
+    FOR EACH ROW EXECUTE FUNCTION sessions_set_month();
+
+CREATE FUNCTION rounds_set_month() RETURNS trigger AS $$
+BEGIN
+    SELECT s.month, s.session_date INTO NEW.month, NEW.session_date
+    FROM sessions s WHERE s.id = NEW.session_id;
+    RETURN NEW;
+END $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER rounds_set_month BEFORE INSERT OR UPDATE ON rounds
+    FOR EACH ROW EXECUTE FUNCTION rounds_set_month();
+
+CREATE FUNCTION pods_set_month() RETURNS trigger AS $$
+BEGIN
+    SELECT r.month, r.session_date INTO NEW.month, NEW.session_date
+    FROM rounds r WHERE r.id = NEW.rounds_id;
+    RETURN NEW;
+END $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER pods_set_month BEFORE INSERT OR UPDATE ON pods
+    FOR EACH ROW EXECUTE FUNCTION pods_set_month();
+
+CREATE FUNCTION sessions_sync_month() RETURNS trigger AS $$
+BEGIN
+    UPDATE rounds SET month = NEW.month WHERE session_id = NEW.id;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER sessions_sync_month AFTER UPDATE ON sessions
+    FOR EACH ROW
+    WHEN (OLD.month IS DISTINCT FROM NEW.month
+          OR OLD.session_date IS DISTINCT FROM NEW.session_date)
+    EXECUTE FUNCTION sessions_sync_month();
+
+CREATE FUNCTION rounds_sync_month() RETURNS trigger AS $$
+BEGIN
+    UPDATE pods SET month = NEW.month WHERE rounds_id = NEW.id;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER rounds_sync_month AFTER UPDATE ON rounds
+    FOR EACH ROW
+    WHEN (OLD.month IS DISTINCT FROM NEW.month
+          OR OLD.session_date IS DISTINCT FROM NEW.session_date)
+    EXECUTE FUNCTION rounds_sync_month();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS rounds_sync_month ON rounds;
+DROP TRIGGER IF EXISTS sessions_sync_month ON sessions;
+DROP TRIGGER IF EXISTS pods_set_month ON pods;
+DROP TRIGGER IF EXISTS rounds_set_month ON rounds;
+DROP TRIGGER IF EXISTS sessions_set_month ON sessions;
+DROP FUNCTION IF EXISTS rounds_sync_month();
+DROP FUNCTION IF EXISTS sessions_sync_month();
+DROP FUNCTION IF EXISTS pods_set_month();
+DROP FUNCTION IF EXISTS rounds_set_month();
+DROP FUNCTION IF EXISTS sessions_set_month();
+"""
+
+# The BEFORE triggers recompute each row, so touching every row backfills it
+BACKFILL = """
+UPDATE sessions SET month = NULL;
+UPDATE rounds SET month = NULL;
+UPDATE pods SET month = NULL;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [("sessions_rounds", "0009_month_columns")]
+    operations = [
+        migrations.RunSQL(TRIGGERS, DROP_TRIGGERS),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
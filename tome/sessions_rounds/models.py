@@ -8,9 +8,16 @@ class Sessions(models.Model):
     deleted = models.BooleanField(default=False)
     session_date = models.DateField(null=True, blank=True, default=None)
     store = models.ForeignKey("stores.Store", on_delete=models.CASCADE, null=True)
+    # First day of month_year's month. This and the month/session_date copies
+    # on rounds and pods are filled in by database triggers (migration 0010)
+    # so bulk_create, COPY and session edits can't leave them stale.
+    month = models.DateField(null=True, editable=False)
 
     class Meta:
         db_table = "sessions"
+        indexes = [
+            models.Index(fields=["store", "month"], name="sessions_store_month_idx")
+        ]
 
 
 class RoundOptions(models.IntegerChoices):
@@ -25,9 +32,12 @@ class Rounds(models.Model):
     completed = models.BooleanField(default=False)
     deleted = models.BooleanField(default=False)
     starts_at = models.DateTimeField(null=True, blank=True, default=None)
+    month = models.DateField(null=True, editable=False)
+    session_date = models.DateField(null=True, editable=False)
 
     class Meta:
         db_table = "rounds"
+        indexes = [models.Index(fields=["month"], name="rounds_month_idx")]
 
 
 class Pods(models.Model):
@@ -35,9 +45,18 @@ class Pods(models.Model):
     deleted = models.BooleanField(default=False)
     submitted = models.BooleanField(default=False)
     store = models.ForeignKey("stores.Store", on_delete=models.CASCADE, null=True)
+    month = models.DateField(null=True, editable=False)
+    session_date = models.DateField(null=True, editable=False)
 
     class Meta:
         db_table = "pods"
+        indexes = [
+            models.Index(
+                fields=["store", "month"],
+                name="pods_store_month_live_idx",
+                condition=models.Q(deleted=False),
+            )
+        ]
 
 
 class PodsParticipants(models.Model):
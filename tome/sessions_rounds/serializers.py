@@ -33,6 +33,9 @@ class PodsSerializer(serializers.ModelSerializer):
 
 
 class PodsParticipantsSerializer(serializers.ModelSerializer):
+    """Pass `points` from Participants.get_points_for_participants in the context
+    to avoid a points query per row."""
+
     pods = PodsSerializer(read_only=True)
     participant_id = serializers.IntegerField(source="participants.id")
     name = serializers.CharField(source="participants.name")
@@ -46,7 +49,10 @@ class PodsParticipantsSerializer(serializers.ModelSerializer):
     def get_round_points(self, obj):
         round_id = self.context.get("round_id")
         store_id = self.context["store_id"]
+        points = self.context.get("points")
         if round_id:
+            if points is not None:
+                return points["round_points"].get(obj.participants_id, 0)
             return obj.participants.get_round_points(
                 store_id=store_id, round_id=round_id
             )
@@ -55,4 +61,7 @@ class PodsParticipantsSerializer(serializers.ModelSerializer):
     def get_total_points(self, obj):
         mm_yy = self.context.get("mm_yy", None)
         store_id = self.context["store_id"]
+        points = self.context.get("points")
+        if points is not None:
+            return points["total_points"].get(obj.participants_id, 0)
         return obj.participants.get_total_points(mm_yy=mm_yy, store_id=store_id)
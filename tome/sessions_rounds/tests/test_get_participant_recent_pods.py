@@ -267,3 +267,17 @@ def test_get_recent_pods_last_month(client, build_pods_last_month) -> None:
     assert res.status_code == status.HTTP_200_OK
 
     assert parsed_res == expected
+
+
+def test_get_recent_pods_invalid_month(client) -> None:
+    """
+    should: reject a month that isn't MM-YY
+    """
+
+    url = reverse(
+        "get_participant_recent_pods",
+        kwargs={"participant_id": ids.P1, "mm_yy": "2024-10"},
+    )
+    res = client.get(url)
+
+    assert res.status_code == status.HTTP_400_BAD_REQUEST
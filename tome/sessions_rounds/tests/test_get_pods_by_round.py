@@ -1,11 +1,13 @@
 import pytest
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
 from sessions_rounds.models import Pods, PodsParticipants
 from achievements.models import WinningCommanders
-from users.models import ParticipantAchievements
+from users.models import ParticipantAchievements, Participants
 
 
 from utils.test_helpers import get_ids
@@ -279,3 +281,50 @@ def test_get_pods_by_round_with_winner(
 
     assert res.status_code == status.HTTP_200_OK
     assert parsed_res == expected
+
+
+@pytest.mark.parametrize(
+    "build_pods_participants",
+    [round_1_ids],
+    indirect=True,
+)
+def test_get_pods_by_round_query_count(
+    client, populate_participation, build_pods_participants
+) -> None:
+    """Should: use the same number of queries no matter how many participants
+    are in the round's pods."""
+
+    url = reverse("pods", kwargs={"round": ids.R1_SESSION_THIS_MONTH_OPEN})
+
+    with CaptureQueriesContext(connection) as before:
+        res = client.get(url)
+    assert res.status_code == status.HTTP_200_OK
+
+    pod = Pods.objects.filter(rounds_id=ids.R1_SESSION_THIS_MONTH_OPEN).first()
+    new_pids = [
+        Participants.objects.create(name=name).id
+        for name in ["Late Arrival", "Later Arrival"]
+    ]
+    PodsParticipants.objects.bulk_create(
+        [PodsParticipants(pods_id=pod.id, participants_id=pid) for pid in new_pids]
+    )
+    ParticipantAchievements.objects.bulk_create(
+        [
+            ParticipantAchievements(
+                participant_id=pid,
+                achievement_id=ids.PARTICIPATION,
+                round_id=ids.R1_SESSION_THIS_MONTH_OPEN,
+                session_id=ids.SESSION_THIS_MONTH_OPEN,
+                earned_points=3,
+                store_id=ids.MIMICS_ID,
+            )
+            for pid in new_pids
+        ]
+    )
+
+    with CaptureQueriesContext(connection) as after:
+        res = client.get(url)
+    assert res.status_code == status.HTTP_200_OK
+    assert sum(len(pod["participants"]) for pod in res.json().values()) == 12
+
+    assert len(after.captured_queries) == len(before.captured_queries)
@@ -0,0 +1,54 @@
+from datetime import date
+
+from sessions_rounds.models import Pods, Rounds, Sessions
+from utils.test_helpers import get_ids
+
+ids = get_ids()
+
+SESSION_ID = 46
+ROUND_ID = 56
+
+
+def _months(model, **filters):
+    return set(model.objects.filter(**filters).values_list("month", "session_date"))
+
+
+def test_month_columns_filled_on_insert() -> None:
+    """should: fill month and session_date down from the session, bulk_create included"""
+
+    Sessions.objects.create(
+        id=SESSION_ID,
+        month_year="12-24",
+        session_date=date(2024, 12, 8),
+        store_id=ids.MIMICS_ID,
+    )
+    Rounds.objects.create(id=ROUND_ID, session_id=SESSION_ID, round_number=1)
+    Pods.objects.bulk_create(
+        [Pods(rounds_id=ROUND_ID, store_id=ids.MIMICS_ID) for _ in range(2)]
+    )
+
+    assert Sessions.objects.get(id=SESSION_ID).month == date(2024, 12, 1)
+    assert _months(Rounds, id=ROUND_ID) == {(date(2024, 12, 1), date(2024, 12, 8))}
+    assert _months(Pods, rounds_id=ROUND_ID) == {(date(2024, 12, 1), date(2024, 12, 8))}
+
+
+def test_month_columns_follow_session_edits() -> None:
+    """should: move rounds and pods along when their session changes month"""
+
+    Pods.objects.create(rounds_id=ids.R1_SESSION_LAST_MONTH, store_id=ids.MIMICS_ID)
+    session = Sessions.objects.get(id=ids.SESSION_LAST_MONTH)
+    session.month_year = "09-24"
+    session.session_date = date(2024, 9, 29)
+    session.save()
+
+    expected = {(date(2024, 9, 1), date(2024, 9, 29))}
+    assert _months(Rounds, session_id=ids.SESSION_LAST_MONTH) == expected
+    assert _months(Pods, rounds__session_id=ids.SESSION_LAST_MONTH) == expected
+
+
+def test_month_columns_filled_on_copy() -> None:
+    """should: fill the columns for rows loaded with COPY, like the seeds"""
+
+    assert not Sessions.objects.filter(month__isnull=True).exists()
+    assert not Rounds.objects.filter(month__isnull=True).exists()
+    assert Rounds.objects.get(id=ids.R1_SESSION_LAST_MONTH).month == date(2024, 10, 1)
@@ -1,7 +1,10 @@
 import pytest
 
+from datetime import date
 
+from achievements.models import MonthlyWinner
 from sessions_rounds.models import Pods, Rounds, Sessions
+from users.models import ParticipantAchievements
 
 from utils.test_helpers import get_ids
 from sessions_rounds.helpers import handle_close_round
@@ -64,3 +67,28 @@ def test_close_round_two_session(build_pods_round_two) -> None:
 
     assert round.completed == True
     assert session.closed == True
+
+
+def test_close_round_two_finalizes_winners(build_pods_round_two) -> None:
+    """
+    should: store the month's winners once its session closes
+    """
+    ParticipantAchievements.objects.bulk_create(
+        [
+            ParticipantAchievements(
+                participant_id=pid,
+                achievement_id=ids.PARTICIPATION,
+                round_id=ids.R2_SESSION_THIS_MONTH_OPEN,
+                session_id=ids.SESSION_THIS_MONTH_OPEN,
+                earned_points=points,
+                store_id=ids.MIMICS_ID,
+            )
+            for pid, points in [(ids.P1, 3), (ids.P2, 5)]
+        ]
+    )
+
+    handle_close_round(ids.R2_SESSION_THIS_MONTH_OPEN)
+
+    assert list(
+        MonthlyWinner.objects.values_list("month", "participant_id", "total_points")
+    ) == [(date(2024, 11, 1), ids.P2, 5)]
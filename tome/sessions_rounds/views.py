@@ -20,6 +20,7 @@ from django.utils import timezone
 from .models import Sessions, Rounds, Pods, PodsParticipants, RoundSignups
 from users.models import ParticipantAchievements, Participants
 from achievements.models import WinningCommanders, Achievements
+from achievements.helpers import refresh_monthly_winners
 from achievements.earned_count_helpers import (
     decrement_earned_counts,
     increment_earned_counts,
@@ -38,8 +39,16 @@ from .helpers import (
     is_patreon_only_window,
     get_session_for_rounds,
     patreon_signin_rejection_message,
+    month_start,
 )
 from configs.configs import get_round_caps
+from metrics.snapshot_helpers import mark_metrics_snapshots_stale
+from metrics.counter_helpers import (
+    achievement_counter_rows,
+    winner_counter_rows,
+    increment_metrics_counters,
+    decrement_metrics_counters,
+)
 from services.discord_client import bot_announcement
 from utils.decorators import require_store
 
@@ -185,6 +194,8 @@ def begin_round(request, **kwargs):
     )
 
     all_participants = list(round_service.build_participants_and_achievements())
+    mark_metrics_snapshots_stale(request.store_id)
+    refresh_monthly_winners(request.store_id, [round_id])
 
     (
         random.shuffle(all_participants)
@@ -193,12 +204,22 @@ def begin_round(request, **kwargs):
         else all_participants.sort(key=lambda x: x.total_points, reverse=True)
     )
 
+    pods_participants = generate_pods(
+        participants=all_participants, round_id=round_id, store_id=request.store_id
+    )
+    participants_by_id = {p.id: p for p in all_participants}
+    for record in pods_participants:
+        record.participants = participants_by_id[record.participants_id]
+
     pods = PodsParticipantsSerializer(
-        generate_pods(
-            participants=all_participants, round_id=round_id, store_id=request.store_id
-        ),
+        pods_participants,
         many=True,
-        context={"store_id": request.store_id},
+        context={
+            "store_id": request.store_id,
+            "points": Participants.get_points_for_participants(
+                participants_by_id.keys(), store_id=request.store_id
+            ),
+        },
     ).data
 
     return Response(pods, status=status.HTTP_201_CREATED)
@@ -234,7 +255,7 @@ def get_round_participants(request, round, **kwargs):
 def get_pods(request, round, **kwargs):
     """Get the pods that were made for a given round."""
     try:
-        round_obj = Rounds.objects.get(
+        round_obj = Rounds.objects.select_related("session").get(
             id=round, deleted=False, session__store_id=request.store_id
         )
     except ObjectDoesNotExist:
@@ -248,8 +269,10 @@ def get_pods(request, round, **kwargs):
     pod_ids = pods.values_list("id", flat=True)
     winners_by_pod = WinningCommandersSerializer.by_pods(pods, request.store_id)
 
-    pods_participants = PodsParticipants.objects.filter(
-        pods_id__in=pod_ids, pods__store_id=request.store_id
+    pods_participants = list(
+        PodsParticipants.objects.filter(
+            pods_id__in=pod_ids, pods__store_id=request.store_id
+        ).select_related("pods", "participants")
     )
 
     serialized_participants = PodsParticipantsSerializer(
@@ -259,6 +282,12 @@ def get_pods(request, round, **kwargs):
             "round_id": round,
             "mm_yy": round_obj.session.month_year,
             "store_id": request.store_id,
+            "points": Participants.get_points_for_participants(
+                [pp.participants_id for pp in pods_participants],
+                store_id=request.store_id,
+                mm_yy=round_obj.session.month_year,
+                round_id=round,
+            ),
         },
     ).data
 
@@ -370,9 +399,16 @@ def get_participant_recent_pods(request, participant_id, mm_yy=None, **kwargs):
 
     """
 
-    if not mm_yy:
-        today = datetime.today()
-        mm_yy = today.strftime("%m-%y")
+    if mm_yy:
+        try:
+            month = month_start(mm_yy)
+        except ValueError:
+            return Response(
+                {"message": "Month must be MM-YY"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+    else:
+        month = datetime.today().date().replace(day=1)
 
     participant = Participants.objects.filter(id=participant_id, deleted=False).first()
 
@@ -385,7 +421,7 @@ def get_participant_recent_pods(request, participant_id, mm_yy=None, **kwargs):
     participant_pods = (
         Pods.objects.filter(
             deleted=False,
-            rounds__session__month_year=mm_yy,
+            month=month,
             podsparticipants__participants=participant,
             store_id=request.store_id,
         )
@@ -686,7 +722,7 @@ def update_pod_participants(request, **kwargs):
 
     if not has_participation:
         [sid] = Rounds.objects.filter(id=rid).values_list("session_id", flat=True)
-        ParticipantAchievements.objects.create(
+        earned = ParticipantAchievements.objects.create(
             participant_id=pid,
             round_id=rid,
             achievement_id=part.id,
@@ -695,6 +731,13 @@ def update_pod_participants(request, **kwargs):
             store_id=store_id,
         )
         increment_earned_counts([(part.id, None)])
+        increment_metrics_counters(
+            achievement_counter_rows(
+                ParticipantAchievements.objects.filter(id=earned.id)
+            )
+        )
+        mark_metrics_snapshots_stale(store_id)
+        refresh_monthly_winners(store_id, [rid])
 
     PodsParticipants.objects.create(participants_id=pid, pods_id=pod_id)
 
@@ -744,8 +787,12 @@ def delete_pod_participant(request, **kwargs):
         deleted=False,
     )
     deleted_pairs = list(participation_qs.values("achievement_id", "scalable_term_id"))
+    deleted_rows = achievement_counter_rows(participation_qs)
     participation_qs.update(deleted=True)
     decrement_earned_counts(pairs_from_queryset_values(deleted_pairs))
+    decrement_metrics_counters(deleted_rows)
+    mark_metrics_snapshots_stale(store_id)
+    refresh_monthly_winners(store_id, [session_round["rounds_id"]])
 
     return Response(
         {"message": "Successfully removed"}, status=status.HTTP_202_ACCEPTED
@@ -825,7 +872,11 @@ def delete_session(request, session_id, **kwargs):
         Rounds.objects.filter(id__in=round_ids).update(deleted=True)
     if pod_ids:
         Pods.objects.filter(id__in=pod_ids).update(deleted=True)
-        WinningCommanders.objects.filter(pods_id__in=pod_ids).update(deleted=True)
+        winners_qs = WinningCommanders.objects.filter(
+            pods_id__in=pod_ids, deleted=False
+        )
+        decrement_metrics_counters(winner_rows=winner_counter_rows(winners_qs))
+        winners_qs.update(deleted=True)
     if round_ids:
         session_achievements_qs = ParticipantAchievements.objects.filter(
             round_id__in=round_ids,
@@ -834,7 +885,11 @@ def delete_session(request, session_id, **kwargs):
         deleted_pairs = list(
             session_achievements_qs.values("achievement_id", "scalable_term_id")
         )
+        deleted_rows = achievement_counter_rows(session_achievements_qs)
         session_achievements_qs.update(deleted=True)
         decrement_earned_counts(pairs_from_queryset_values(deleted_pairs))
+        decrement_metrics_counters(deleted_rows)
 
+    mark_metrics_snapshots_stale(store_id)
+    refresh_monthly_winners(store_id, round_ids)
     return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Store
+
+GENERATION_KEY = "stores:generation"
+STORE_FIELDS = ("id", "slug", "name", "is_active")
+GUILD_STORE_FIELDS = ("id", "slug", "name", "discord_channel_id")
+# Cached for slugs with no store, cache.get returns None for a miss
+MISSING = False
+
+
+class LocalTTLCache:
+    """Small per-process dict with a fixed TTL, in front of the shared cache."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_local_slugs = LocalTTLCache(settings.STORE_CACHE_LOCAL_TTL)
+_local_guilds = LocalTTLCache(settings.STORE_CACHE_LOCAL_TTL)
+
+
+def _generation() -> int:
+    # Seeded from the clock so an evicted generation never reuses old keys
+    return cache.get_or_set(GENERATION_KEY, lambda: int(time.time() * 1000), None)
+
+
+def invalidate_store_cache() -> None:
+    """Drop every cached store lookup. Other workers' local copies expire
+    within STORE_CACHE_LOCAL_TTL."""
+    _generation()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, int(time.time() * 1000), None)
+    clear_local_store_cache()
+
+
+def clear_local_store_cache() -> None:
+    _local_slugs.clear()
+    _local_guilds.clear()
+
+
+def _cached_lookup(local: LocalTTLCache, kind: str, key, queryset, fields):
+    """First row of `queryset` as a dict (or None), through the local then the
+    shared cache. Misses are cached too, for STORE_CACHE_MISS_TTL."""
+    value = local.get(key)
+    if value is not None:
+        return value or None
+
+    cache_key = f"stores:{kind}:{_generation()}:{key}"
+    value = cache.get(cache_key)
+    if value is None:
+        row = queryset.values(*fields).first()
+        value = row or MISSING
+        cache.set(
+            cache_key,
+            value,
+            timeout=settings.STORE_CACHE_TTL if row else settings.STORE_CACHE_MISS_TTL,
+        )
+
+    local.set(key, value)
+    return value or None
+
+
+def get_store_by_slug(slug: str) -> Optional[dict]:
+    """Non-deleted store for a slug as {id, slug, name, is_active}, or None."""
+    return _cached_lookup(
+        _local_slugs,
+        "slug",
+        slug,
+        Store.objects.filter(slug=slug, deleted=False),
+        STORE_FIELDS,
+    )
+
+
+def get_store_for_guild(guild_id) -> Optional[dict]:
+    """Active, non-deleted store for a Discord guild as {id, slug, name,
+    discord_channel_id}, or None (including for a malformed guild id)."""
+    try:
+        guild_id = int(guild_id)
+    except (TypeError, ValueError):
+        return None
+
+    return _cached_lookup(
+        _local_guilds,
+        "guild",
+        guild_id,
+        Store.objects.filter(discord_guild_id=guild_id, is_active=True, deleted=False),
+        GUILD_STORE_FIELDS,
+    )
@@ -8,6 +8,7 @@ from configs.configs import (
     CONFIG_TYPE_SELECT,
     CONFIG_TYPE_TEXT,
     DEFAULT_VALUES,
+    invalidate_store_config,
 )
 from configs.models import Config
 from stores.models import Store
@@ -133,4 +134,5 @@ class Command(BaseCommand):
                     },
                 )
 
+        invalidate_store_config(store.id)
         self.stdout.write(self.style.SUCCESS(f"\nConfigs seeded for '{store.slug}'\n"))
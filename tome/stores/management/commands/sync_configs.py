@@ -6,6 +6,7 @@ from configs.configs import (
     CONFIG_TYPE_CHECKBOX,
     CONFIG_TYPE_SELECT,
     DEFAULT_VALUES,
+    invalidate_store_config,
 )
 from configs.models import Config
 from stores.models import Store
@@ -74,6 +75,7 @@ class Command(BaseCommand):
                     self.stdout.write(
                         f"  Created {key}={default_value} for {store.slug}"
                     )
+            invalidate_store_config(store.id)
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -1,14 +1,21 @@
+import logging
 import re
+import time
 from typing import Optional
 
 
 from django.utils.deprecation import MiddlewareMixin
 from django.http import HttpResponseRedirect
+from django.db import connection
 
 from django.conf import settings
 
 
+from .cache import get_store_by_slug
 from .models import Store
+from .profiling import QueryRecorder, record_sample
+
+logger = logging.getLogger(__name__)
 
 STORE_PATH_RE = re.compile(r"^/s/(?P<slug>[-a-zA-Z0-9_]+)/")
 
@@ -31,15 +38,14 @@ class StoreResolverMiddleware(MiddlewareMixin):
         if not slug:
             return
 
-        store = (
-            Store.objects.filter(slug=slug, deleted=False)
-            .only("id", "slug", "name", "is_active")
-            .first()
-        )
+        data = get_store_by_slug(slug)
 
-        if store is None:
+        if data is None:
             return
 
+        # Only the cached fields are set, the rest are deferred and load on access
+        store = Store.from_db(None, list(data), list(data.values()))
+
         request.store = store
         request.store_id = store.id
         request.store_slug = store.slug
@@ -115,13 +121,78 @@ class InvalidStoreRedirectMiddleware(MiddlewareMixin):
         if subdomain in self.RESERVED_SUBDOMAINS:
             return None
 
-        exists = Store.objects.filter(
-            slug=subdomain,
-            deleted=False,
-        ).exists()
+        exists = get_store_by_slug(subdomain) is not None
 
         if not exists:
             apex = getattr(settings, "APEX_DOMAIN", base)
             return HttpResponseRedirect(f"https://{apex}{request.get_full_path()}")
 
         return None
+
+
+class QueryProfilingMiddleware:
+    """
+    Records query count, DB time, repeated queries and wall time per request.
+
+    Adds a Server-Timing header (DEBUG or staff only), keeps rolling per-endpoint samples for the
+    request_stats endpoint and logs requests slower than
+    PROFILING_SLOW_REQUEST_MS or that repeat a query PROFILING_DUPLICATE_THRESHOLD
+    times or more (usually an N+1).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - start) * 1000
+        db_ms = recorder.duration * 1000
+        duplicates = recorder.duplicates()
+
+        if self._show_timing(request):
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{recorder.count} queries", '
+                f'app;dur={wall_ms:.1f}, dup;desc="{sum(duplicates.values())} repeated"'
+            )
+
+        match = request.resolver_match
+        endpoint = f"{request.method} {match.route if match else 'unresolved'}"
+        record_sample(
+            endpoint,
+            {
+                "wall_ms": wall_ms,
+                "db_ms": db_ms,
+                "queries": recorder.count,
+                "duplicates": duplicates,
+            },
+        )
+
+        worst = max(duplicates.values(), default=0)
+        if (
+            wall_ms >= settings.PROFILING_SLOW_REQUEST_MS
+            or worst >= settings.PROFILING_DUPLICATE_THRESHOLD
+        ):
+            logger.warning(
+                "Flagged request %s (store %s): %.1fms, %d queries in %.1fms, "
+                "repeated: %s",
+                endpoint,
+                getattr(request, "store_slug", None),
+                wall_ms,
+                recorder.count,
+                db_ms,
+                [f"{n}x {sql[:200]}" for sql, n in list(duplicates.items())[:3]],
+            )
+
+        return response
+
+    def _show_timing(self, request) -> bool:
+        """Query counts and timings are internal, only DEBUG and staff see them.
+        DRF copies the user it authenticated back onto the request, so this is
+        checked after the view has run."""
+        if settings.DEBUG:
+            return True
+        user = getattr(request, "user", None)
+        return bool(user and user.is_authenticated and getattr(user, "is_staff", False))
@@ -0,0 +1,88 @@
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+from django.conf import settings
+
+NUMBER_RE = re.compile(r"\b\d+\b")
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+IN_LIST_RE = re.compile(r"\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)")
+
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=settings.PROFILING_WINDOW))
+
+
+def fingerprint(sql: str) -> str:
+    """Collapse literals and IN lists so the same query with different values
+    (an N+1 loop) shares one fingerprint."""
+    sql = STRING_RE.sub("?", sql)
+    sql = NUMBER_RE.sub("?", sql)
+    return IN_LIST_RE.sub("IN (...)", sql)
+
+
+class QueryRecorder:
+    """connection.execute_wrapper that counts and times every query of a request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self) -> dict:
+        """{fingerprint: times run} for queries that ran more than once."""
+        return {sql: n for sql, n in self.fingerprints.most_common() if n > 1}
+
+
+def record_sample(endpoint: str, sample: dict) -> None:
+    with _lock:
+        _samples[endpoint].append(sample)
+
+
+def reset_profile_stats() -> None:
+    with _lock:
+        _samples.clear()
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)), 1) - 1]
+
+
+def collect_profile_stats() -> dict:
+    """Aggregates over the last PROFILING_WINDOW requests of each endpoint.
+
+    Samples live in this process, so each worker reports its own traffic."""
+    with _lock:
+        snapshot = {endpoint: list(samples) for endpoint, samples in _samples.items()}
+
+    endpoints = {}
+    for endpoint, samples in snapshot.items():
+        wall = [s["wall_ms"] for s in samples]
+        duplicates = Counter()
+        for s in samples:
+            duplicates.update(s["duplicates"])
+        endpoints[endpoint] = {
+            "requests": len(samples),
+            "p50_ms": round(_percentile(wall, 50), 2),
+            "p95_ms": round(_percentile(wall, 95), 2),
+            "avg_queries": round(sum(s["queries"] for s in samples) / len(samples), 2),
+            "max_queries": max(s["queries"] for s in samples),
+            "avg_db_ms": round(sum(s["db_ms"] for s in samples) / len(samples), 2),
+            "requests_with_duplicates": sum(1 for s in samples if s["duplicates"]),
+            "top_duplicates": [
+                {"sql": sql, "count": n} for sql, n in duplicates.most_common(3)
+            ],
+        }
+    return {"pid": os.getpid(), "endpoints": endpoints}
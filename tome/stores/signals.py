@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_store_cache
+from .models import Store
+
+
+@receiver(post_save, sender=Store)
+@receiver(post_delete, sender=Store)
+def store_changed(sender, **kwargs):
+    """Queryset .update() skips signals, call invalidate_store_cache after one."""
+    invalidate_store_cache()
@@ -4,6 +4,8 @@ from rest_framework.test import APIClient
 
 from stores.models import Store
 from stores.middleware import StoreResolverMiddleware, InvalidStoreRedirectMiddleware
+from stores.cache import get_store_by_slug
+from stores.profiling import QueryRecorder, fingerprint, reset_profile_stats
 
 
 @pytest.fixture
@@ -77,6 +79,13 @@ class TestStoreResolverMiddleware:
         assert request.store_id == store_active.id
         assert request.store_slug == "active-store"
 
+    def test_uncached_fields_load_on_access(self, rf, settings, store_active):
+        request = rf.get("/store/", HTTP_HOST="active-store.example.test")
+        request = self._resolve(request, settings)
+        assert "external_url" in request.store.get_deferred_fields()
+        assert request.store.external_url == "https://active.example.test"
+        assert request.store.discord_guild_id == 9999990001
+
     def test_resolves_inactive_store(self, rf, settings, store_inactive):
         request = rf.get("/store/", HTTP_HOST="inactive-store.example.test")
         request = self._resolve(request, settings)
@@ -127,3 +136,101 @@ class TestGetStoreView:
         res = client.get("/store/")
         assert res.status_code == 200
         assert res.data is None
+
+
+class TestQueryProfilingMiddleware:
+    """QueryProfilingMiddleware should time every request, flag repeated
+    queries and expose rolling per-endpoint stats."""
+
+    def test_fingerprint_collapses_literals(self):
+        assert fingerprint("SELECT * FROM pods WHERE id = 12 AND name = 'x'") == (
+            "SELECT * FROM pods WHERE id = ? AND name = ?"
+        )
+        assert fingerprint('SELECT 1 FROM "pods" WHERE "id" IN (%s, %s, %s)') == (
+            'SELECT ? FROM "pods" WHERE "id" IN (...)'
+        )
+
+    def test_recorder_counts_duplicates(self):
+        recorder = QueryRecorder()
+        execute = lambda sql, params, many, context: None
+        for pid in [1, 2, 3]:
+            recorder(execute, f"SELECT * FROM pods WHERE id = {pid}", None, False, {})
+        recorder(execute, "SELECT * FROM rounds", None, False, {})
+
+        assert recorder.count == 4
+        assert recorder.duplicates() == {"SELECT * FROM pods WHERE id = ?": 3}
+
+    def test_server_timing_header(self, settings, store_active):
+        settings.BASE_DOMAINS = {"example.test"}
+        settings.DEBUG = True
+        client = APIClient()
+        res = client.get("/store/", HTTP_HOST="active-store.example.test")
+
+        assert res.status_code == 200
+        assert res["Server-Timing"].startswith("db;dur=")
+        assert "queries" in res["Server-Timing"]
+
+    def test_server_timing_hidden_from_anonymous(self, settings, store_active):
+        settings.BASE_DOMAINS = {"example.test"}
+        client = APIClient()
+        res = client.get("/store/", HTTP_HOST="active-store.example.test")
+
+        assert res.status_code == 200
+        assert "Server-Timing" not in res
+
+    def test_request_stats(self, client):
+        reset_profile_stats()
+        client.get("/store/")
+        client.get("/store/")
+
+        res = client.get("/request_stats/")
+
+        assert res.status_code == 200
+        stats = res.json()["endpoints"]["GET store/"]
+        assert stats["requests"] == 2
+        assert stats["max_queries"] >= 1
+        assert stats["p50_ms"] <= stats["p95_ms"]
+        assert "throttled" in res.json()["scryfall_throttle"]
+
+
+class TestStoreCache:
+    """Store lookups by slug should be served from the cache once warm,
+    including for slugs with no store, and dropped when a Store is saved."""
+
+    def test_second_lookup_is_cached(self, store_active, django_assert_num_queries):
+        assert get_store_by_slug("active-store")["id"] == store_active.id
+
+        with django_assert_num_queries(0):
+            assert get_store_by_slug("active-store")["id"] == store_active.id
+
+    def test_missing_slug_is_cached(self, transactional_db, django_assert_num_queries):
+        assert get_store_by_slug("nope") is None
+
+        with django_assert_num_queries(0):
+            assert get_store_by_slug("nope") is None
+
+    def test_save_invalidates(self, store_active):
+        get_store_by_slug("active-store")
+
+        store_active.slug = "renamed-store"
+        store_active.save()
+
+        assert get_store_by_slug("active-store") is None
+        assert get_store_by_slug("renamed-store")["id"] == store_active.id
+
+    def test_middlewares_resolve_without_queries(
+        self, settings, store_active, django_assert_num_queries
+    ):
+        settings.BASE_DOMAINS = {"example.test"}
+        rf = RequestFactory()
+        redirect = InvalidStoreRedirectMiddleware(get_response=lambda r: None)
+        resolver = StoreResolverMiddleware(get_response=lambda r: None)
+        get_store_by_slug("active-store")
+
+        request = rf.get("/store/", HTTP_HOST="active-store.example.test")
+        with django_assert_num_queries(0):
+            assert redirect.process_request(request) is None
+            resolver.process_request(request)
+
+        assert request.store_id == store_active.id
+        assert request.store.name == "Active Store"
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import get_store, get_stores
+from .views import get_store, get_stores, get_request_stats
 
 urlpatterns = [
     path("store/", get_store, name="get_store"),
     path("store_list/", get_stores, name="get_stores"),
+    path("request_stats/", get_request_stats, name="request_stats"),
 ]
@@ -1,10 +1,18 @@
 from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework.decorators import api_view
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
 from rest_framework.response import Response
 
+from services.scryfall_client import throttle_stats
 from users.auth import StoreTokenObtainPairSerializer
+from utils.permissions import IsSuperUser
 
 from .models import Store
+from .profiling import collect_profile_stats
 
 GET = "GET"
 
@@ -41,3 +49,12 @@ def get_stores(request, **kwargs):
         .order_by("name")
     )
     return Response(stores)
+
+
+@api_view(["GET"])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsSuperUser])
+def get_request_stats(request, **kwargs):
+    """Rolling per-endpoint query and timing aggregates for this worker, plus
+    how long its Scryfall requests waited on the rate limit."""
+    return Response({**collect_profile_stats(), "scryfall_throttle": throttle_stats()})
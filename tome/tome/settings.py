@@ -45,12 +45,14 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "users",
     "achievements",
     "sessions_rounds",
     "discord",
     "configs",
     "stores",
+    "metrics",
     "rest_framework",
     "rest_framework.authtoken",
     "corsheaders",
@@ -60,6 +62,7 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "stores.middleware.QueryProfilingMiddleware",
     "stores.middleware.InvalidStoreRedirectMiddleware",
     "stores.middleware.StoreResolverMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -69,6 +72,11 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Request profiling (stores.middleware.QueryProfilingMiddleware)
+PROFILING_SLOW_REQUEST_MS = int(os.getenv("PROFILING_SLOW_REQUEST_MS", "500"))
+PROFILING_DUPLICATE_THRESHOLD = int(os.getenv("PROFILING_DUPLICATE_THRESHOLD", "5"))
+PROFILING_WINDOW = int(os.getenv("PROFILING_WINDOW", "200"))
+
 ROOT_URLCONF = "tome.urls"
 
 TEMPLATES = [
@@ -152,6 +160,23 @@ else:
         }
     }
 
+# Store lookups (stores.cache), seconds
+STORE_CACHE_TTL = int(os.getenv("STORE_CACHE_TTL", "300"))
+STORE_CACHE_MISS_TTL = int(os.getenv("STORE_CACHE_MISS_TTL", "30"))
+STORE_CACHE_LOCAL_TTL = int(os.getenv("STORE_CACHE_LOCAL_TTL", "5"))
+
+# Outbound Scryfall requests per second (services.scryfall_client), shared
+# across workers through Redis when REDIS_URL is set
+SCRYFALL_RATE_LIMIT = float(os.getenv("SCRYFALL_RATE_LIMIT", "8"))
+SCRYFALL_RATE_BURST = int(os.getenv("SCRYFALL_RATE_BURST", "8"))
+
+# Count cached metrics response hits/misses (metrics.cache_helpers), off by default
+# since it adds cache round trips to every metrics read
+METRICS_CACHE_STATS = os.getenv("METRICS_CACHE_STATS", "false").lower() == "true"
+
+# Per-store typed configs (configs.configs.get_store_config), seconds
+CONFIG_CACHE_TTL = int(os.getenv("CONFIG_CACHE_TTL", "3600"))
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
@@ -0,0 +1,6 @@
+# Settings for the test suite and local benchmark runs. The benchmarks app only
+# seeds throwaway databases, so production settings leave it out:
+#   DJANGO_SETTINGS_MODULE=tome.test_settings python manage.py run_benchmarks
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [*INSTALLED_APPS, "benchmarks"]  # noqa: F405
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0020_name_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="participantachievements",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["store", "session", "participant"],
+                include=("earned_points",),
+                name="pa_store_session_live_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participantachievements",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["participant", "store", "achievement"],
+                name="pa_participant_store_live_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participantachievements",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["round", "participant"],
+                include=("earned_points",),
+                name="pa_round_participant_live_idx",
+            ),
+        ),
+    ]
@@ -2,9 +2,10 @@ import secrets
 
 from datetime import datetime, timedelta
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models, IntegrityError, transaction
-from django.db.models import Sum, F
-from django.db.models.functions import Coalesce
+from django.db.models import Sum, F, Q
+from django.db.models.functions import Coalesce, Upper
 from django.utils import timezone
 
 
@@ -24,6 +25,14 @@ class Participants(models.Model):
 
     class Meta:
         db_table = "participants"
+        indexes = [
+            # Serves both name__icontains (UPPER(name) LIKE) and trigram
+            # similarity on Upper("name"), see users.queries.name_match
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="participants_name_trgm",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.code:
@@ -47,6 +56,37 @@ class Participants(models.Model):
             return None
         return self._calculate_points(store_id=store_id, round_id=round_id)
 
+    @staticmethod
+    def get_points_for_participants(
+        participant_ids, store_id, mm_yy=None, round_id=None
+    ):
+        """
+        Batched version of get_total_points/get_round_points: one grouped query for
+        the month totals and one for the round totals, keyed by participant id.
+        Participants with no points are left out, callers should default to 0.
+        """
+        if mm_yy is None:
+            today = datetime.today()
+            mm_yy = today.strftime("%m-%y")
+
+        base = ParticipantAchievements.objects.filter(
+            participant_id__in=participant_ids, deleted=False, store_id=store_id
+        )
+
+        def _grouped(qs):
+            return dict(
+                qs.values("participant_id")
+                .annotate(points=Sum("earned_points"))
+                .values_list("participant_id", "points")
+            )
+
+        return {
+            "total_points": _grouped(base.filter(session__month_year=mm_yy)),
+            "round_points": (
+                _grouped(base.filter(round_id=round_id)) if round_id else {}
+            ),
+        }
+
     def _calculate_points(self, store_id, month_year=None, round_id=None):
         """
         This internal method handles both total points (by month-year)
@@ -85,6 +125,29 @@ class ParticipantAchievements(models.Model):
 
     class Meta:
         db_table = "participant_achievements"
+        # Reads nearly always skip deleted rows, so these only cover live ones
+        indexes = [
+            # Store-wide history: leaderboards, monthly winners, period metrics
+            models.Index(
+                fields=["store", "session", "participant"],
+                name="pa_store_session_live_idx",
+                include=["earned_points"],
+                condition=Q(deleted=False),
+            ),
+            # One participant's history: badges, individual metrics
+            models.Index(
+                fields=["participant", "store", "achievement"],
+                name="pa_participant_store_live_idx",
+                condition=Q(deleted=False),
+            ),
+            # Scoresheets and per-round points
+            models.Index(
+                fields=["round", "participant"],
+                name="pa_round_participant_live_idx",
+                include=["earned_points"],
+                condition=Q(deleted=False),
+            ),
+        ]
 
 
 # Needed for tests
@@ -139,6 +202,12 @@ class Decklists(models.Model):
 
     class Meta:
         db_table = "decklists"
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="decklists_name_trgm",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.code:
@@ -1,7 +1,7 @@
 import re
 import uuid
 import logging
-from typing import Any, Optional, Union
+from typing import Any, NamedTuple, Optional, Union
 from urllib.parse import urlparse
 from django.utils import timezone
 
@@ -12,11 +12,25 @@ from better_profanity import profanity
 from rest_framework.exceptions import ValidationError
 
 from django.db import transaction
-from django.db.models import Func, F, IntegerField, Q, Value, Sum
-from django.db.models.functions import Coalesce
+from django.db.models import (
+    Case,
+    Exists,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models.functions import Coalesce, Greatest, Upper
 from django.http import HttpRequest
 
 
+from achievements.color_helpers import get_color_table
 from achievements.helpers import calculate_color
 
 from .models import (
@@ -46,6 +60,9 @@ SORT_MAP = {
     "name_desc": ("-name", "id"),
 }
 
+# Most rows a name search returns, it backs the Discord autocomplete
+SEARCH_LIMIT = 25
+
 COLOR_BITS = {"W": 1, "U": 2, "B": 4, "R": 8, "G": 16, "C": 0}
 COLOR_POINTS: dict[int, int] = {
     5: 0,
@@ -71,17 +88,6 @@ class BitOr(Func):
     output_field = IntegerField()
 
 
-def _unique_ids_preserve_order(ids: list[int]) -> list[int]:
-    """Deduplicate decklist ids while keeping first occurrence order (ORM duplicates)."""
-    seen: set[int] = set()
-    out: list[int] = []
-    for i in ids:
-        if i not in seen:
-            seen.add(i)
-            out.append(i)
-    return out
-
-
 DECKLIST_VALUES_COLUMNS = (
     "id",
     "name",
@@ -102,57 +108,129 @@ DECKLIST_VALUES_COLUMNS = (
 )
 
 
+def name_match(field: str, query: str) -> Q:
+    """`field` contains `query`, or is a close trigram word match for it (so
+    typos still match). Both halves are served by the GIN trigram index on
+    UPPER(field)."""
+    needle = query.strip().upper()
+    return Q(**{f"{field}__icontains": needle}) | TrigramWordSimilar(
+        Upper(field), needle
+    )
+
+
+def name_similarity(field: str, query: str) -> TrigramWordSimilarity:
+    """Rank for name_match, 1.0 when `query` appears whole in `field`."""
+    return TrigramWordSimilarity(query.strip().upper(), Upper(field))
+
+
+def search_participants(query: str, limit: int = SEARCH_LIMIT, **filters) -> list[dict]:
+    """Non-deleted participants matching `query` by name, best match first."""
+    if not query.strip():
+        return []
+    return list(
+        Participants.objects.filter(name_match("name", query), deleted=False, **filters)
+        .annotate(similarity=name_similarity("name", query))
+        .order_by("-similarity", "name")
+        .values("id", "name")[:limit]
+    )
+
+
+PRECON_ACHIEVEMENT_ID = 2
+
+
+class DecklistAchievement(NamedTuple):
+    achievement_id: int
+    scalable_term_id: Optional[int]
+    name: str
+    points: int
+
+    def summary(self) -> dict:
+        return {"id": self.achievement_id, "name": self.name, "points": self.points}
+
+    def form_entry(self) -> dict:
+        """Shape the decklist and scoresheet forms expect."""
+        if self.scalable_term_id:
+            return {
+                "achievement_id": self.achievement_id,
+                "scalable_term_id": self.scalable_term_id,
+                "name": self.name,
+            }
+        return {"id": self.achievement_id, "name": self.name}
+
+
 def _achievements_by_decklist_ids(ids: list[int]) -> defaultdict:
     ach_by_decklist: defaultdict = defaultdict(list)
     if not ids:
         return ach_by_decklist
     ach_query = (
         DecklistsAchievements.objects.filter(decklist_id__in=ids)
-        .select_related("achievement", "scalable_term")
+        .select_related("achievement__parent", "scalable_term")
         .order_by("decklist_id", "achievement_id")
     )
     for row in ach_query:
         if row.scalable_term_id and row.scalable_term:
             name = f"{row.achievement.name} {row.scalable_term.term_display}"
+            scalable_term_id = row.scalable_term_id
         else:
             name = row.achievement.full_name
+            scalable_term_id = None
         ach_by_decklist[row.decklist_id].append(
-            {
-                "id": row.achievement_id,
-                "name": name,
-                "points": row.achievement.points,
-            }
+            DecklistAchievement(
+                row.achievement_id, scalable_term_id, name, row.achievement.points
+            )
         )
     return ach_by_decklist
 
 
-def _enrich_decklist_rows(
-    page_rows: list[dict],
-    ach_by_decklist: defaultdict,
-) -> list[dict]:
-    out = []
-    commander_images = scryfall_request.get_commander_image_urls(
-        commander_names=[
-            name
-            for row in page_rows
-            for name in (
-                row.get("commander__name"),
-                row.get("partner__name"),
-                row.get("companion__name"),
+class DecklistEnrichment:
+    """Achievements, commander images and colors for a batch of decklist rows,
+    resolved with one achievements query and one image lookup however many
+    rows there are. Every decklist read path goes through this."""
+
+    def __init__(self, rows: list[dict], *, images: bool = True):
+        self.achievements = _achievements_by_decklist_ids([r["id"] for r in rows])
+        self.images = {}
+        if images:
+            self.images = scryfall_request.get_commander_image_urls(
+                commander_names=[
+                    name
+                    for row in rows
+                    for name in (
+                        row.get("commander__name"),
+                        row.get("partner__name"),
+                        row.get("companion__name"),
+                    )
+                    if name
+                ]
             )
-            if name
-        ]
-    )
-    for qu in page_rows:
-        give_credit = qu["give_credit"]
-        color = calculate_color(
+
+    def achievements_for(self, decklist_id: int) -> list[DecklistAchievement]:
+        return self.achievements.get(decklist_id, [])
+
+    def is_precon(self, decklist_id: int) -> bool:
+        return any(
+            ach.achievement_id == PRECON_ACHIEVEMENT_ID
+            for ach in self.achievements_for(decklist_id)
+        )
+
+    @staticmethod
+    def color(row: dict):
+        return calculate_color(
             [
-                qu["commander__color__mask"],
-                qu.get("partner__color__mask") or -1,
+                row["commander__color__mask"],
+                row.get("partner__color__mask") or -1,
             ]
         )
-        achievements = ach_by_decklist.get(qu["id"], [])
-        has_precon = any(ach["id"] == 2 for ach in achievements)
+
+
+def _enrich_decklist_rows(page_rows: list[dict]) -> list[dict]:
+    out = []
+    enrichment = DecklistEnrichment(page_rows)
+    commander_images = enrichment.images
+    for qu in page_rows:
+        give_credit = qu["give_credit"]
+        color = enrichment.color(qu)
+        has_precon = enrichment.is_precon(qu["id"])
         color_points = COLOR_POINTS[color.symbol_length] if not has_precon else 0
         id_points = COLOR_POINTS[color.symbol_length] if not has_precon else "Precon"
 
@@ -175,60 +253,49 @@ def _enrich_decklist_rows(
                     "points": id_points,
                 },
                 "points": qu["points"] + color_points,
-                "achievements": achievements,
+                "achievements": [
+                    ach.summary() for ach in enrichment.achievements_for(qu["id"])
+                ],
             }
         )
     return out
 
 
-def _rows_for_ids_preserving_order(qs, ordered_ids: list[int]) -> list[dict]:
-    if not ordered_ids:
-        return []
-    rows = list(qs.filter(id__in=ordered_ids).values(*DECKLIST_VALUES_COLUMNS))
-    by_id = {r["id"]: r for r in rows}
-    return [by_id[i] for i in ordered_ids if i in by_id]
-
-
-def _ordered_ids_by_points(qs, descending: bool) -> list[int]:
-    light = list(
-        qs.values(
-            "id",
-            "points",
-            "commander__color__mask",
-            "partner__color__mask",
-        )
+def _combined_mask():
+    return BitOr(
+        F("commander__color__mask"),
+        Coalesce(F("partner__color__mask"), Value(0)),
     )
-    if not light:
-        return []
-    by_id: dict[int, dict] = {}
-    for r in light:
-        rid = r["id"]
-        if rid not in by_id:
-            by_id[rid] = r
-    light = list(by_id.values())
-    all_ids = [r["id"] for r in light]
-    precon_ids = set(
-        DecklistsAchievements.objects.filter(
-            decklist_id__in=all_ids, achievement_id=2
-        ).values_list("decklist_id", flat=True)
+
+
+def _order_by_points(query, descending: bool):
+    """Order by achievement points plus the color identity bonus, in SQL.
+    Precons (achievement 2) get no color bonus."""
+    if "combined_mask" not in query.query.annotations:
+        query = query.annotate(combined_mask=_combined_mask())
+    color_points = Case(
+        *[
+            When(
+                combined_mask=color.mask, then=Value(COLOR_POINTS[color.symbol_length])
+            )
+            for color in get_color_table().by_mask.values()
+        ],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    query = query.annotate(
+        has_precon=Exists(
+            DecklistsAchievements.objects.filter(
+                decklist_id=OuterRef("pk"), achievement_id=PRECON_ACHIEVEMENT_ID
+            )
+        ),
+    ).annotate(
+        sort_points=F("points")
+        + Case(When(has_precon=True, then=Value(0)), default=color_points),
     )
-    scored: list[tuple[int, int]] = []
-    for r in light:
-        has_precon = r["id"] in precon_ids
-        color = calculate_color(
-            [
-                r["commander__color__mask"],
-                r.get("partner__color__mask") or -1,
-            ]
-        )
-        color_points = COLOR_POINTS[color.symbol_length] if not has_precon else 0
-        total = r["points"] + color_points
-        scored.append((total, r["id"]))
     if descending:
-        scored.sort(key=lambda x: (-x[0], x[1]))
-    else:
-        scored.sort(key=lambda x: (x[0], x[1]))
-    return [s[1] for s in scored]
+        return query.order_by("-sort_points", "id")
+    return query.order_by("sort_points", "id")
 
 
 def _decklists_filtered_queryset(params: dict, owner_id: Optional[int]):
@@ -264,12 +331,7 @@ def _decklists_filtered_queryset(params: dict, owner_id: Optional[int]):
         except (TypeError, ValueError):
             raise ValidationError({"colors": "colors must be an integer mask"})
 
-        query = query.annotate(
-            combined_mask=BitOr(
-                F("commander__color__mask"),
-                Coalesce(F("partner__color__mask"), Value(0)),
-            )
-        )
+        query = query.annotate(combined_mask=_combined_mask())
 
         if mask_int == 0:
             query = query.filter(combined_mask=0)
@@ -286,9 +348,19 @@ def _decklists_filtered_queryset(params: dict, owner_id: Optional[int]):
 
     search = (params.get("search") or "").strip()
     if search:
+        matching_participants = Participants.objects.filter(
+            name_match("name", search)
+        ).values("id")
         query = query.filter(
-            Q(name__icontains=search) | Q(participant__name__icontains=search)
+            name_match("name", search) | Q(participant_id__in=matching_participants)
+        ).annotate(
+            similarity=Greatest(
+                name_similarity("name", search),
+                Coalesce(name_similarity("participant__name", search), 0.0),
+            )
         )
+        if not sort_order:
+            sort_order = "relevance"
 
     return query, sort_order
 
@@ -311,30 +383,21 @@ def get_decklists(
     query, sort_order = _decklists_filtered_queryset(params, owner_id)
 
     if sort_order in ("points_desc", "points_asc"):
-        ordered_ids = _ordered_ids_by_points(query, sort_order == "points_desc")
-        total_count = len(ordered_ids)
-        if paginate:
-            offset = max(0, (page - 1) * page_size)
-            page_ids = ordered_ids[offset : offset + page_size]
-        else:
-            page_ids = ordered_ids
-        page_rows = _rows_for_ids_preserving_order(query, page_ids)
+        query = _order_by_points(query, sort_order == "points_desc")
+    elif sort_order == "relevance" and "similarity" in query.query.annotations:
+        query = query.order_by("-similarity", "id")
     else:
-        order_by = SORT_MAP.get(sort_order, SORT_MAP["newest"])
-        query = query.order_by(*order_by)
-        raw_ids = list(query.values_list("id", flat=True))
-        ordered_unique_ids = _unique_ids_preserve_order(raw_ids)
-        total_count = len(ordered_unique_ids)
-        if paginate:
-            offset = max(0, (page - 1) * page_size)
-            page_ids = ordered_unique_ids[offset : offset + page_size]
-            page_rows = _rows_for_ids_preserving_order(query, page_ids)
-        else:
-            page_rows = _rows_for_ids_preserving_order(query, ordered_unique_ids)
+        query = query.order_by(*SORT_MAP.get(sort_order, SORT_MAP["newest"]))
+
+    if paginate:
+        # Rows are grouped by decklist id, so this counts distinct decklists
+        total_count = query.count()
+        offset = max(0, (page - 1) * page_size)
+        page_rows = list(query[offset : offset + page_size])
+    else:
+        page_rows = list(query)
 
-    ids_for_ach = [r["id"] for r in page_rows]
-    ach_by_decklist = _achievements_by_decklist_ids(ids_for_ach)
-    out = _enrich_decklist_rows(page_rows, ach_by_decklist)
+    out = _enrich_decklist_rows(page_rows)
 
     if not paginate:
         return list(out)
@@ -379,11 +442,9 @@ def get_single_decklist_by_id(id) -> Decklists:
     if not query:
         raise ValidationError({"id": "Decklist not found"})
 
-    a_query = DecklistsAchievements.objects.filter(decklist_id=id).select_related(
-        "achievement", "scalable_term"
-    )
+    enrichment = DecklistEnrichment([query], images=False)
 
-    payload = {
+    return {
         "name": query["name"],
         "url": query["url"],
         "commander": StubCommander(
@@ -402,31 +463,12 @@ def get_single_decklist_by_id(id) -> Decklists:
             color_id=query["companion__color_id"],
         ),
         "give_credit": query["give_credit"],
-        "achievements": [],
+        "achievements": [
+            {**ach.form_entry(), "tempId": str(uuid.uuid4())}
+            for ach in enrichment.achievements_for(query["id"])
+        ],
     }
 
-    for row in a_query:
-        if row.scalable_term_id and row.scalable_term:
-            name = f"{row.achievement.name} {row.scalable_term.term_display}"
-            payload["achievements"].append(
-                {
-                    "achievement_id": row.achievement_id,
-                    "scalable_term_id": row.scalable_term_id,
-                    "name": name,
-                    "tempId": str(uuid.uuid4()),
-                }
-            )
-        else:
-            payload["achievements"].append(
-                {
-                    "id": row.achievement_id,
-                    "name": row.achievement.full_name,
-                    "tempId": str(uuid.uuid4()),
-                }
-            )
-
-    return payload
-
 
 def get_single_decklist_by_code(param: str = "") -> Decklists:
     code = f"DL-{param}"
@@ -434,12 +476,12 @@ def get_single_decklist_by_code(param: str = "") -> Decklists:
     query = query.filter(code=code).first()
     if not query:
         raise ValidationError({"code": "Decklist not found"})
-    a_query = DecklistsAchievements.objects.filter(
-        decklist_id=query["id"]
-    ).select_related("achievement", "scalable_term")
+    enrichment = DecklistEnrichment([query], images=False)
 
-    payload = {
-        "winner-achievements": [],
+    return {
+        "winner-achievements": [
+            ach.form_entry() for ach in enrichment.achievements_for(query["id"])
+        ],
         "winner-commander": StubCommander(
             id=query["commander_id"],
             name=query["commander__name"],
@@ -457,23 +499,6 @@ def get_single_decklist_by_code(param: str = "") -> Decklists:
         ),
     }
 
-    for row in a_query:
-        if row.scalable_term_id and row.scalable_term:
-            name = f"{row.achievement.name} {row.scalable_term.term_display}"
-            payload["winner-achievements"].append(
-                {
-                    "achievement_id": row.achievement_id,
-                    "scalable_term_id": row.scalable_term_id,
-                    "name": name,
-                }
-            )
-        else:
-            payload["winner-achievements"].append(
-                {"id": row.achievement_id, "name": row.achievement.full_name}
-            )
-
-    return payload
-
 
 def get_decklist_by_participant_round(
     participant_id: int, round_id: int, store_id: int
@@ -501,35 +526,19 @@ def get_decklist_by_participant_round(
             .values("id", "name", "url", "code")
             .first()
         )
-        a_query = DecklistsAchievements.objects.filter(
-            decklist_id=decklist["id"]
-        ).select_related("achievement", "scalable_term")
+        enrichment = DecklistEnrichment([decklist], images=False)
 
-        payload = {
-            "achievements": [],
+        return {
+            "achievements": [
+                ach.summary() for ach in enrichment.achievements_for(decklist["id"])
+            ],
             "url": decklist["url"],
             "id": decklist["id"],
             "name": decklist["name"],
             "code": decklist["code"],
+            "decklist": decklist,
         }
 
-        payload["decklist"] = decklist
-
-        for row in a_query:
-            if row.scalable_term_id and row.scalable_term:
-                name = f"{row.achievement.name} {row.scalable_term.term_display}"
-            else:
-                name = row.achievement.full_name
-            payload["achievements"].append(
-                {
-                    "id": row.achievement_id,
-                    "name": name,
-                    "points": row.achievement.points,
-                }
-            )
-
-        return payload
-
     except WinningCommanders.DoesNotExist:
         return {"achievements": [], "url": "", "id": "", "name": "", "code": ""}
 
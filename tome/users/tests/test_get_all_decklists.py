@@ -4,7 +4,8 @@ from django.urls import reverse
 from rest_framework import status
 
 from users.models import Decklists, DecklistsAchievements
-from achievements.models import Commanders, Colors
+from users.queries import DecklistEnrichment
+from achievements.models import Achievements, Commanders, Colors
 from utils.test_helpers import get_ids
 
 ids = get_ids()
@@ -234,3 +235,78 @@ def test_get_decklists_by_name_desc(client, build_state) -> None:
     parsed_res = res.json()["results"]
     names = [pr["name"] for pr in parsed_res]
     assert names == ["Boop", "Blop", "Beep"]
+
+
+def test_get_decklists_by_points(client, build_state) -> None:
+    """
+    should: sort by total points including the color bonus, paging in SQL
+    """
+
+    url = reverse("decklists")
+    desc = client.get(f"{url}?sort_order=points_desc").json()
+    asc = client.get(f"{url}?sort_order=points_asc").json()
+    second = client.get(f"{url}?sort_order=points_desc&page=2&page_size=1").json()
+
+    points = [(d["points"], d["id"]) for d in desc["results"]]
+    assert points == sorted(points, key=lambda p: (-p[0], p[1]))
+    assert [(d["points"], d["id"]) for d in asc["results"]] == sorted(points)
+    assert desc["results"][0]["id"] == D1
+    assert second["count"] == 3
+    assert [d["id"] for d in second["results"]] == [desc["results"][1]["id"]]
+
+
+def test_get_decklists_by_points_query_count(
+    client, build_state, django_assert_max_num_queries
+) -> None:
+    """
+    should: not run more queries as the number of decklists grows
+    """
+
+    url = reverse("decklists")
+    Decklists.objects.bulk_create(
+        [
+            Decklists(
+                id=100 + i,
+                name=f"Extra {i}",
+                url=f"www.moxfield.com/extra-{i}",
+                code=f"DL-X{i:03d}",
+                commander_id=ids.FYNN,
+            )
+            for i in range(10, 40)
+        ]
+    )
+
+    with django_assert_max_num_queries(8):
+        res = client.get(f"{url}?sort_order=points_desc&page_size=5")
+
+    assert res.status_code == status.HTTP_200_OK
+    assert res.json()["count"] == 33
+
+
+def test_decklist_enrichment_is_batched(build_state, django_assert_num_queries) -> None:
+    """
+    should: resolve achievements for every decklist with a single query
+    """
+
+    child = Achievements.objects.create(
+        name="with a twist", parent_id=ids.CMDR_DMG, point_value=None
+    )
+    DecklistsAchievements.objects.create(achievement=child, decklist_id=D2)
+    rows = [{"id": D1}, {"id": D2}, {"id": D3}]
+
+    with django_assert_num_queries(1):
+        enrichment = DecklistEnrichment(rows, images=False)
+        summaries = {
+            row["id"]: [a.summary() for a in enrichment.achievements_for(row["id"])]
+            for row in rows
+        }
+
+    assert [a["id"] for a in summaries[D1]] == sorted(
+        [ids.NO_INSTANTS_SORCERIES, ids.CMDR_DMG, ids.NO_CREATURES]
+    )
+    assert {
+        "id": child.id,
+        "name": "Win via commander damage with a twist",
+        "points": 1,
+    } in summaries[D2]
+    assert not enrichment.is_precon(D1)
@@ -0,0 +1,83 @@
+import pytest
+from django.db import connection, transaction
+from django.db.models import Sum
+
+from users.models import ParticipantAchievements
+from utils.test_helpers import get_ids
+
+ids = get_ids()
+
+TABLE = "participant_achievements"
+LIVE_INDEXES = [
+    "pa_store_session_live_idx",
+    "pa_participant_store_live_idx",
+    "pa_round_participant_live_idx",
+]
+
+
+def _index_names(plan: dict) -> set[str]:
+    found = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        found |= _index_names(child)
+    return found
+
+
+def _explain(queryset) -> dict:
+    # The seed table is tiny, so price seq scans out; the planner then has to
+    # pick between our partial indexes and the plain foreign key ones.
+    sql, params = queryset.query.sql_with_params()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {TABLE}")
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        return cursor.fetchone()[0][0]["Plan"]
+
+
+def test_live_indexes_exist() -> None:
+    """should: create each participant_achievements index as a partial index over live rows"""
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s",
+            [TABLE],
+        )
+        indexes = dict(cursor.fetchall())
+
+    for name in LIVE_INDEXES:
+        assert name in indexes
+        assert "WHERE (NOT deleted)" in indexes[name]
+
+
+@pytest.mark.parametrize(
+    "index, queryset",
+    [
+        (
+            "pa_store_session_live_idx",
+            lambda: ParticipantAchievements.objects.filter(
+                store_id=ids.MIMICS_ID,
+                session_id=ids.SESSION_THIS_MONTH_OPEN,
+                deleted=False,
+            )
+            .values("participant_id")
+            .annotate(total=Sum("earned_points")),
+        ),
+        (
+            "pa_participant_store_live_idx",
+            lambda: ParticipantAchievements.objects.filter(
+                participant_id=ids.P1, store_id=ids.MIMICS_ID, deleted=False
+            ).values("achievement_id"),
+        ),
+        (
+            "pa_round_participant_live_idx",
+            lambda: ParticipantAchievements.objects.filter(
+                round_id=ids.R1_SESSION_THIS_MONTH_OPEN, deleted=False
+            )
+            .values("participant_id")
+            .annotate(total=Sum("earned_points")),
+        ),
+    ],
+)
+def test_live_reads_use_partial_index(index, queryset) -> None:
+    """should: plan the hot participant_achievements reads on the matching partial index"""
+
+    assert index in _index_names(_explain(queryset()))
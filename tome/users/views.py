@@ -23,6 +23,7 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from django.contrib.auth.password_validation import validate_password
 
+from achievements.helpers import refresh_participant_monthly_winners
 from utils.decorators import require_user_code
 from utils.permissions import IsSuperUser
 from .models import Participants, SessionToken, Decklists, DecklistsAchievements
@@ -96,6 +97,8 @@ def upsert_participant(request, **kwargs):
         if is_patreon is not None:
             participant.is_patreon = bool(is_patreon)
         participant.save()
+        if deleted:
+            refresh_participant_monthly_winners(participant.id)
         return Response(
             {"message": "Updated successfully"}, status=status.HTTP_201_CREATED
         )
@@ -7,7 +7,7 @@ from rest_framework import status
 from django.conf import settings
 
 from users.models import Participants
-from stores.models import Store
+from stores.cache import get_store_for_guild
 
 
 def require_service_token(func):
@@ -69,15 +69,13 @@ def require_discord_store(func):
             return Response(
                 {"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED
             )
-        store = Store.objects.filter(
-            discord_guild_id=guild_id, is_active=True, deleted=False
-        ).first()
+        store = get_store_for_guild(guild_id)
         if not store:
             return Response(
                 {"detail": "Store not found, invalid request"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        request.store_id = store.id
+        request.store_id = store["id"]
         return func(request, *args, **kwargs)
 
     return wrapper
@@ -24,6 +24,22 @@ def prune_fields(data, fields_to_keep):
     return data
 
 
+def copy_csv(cursor, table_name: str, f) -> None:
+    """COPY a CSV file object, header row first, into `table_name`."""
+    colnames = f.readline().strip()
+
+    f.seek(0)
+    cursor.copy_expert(f"COPY {table_name} ({colnames}) FROM STDIN CSV HEADER", f)
+
+
+def load_seed_csvs(cursor, directory=SEED_DIRECTORY) -> None:
+    """Load every `<order>_<table>.csv` in `directory`, in file name order."""
+    for file in sorted(Path(directory).iterdir()):
+        with file.open() as f:
+            _, table_name = file.stem.split("_", maxsplit=1)
+            copy_csv(cursor, table_name, f)
+
+
 def id_from_csv_row(csv_path: str, index: int) -> Any:
     path = SEED_DIRECTORY / Path(f"{csv_path}.csv")
     with path.open() as f: